@@ -0,0 +1,311 @@
+"""
+Curva de faltas do LRU por modelo (AET, Average Eviction Time), sem simular.
+
+Uma passada pelo traço monta o histograma dos tempos de reuso (nº de acessos
+desde a referência anterior à mesma página; o primeiro acesso a uma página
+tem reuso infinito). Com P(t) = fração dos acessos com reuso > t, o modelo
+AET diz que um cache LRU de c quadros expulsa páginas com idade T tal que
+
+    c = soma_{t < T} P(t)
+
+e a taxa de faltas com c quadros é P(T). Como o histograma não depende de c,
+a curva inteira sai dele de uma vez, para qualquer frames_list.
+
+Memória limitada:
+  - o histograma tem faixas logarítmicas (2^SUB_BITS faixas por potência de
+    2; reusos < 2^(SUB_BITS+1) ficam em faixas exatas), ~2 mil contadores
+    por grupo
+  - a tabela de último acesso guarda no máximo max_pages páginas (mais as
+    novas de um bloco): quando enche, passa a amostrar as páginas pelo hash
+    do id (como src.shards), descartando metade e reescalando as contagens
+    já feitas para a nova taxa.
+
+A amostragem só preserva P(t) em média: em traços concentrados, cair ou não
+na amostra algumas páginas quentes muda o total de acessos amostrados e
+desloca a curva inteira. Como no SHARDS-adj, a diferença entre o total
+esperado (trace_len x taxa) e o amostrado entra na faixa de reuso mais
+curto (ou, se sobram acessos, sai das faixas mais curtas), que é onde essas
+páginas quentes estão. A amostra é dividida em grupos por outros bits do
+mesmo hash; a variação entre as curvas dos grupos dá o erro-padrão
+(faults_stderr de EstimatedRunResult, zero sem amostragem).
+"""
+
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+
+from src.core import Access, BenchmarkResult, RunResult, TraceBuffer, auto_frames_list, iter_chunks
+from src.shards import HASH_BITS, EstimatedRunResult, page_hash
+from src.trace_file import numpy_views
+
+SUB_BITS = 5
+_SUB = 1 << SUB_BITS
+NUM_BINS = (64 - SUB_BITS) * _SUB
+DEFAULT_MAX_PAGES = 1 << 20
+
+_SPACE = 1 << HASH_BITS
+
+
+def _bin_edges() -> tuple:
+    """Início e largura de cada faixa do histograma (float64: as últimas passam de 2^63)."""
+    idx = np.arange(NUM_BINS)
+    shift = np.maximum(idx // _SUB - 1, 0)
+    mant = idx - shift * _SUB
+    return mant * np.exp2(shift), np.exp2(shift)
+
+
+_BIN_LO, _BIN_WIDTH = _bin_edges()
+
+
+def reuse_bins(reuse: np.ndarray) -> np.ndarray:
+    """Faixa de cada tempo de reuso (>= 1)."""
+    _, exp = np.frexp(reuse.astype(np.float64))
+    shift = np.maximum(exp.astype(np.int64) - 1 - SUB_BITS, 0)
+    mant = reuse >> shift
+    # Acima de 2^53 o float64 pode arredondar para a próxima potência de 2.
+    over = (shift > 0) & (mant < _SUB)
+    if over.any():
+        shift[over] -= 1
+        mant = reuse >> shift
+    return shift * _SUB + mant
+
+
+# Faixa do reuso mais curto (1), onde SHARDS-adj põe o que falta.
+_FIRST_BIN = int(reuse_bins(np.array([1], dtype=np.int64))[0])
+
+
+class ReuseTimeHistogram:
+    """
+    Histograma de tempos de reuso de um traço, alimentado em blocos
+    (update) e convertido em curva de faltas pelo modelo AET.
+    """
+
+    def __init__(
+        self, max_pages: Optional[int] = DEFAULT_MAX_PAGES, seed: int = 0, groups: int = 16
+    ):
+        """
+        max_pages: limite da tabela de último acesso (None = sem limite, reusos
+          exatos de todas as páginas).
+        seed: semente do hash usado quando a amostragem entra em ação.
+        groups: nº de grupos de páginas (pelo hash) usados no erro-padrão.
+        """
+        if max_pages is not None and max_pages < 2:
+            raise ValueError("max_pages deve ser >= 2")
+        if groups < 2:
+            raise ValueError("groups deve ser >= 2")
+        self.max_pages = max_pages
+        self.seed = seed
+        self.groups = groups
+        self.threshold = _SPACE
+        self.trace_len = 0
+        # Uma linha por grupo de páginas.
+        self.counts = np.zeros((groups, NUM_BINS), dtype=np.float64)
+        self.cold = np.zeros(groups, dtype=np.float64)
+        self._last_seen: dict = {}
+
+    @property
+    def sample_rate(self) -> float:
+        return self.threshold / _SPACE
+
+    @property
+    def distinct(self) -> int:
+        """Nº estimado de páginas distintas no traço."""
+        return round(self.cold.sum() / self.sample_rate)
+
+    def update(self, chunk: TraceBuffer) -> None:
+        """Acrescenta um bloco do traço (na ordem)."""
+        pages = numpy_views(chunk)["pages"]
+        pos = np.arange(self.trace_len, self.trace_len + len(pages), dtype=np.int64)
+        self.trace_len += len(pages)
+        mixed = page_hash(pages, self.seed)
+        if self.threshold < _SPACE:
+            keep = (mixed >> np.uint64(HASH_BITS)) < np.uint64(self.threshold)
+            pages = pages[keep]
+            pos = pos[keep]
+            mixed = mixed[keep]
+        if not pages.size:
+            return
+        group = ((mixed & np.uint64(_SPACE - 1)) % np.uint64(self.groups)).astype(np.int64)
+
+        # Ordenando por página (estável), reacessos dentro do bloco ficam vizinhos.
+        order = np.argsort(pages, kind="stable")
+        sp = pages[order]
+        st = pos[order]
+        sg = group[order]
+        first = np.ones(len(sp), dtype=bool)
+        first[1:] = sp[1:] != sp[:-1]
+        last = np.ones(len(sp), dtype=bool)
+        last[:-1] = first[1:]
+        again = ~first[1:]
+        self._add(st[1:][again] - st[:-1][again], sg[1:][again])
+
+        # Primeiro acesso de cada página no bloco: reuso desde o bloco anterior.
+        seen = self._last_seen
+        cross: List[int] = []
+        cross_groups: List[int] = []
+        cold: List[int] = []
+        for pid, g, t0, t1 in zip(
+            sp[first].tolist(), sg[first].tolist(), st[first].tolist(), st[last].tolist()
+        ):
+            prev = seen.get(pid)
+            if prev is None:
+                cold.append(g)
+            else:
+                cross.append(t0 - prev)
+                cross_groups.append(g)
+            seen[pid] = t1
+        if cold:
+            self.cold += np.bincount(cold, minlength=self.groups)
+        if cross:
+            self._add(np.array(cross, dtype=np.int64), np.array(cross_groups, dtype=np.int64))
+
+        if self.max_pages is not None and len(seen) > self.max_pages:
+            self._shrink()
+
+    def _add(self, reuse: np.ndarray, groups: np.ndarray) -> None:
+        if reuse.size:
+            cells = groups * NUM_BINS + reuse_bins(reuse)
+            flat = np.bincount(cells, minlength=self.groups * NUM_BINS)
+            self.counts += flat.reshape(self.groups, NUM_BINS)
+
+    def _shrink(self) -> None:
+        """Baixa o limiar do hash até sobrar metade de max_pages páginas."""
+        seen = self._last_seen
+        keys = np.fromiter(seen, dtype=np.int64, count=len(seen))
+        h = page_hash(keys, self.seed) >> np.uint64(HASH_BITS)
+        k = self.max_pages // 2
+        threshold = int(np.partition(h, k)[k])
+        for pid in keys[h >= threshold].tolist():
+            del seen[pid]
+        scale = threshold / self.threshold
+        self.counts *= scale
+        self.cold *= scale
+        self.threshold = threshold
+
+    def _adjusted(self, counts: np.ndarray, cold: float, share: float) -> np.ndarray:
+        """
+        Correção SHARDS-adj: leva as contagens ao total esperado de acessos
+        amostrados (trace_len x taxa x share). A falta entra na faixa de reuso
+        1; o excesso sai das faixas de reuso mais curto, em ordem.
+        """
+        if self.threshold == _SPACE:
+            return counts
+        diff = self.trace_len * self.sample_rate * share - cold - counts.sum()
+        if diff >= 0:
+            counts = counts.copy()
+            counts[_FIRST_BIN] += diff
+            return counts
+        kept = np.maximum(np.cumsum(counts) + diff, 0.0)
+        return np.diff(kept, prepend=0.0)
+
+    @staticmethod
+    def _curve(counts: np.ndarray, cold: float, frames_list: List[int]) -> np.ndarray:
+        """Taxa de faltas do AET para cada frames, a partir de um histograma."""
+        total = cold + counts.sum()
+        if not total:
+            return np.ones(len(frames_list))
+
+        # p[k] = P(LO[k] - 1) = fração com reuso >= LO[k]; p[NUM_BINS] = só os frios.
+        tail = np.concatenate([np.cumsum(counts[::-1])[::-1], [0.0]])
+        p = (tail + cold) / total
+        a = p[1:-1]
+        b = p[2:]
+        width = _BIN_WIDTH[1:]
+        # Área de P(t) em cada faixa (P linear dentro da faixa, exata nas de largura 1).
+        area = width * a - (a - b) * (width - 1) / 2
+        end = np.cumsum(area)
+
+        out = np.empty(len(frames_list))
+        for i, frames in enumerate(frames_list):
+            k = int(np.searchsorted(end, frames))
+            if k >= len(end):
+                out[i] = p[-1]
+                continue
+            start = end[k - 1] if k else 0.0
+            x = (frames - start) / area[k] if area[k] else 1.0
+            out[i] = a[k] - (a[k] - b[k]) * x
+        return out
+
+    def miss_ratios(self, frames_list: Iterable[int]) -> List[float]:
+        """Taxa de faltas do LRU prevista pelo AET para cada frames."""
+        frames_list = self._check_frames(frames_list)
+        cold = float(self.cold.sum())
+        counts = self._adjusted(self.counts.sum(axis=0), cold, 1.0)
+        return self._curve(counts, cold, frames_list).tolist()
+
+    def miss_ratio_stderr(self, frames_list: Iterable[int]) -> List[float]:
+        """
+        Erro-padrão de cada taxa de miss_ratios, pela variação entre as curvas
+        dos grupos (método dos grupos aleatórios, com correção de população
+        finita: zero enquanto não há amostragem).
+        """
+        frames_list = self._check_frames(frames_list)
+        share = 1.0 / self.groups
+        curves = np.array(
+            [
+                self._curve(self._adjusted(counts, float(cold), share), float(cold), frames_list)
+                for counts, cold in zip(self.counts, self.cold)
+            ]
+        )
+        var = curves.var(axis=0, ddof=1) / self.groups
+        return np.sqrt((1 - self.sample_rate) * var).tolist()
+
+    def _check_frames(self, frames_list: Iterable[int]) -> List[int]:
+        frames_list = list(frames_list)
+        if not self.cold.sum() and not self.counts.any():
+            raise ValueError("Histograma vazio: nenhum acesso registrado.")
+        for frames in frames_list:
+            if frames <= 0:
+                raise ValueError("frames deve ser > 0")
+        return frames_list
+
+    def benchmark(self, frames_list: Optional[List[int]] = None, label: str = "AET") -> BenchmarkResult:
+        """
+        Curva prevista como BenchmarkResult de EstimatedRunResult (frames_list
+        padrão: auto_frames_list), com o erro-padrão em faults_stderr.
+        """
+        if frames_list is None:
+            frames_list = auto_frames_list(max(1, self.distinct))
+        distinct = self.distinct
+        sampled = round(self.cold.sum() + self.counts.sum())
+        results: List[RunResult] = []
+        for frames, ratio, stderr in zip(
+            frames_list, self.miss_ratios(frames_list), self.miss_ratio_stderr(frames_list)
+        ):
+            faults = round(ratio * self.trace_len)
+            results.append(
+                EstimatedRunResult(
+                    algo_name=label,
+                    frames=frames,
+                    trace_len=self.trace_len,
+                    faults=faults,
+                    hits=self.trace_len - faults,
+                    evictions=max(0, faults - min(frames, distinct)),
+                    sample_rate=self.sample_rate,
+                    sampled=sampled,
+                    faults_stderr=stderr * self.trace_len,
+                )
+            )
+        return BenchmarkResult(algo_name=label, results=results)
+
+
+def aet_benchmark(
+    source: Union[TraceBuffer, Iterable[Access], Iterable[TraceBuffer]],
+    frames_list: Optional[List[int]] = None,
+    *,
+    max_pages: Optional[int] = DEFAULT_MAX_PAGES,
+    seed: int = 0,
+    groups: int = 16,
+    chunk_size: int = 1 << 20,
+    label: str = "AET",
+) -> BenchmarkResult:
+    """
+    Curva de faltas do LRU estimada pelo AET em uma passada pelo traço
+    (aceita as mesmas fontes de stream()). O BenchmarkResult vai direto para
+    export_benchmark_csv e plot_comparison, ao lado dos exatos; faults_stderr
+    diz quanto a amostragem (max_pages) pesa em cada ponto.
+    """
+    hist = ReuseTimeHistogram(max_pages, seed, groups)
+    for chunk in iter_chunks(source, chunk_size):
+        hist.update(chunk)
+    return hist.benchmark(frames_list, label)
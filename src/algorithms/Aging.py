@@ -1,9 +1,33 @@
-from typing import Dict, Iterable, List, Optional
+from array import array
+from typing import Dict, Generator, Iterable, List, Optional
+
+import numpy as np
+
+from src.algorithms.baseAlgorithm import SNAPSHOT, PageReplacementAlgorithm
+from src.algorithms.online import HIT, MISS, AccessOutcome, OnlineSimulator
+from src.core import Access, RunResult, TraceBuffer
+
+
+def _counter_dtype(bits: int):
+    """uint64 cobre até 64 bits; acima disso os contadores viram inteiros Python."""
+    return np.uint64 if bits <= 64 else object
+
+
+def _aging_victim(counter: np.ndarray, loaded_at: np.ndarray) -> int:
+    """
+    Slot com menor contador; empate pelo menor loaded_at e depois pelo menor
+    índice (mesma ordem de min() sobre (counter, loaded_at)).
+    """
+    first = counter.argmin()
+    candidates = (counter == counter[first]).nonzero()[0]
+    if candidates.size == 1:
+        return int(first)
+    return int(candidates[loaded_at[candidates].argmin()])
 
-from src.algorithms.baseAlgorithm import PageReplacementAlgorithm
-from src.core import Access, PTE, RunResult
 
 class Aging(PageReplacementAlgorithm):
+    online = True
+
     def __init__(self, bits: int = 8, refresh_every: int = 1):
         """
         bits: largura do contador de envelhecimento (>=2).
@@ -18,39 +42,48 @@ class Aging(PageReplacementAlgorithm):
         self.refresh_every = refresh_every
 
     def run(self, trace: Iterable[Access], frames: int) -> RunResult:
+        """
+        Aging com rastreamento opcional.
+
+        Estruturas (arrays NumPy indexados pelo slot):
+          - counter: contadores de envelhecimento
+          - ref: bits R do intervalo corrente
+          - loaded_at: instante de carga (desempate da vítima)
+        O tick é um único shift-and-OR vetorizado sobre todos os slots.
+        """
         seq = self._normalize_trace(trace)
-        mask = (1 << self.bits) - 1
+        if frames <= 0:
+            raise ValueError("frames deve ser > 0")
 
         self._trace_begin(frames)
 
-        slots = [
-            {"page_id": None, "counter": 0, "R": 0, "M": 0, "loaded_at": 0}
-            for _ in range(frames)
-        ]
+        dtype = _counter_dtype(self.bits)
+        counter = np.zeros(frames, dtype=dtype)
+        ref = np.zeros(frames, dtype=dtype)
+        high = np.array(self.bits - 1, dtype=dtype)
+        mod = [0] * frames
+        loaded_at = np.zeros(frames, dtype=np.int64)
+        slot_pid: List[Optional[int]] = [None] * frames
         page_to_idx: Dict[int, int] = {}
 
         hits = faults = evictions = 0
         logical_time = 0
 
         def aging_tick():
-            for fr in slots:
-                if fr["page_id"] is None:
-                    fr["counter"] = 0
-                    fr["R"] = 0
-                else:
-                    fr["counter"] = ((fr["R"] << (self.bits - 1)) | (fr["counter"] >> 1)) & mask
-                    fr["R"] = 0
+            np.right_shift(counter, 1, out=counter)
+            np.bitwise_or(counter, np.left_shift(ref, high), out=counter)
+            ref[:] = 0
 
         def build_frames_state() -> List[dict]:
             state: List[dict] = []
-            for i, fr in enumerate(slots):
+            for i in range(frames):
                 state.append(
                     {
                         "frame_index": i,
-                        "page_id": fr["page_id"],
-                        "R": fr["R"],
-                        "M": fr["M"],
-                        "meta": {"counter": fr["counter"]},
+                        "page_id": slot_pid[i],
+                        "R": int(ref[i]),
+                        "M": mod[i],
+                        "meta": {"counter": int(counter[i])},
                     }
                 )
             return state
@@ -70,65 +103,51 @@ class Aging(PageReplacementAlgorithm):
             idx = page_to_idx.get(pid)
             evicted_pid: Optional[int] = None
 
-            if idx is not None and slots[idx]["page_id"] == pid:
+            if idx is not None:
                 hit = True
                 hits += 1
-                slots[idx]["R"] = 1
+                ref[idx] = 1
                 if access.write:
-                    slots[idx]["M"] = 1
+                    mod[idx] = 1
             else:
                 hit = False
                 faults += 1
 
-                free = next((i for i, fr in enumerate(slots) if fr["page_id"] is None), None)
-                if free is not None:
-                    slots[free].update(
-                        page_id=pid,
-                        counter=0,
-                        R=1,
-                        M=int(access.write),
-                        loaded_at=current_t,
-                    )
-                    page_to_idx[pid] = free
+                if len(page_to_idx) < frames:
+                    idx = len(page_to_idx)
                 else:
-                    victim = min(
-                        range(frames),
-                        key=lambda i: (slots[i]["counter"], slots[i]["loaded_at"]),
-                    )
-                    old_pid = slots[victim]["page_id"]
-                    if old_pid in page_to_idx:
-                        del page_to_idx[old_pid]
-                    evicted_pid = old_pid
-
-                    slots[victim].update(
-                        page_id=pid,
-                        counter=0,
-                        R=1,
-                        M=int(access.write),
-                        loaded_at=current_t,
-                    )
-                    page_to_idx[pid] = victim
+                    idx = _aging_victim(counter, loaded_at)
+                    evicted_pid = slot_pid[idx]
+                    del page_to_idx[evicted_pid]
                     evictions += 1
 
+                slot_pid[idx] = pid
+                counter[idx] = 0
+                ref[idx] = 1
+                mod[idx] = int(access.write)
+                loaded_at[idx] = current_t
+                page_to_idx[pid] = idx
+
             tick_applied = False
             if (logical_time % self.refresh_every) == 0:
                 aging_tick()
                 tick_applied = True
 
-            self.trace_step(
-                t=current_t,
-                access_page=pid,
-                access_write=access.write,
-                hit=hit,
-                evicted_page=evicted_pid,
-                frames_state=build_frames_state(),
-                decision_meta={
-                    "policy": "aging",
-                    "tick": tick_applied,
-                    "bits": self.bits,
-                    "refresh_every": self.refresh_every,
-                },
-            )
+            if self._trace_enabled:
+                self.trace_step(
+                    t=current_t,
+                    access_page=pid,
+                    access_write=access.write,
+                    hit=hit,
+                    evicted_page=evicted_pid,
+                    frames_state=build_frames_state(),
+                    decision_meta={
+                        "policy": "aging",
+                        "tick": tick_applied,
+                        "bits": self.bits,
+                        "refresh_every": self.refresh_every,
+                    },
+                )
 
         self._trace_end(frames)
 
@@ -141,3 +160,225 @@ class Aging(PageReplacementAlgorithm):
             hits=hits,
             evictions=evictions,
         )
+
+    def _stream_kernel(
+        self, frames: int, state: Optional[dict] = None
+    ) -> Generator[Optional[dict], Optional[TraceBuffer], RunResult]:
+        """
+        Kernel incremental de contagem com ticks em lote.
+
+        Os contadores só são lidos na escolha da vítima, então os ticks entre
+        duas faltas são acumulados: 'pending' guarda, por slot referenciado, um
+        bit por intervalo desde o último flush (bit k = intervalo corrente).
+        No flush, counter >>= k e os bits pendentes entram já deslocados para a
+        posição que teriam após k ticks. O resultado é idêntico a aplicar o
+        shift-and-OR a cada tick, mas acertos custam O(1) e cada falta custa
+        poucas operações vetorizadas.
+        """
+        if frames <= 0:
+            raise ValueError("frames deve ser > 0")
+
+        bits = self.bits
+        high = bits - 1
+        refresh_every = self.refresh_every
+        counter = np.zeros(frames, dtype=_counter_dtype(bits))
+        loaded_at = np.zeros(frames, dtype=np.int64)
+        slot_pid: List[int] = []
+        page_to_idx: Dict[int, int] = {}
+        pending: Dict[int, int] = {}
+        ticks = 0
+        bit = 1
+
+        trace_len = 0
+        hits = faults = evictions = 0
+        logical_time = 0
+        missing_t = 0
+        if state is not None:
+            counter[:] = state["counter"]
+            loaded_at[:] = state["loaded_at"]
+            slot_pid.extend(state["slot_pid"])
+            page_to_idx.update((pid, idx) for idx, pid in enumerate(slot_pid))
+            pending.update(state["pending"])
+            ticks, bit = state["ticks"], state["bit"]
+            logical_time, missing_t = state["logical_time"], state["missing_t"]
+            trace_len, faults, hits, evictions = state["counters"]
+
+        chunk = yield
+        while chunk is not None:
+            if chunk is SNAPSHOT:
+                chunk = yield {
+                    "counter": counter.copy(),
+                    "loaded_at": loaded_at.copy(),
+                    "slot_pid": array("q", slot_pid),
+                    "pending": dict(pending),
+                    "ticks": ticks,
+                    "bit": bit,
+                    "logical_time": logical_time,
+                    "missing_t": missing_t,
+                    "counters": (trace_len, faults, hits, evictions),
+                }
+                continue
+            trace_len += len(chunk)
+            times = chunk.filled_times("count", missing_t)
+            missing_t += chunk.missing_t()
+            for pid, current_t in zip(chunk.pages, times):
+                logical_time += 1
+                idx = page_to_idx.get(pid)
+                if idx is not None:
+                    hits += 1
+                    pending[idx] = pending.get(idx, 0) | bit
+                else:
+                    faults += 1
+                    if len(slot_pid) < frames:
+                        idx = len(slot_pid)
+                        slot_pid.append(pid)
+                    else:
+                        if ticks:
+                            self._flush_ticks(counter, pending, ticks, high)
+                            ticks = 0
+                            bit = 1
+                        idx = _aging_victim(counter, loaded_at)
+                        del page_to_idx[slot_pid[idx]]
+                        slot_pid[idx] = pid
+                        evictions += 1
+
+                    page_to_idx[pid] = idx
+                    counter[idx] = 0
+                    loaded_at[idx] = current_t
+                    pending[idx] = bit
+
+                if logical_time % refresh_every == 0:
+                    ticks += 1
+                    bit <<= 1
+                    if ticks >= 64:
+                        self._flush_ticks(counter, pending, ticks, high)
+                        ticks = 0
+                        bit = 1
+            chunk = yield
+
+        return RunResult(
+            algo_name=self.name,
+            frames=frames,
+            trace_len=trace_len,
+            faults=faults,
+            hits=hits,
+            evictions=evictions,
+        )
+
+    def open(self, frames: int) -> "AgingSimulator":
+        return AgingSimulator(self.name, frames, self.bits, self.refresh_every)
+
+    @staticmethod
+    def _flush_ticks(counter: np.ndarray, pending: Dict[int, int], ticks: int, high: int) -> None:
+        """
+        Aplica 'ticks' shift-and-OR acumulados de uma vez (ver _stream_kernel
+        e AgingSimulator).
+
+        O bit i de pending[slot] (intervalo i, já encerrado) termina na posição
+        high - (ticks - 1 - i); o bit 'ticks' é o R do intervalo ainda aberto e
+        continua pendente.
+        """
+        if ticks >= 64 and counter.dtype != object:
+            counter[:] = 0
+        else:
+            np.right_shift(counter, ticks, out=counter)
+
+        closed = (1 << ticks) - 1
+        shift = high - ticks + 1
+        slots: List[int] = []
+        values: List[int] = []
+        still_open: Dict[int, int] = {}
+        for slot, mask in pending.items():
+            done = mask & closed
+            if done:
+                slots.append(slot)
+                values.append(done << shift if shift >= 0 else done >> -shift)
+            if mask >> ticks:
+                still_open[slot] = 1
+
+        if len(slots) > 8:
+            counter[slots] |= np.array(values, dtype=counter.dtype)
+        else:
+            for slot, value in zip(slots, values):
+                counter[slot] |= value
+        pending.clear()
+        pending.update(still_open)
+
+
+class AgingSimulator(OnlineSimulator):
+    """
+    Aging incremental com os ticks em lote do kernel: acertos custam O(1); a
+    escolha da vítima, só nas faltas com os quadros cheios, é a mesma
+    operação vetorizada sobre os F contadores de run(). Sem t, loaded_at usa
+    o contador de acessos sem timestamp, como em run().
+    """
+
+    __slots__ = (
+        "refresh_every",
+        "_high",
+        "_counter",
+        "_loaded_at",
+        "_slot_pid",
+        "_page_to_idx",
+        "_pending",
+        "_ticks",
+        "_bit",
+        "_missing_t",
+    )
+
+    def __init__(self, name: str, frames: int, bits: int, refresh_every: int) -> None:
+        super().__init__(name, frames)
+        self.refresh_every = refresh_every
+        self._high = bits - 1
+        self._counter = np.zeros(frames, dtype=_counter_dtype(bits))
+        self._loaded_at = np.zeros(frames, dtype=np.int64)
+        self._slot_pid: List[int] = []
+        self._page_to_idx: Dict[int, int] = {}
+        self._pending: Dict[int, int] = {}
+        self._ticks = 0
+        self._bit = 1
+        self._missing_t = 0
+
+    def access(self, page_id: int, write: bool = False, t: Optional[int] = None) -> AccessOutcome:
+        if t is None:
+            t = self._missing_t
+            self._missing_t += 1
+        self.trace_len += 1
+        pending = self._pending
+        slot_pid = self._slot_pid
+        outcome = HIT
+        idx = self._page_to_idx.get(page_id)
+        if idx is not None:
+            self.hits += 1
+            pending[idx] = pending.get(idx, 0) | self._bit
+        else:
+            self.faults += 1
+            outcome = MISS
+            if len(slot_pid) < self.frames:
+                idx = len(slot_pid)
+                slot_pid.append(page_id)
+            else:
+                if self._ticks:
+                    Aging._flush_ticks(self._counter, pending, self._ticks, self._high)
+                    self._ticks = 0
+                    self._bit = 1
+                idx = _aging_victim(self._counter, self._loaded_at)
+                victim = slot_pid[idx]
+                del self._page_to_idx[victim]
+                slot_pid[idx] = page_id
+                self.evictions += 1
+                outcome = (False, victim)
+
+            self._page_to_idx[page_id] = idx
+            self._counter[idx] = 0
+            self._loaded_at[idx] = t
+            pending[idx] = self._bit
+
+        if self.trace_len % self.refresh_every == 0:
+            self._ticks += 1
+            self._bit <<= 1
+            if self._ticks >= 64:
+                Aging._flush_ticks(self._counter, pending, self._ticks, self._high)
+                self._ticks = 0
+                self._bit = 1
+        return outcome
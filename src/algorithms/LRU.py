@@ -1,13 +1,120 @@
-from typing import Dict, Iterable, List, Optional, Set
+from array import array
+from collections import OrderedDict
+from typing import Callable, Generator, Iterable, List, Optional, Set, Tuple
+
+from src.algorithms.baseAlgorithm import SNAPSHOT, PageReplacementAlgorithm
+from src.algorithms.online import HIT, MISS, AccessOutcome, OnlineSimulator
+from src.core import Access, RunResult, PTE, TraceBuffer
+
+
+class StackDistances:
+    """
+    Distâncias de pilha LRU em streaming: uma árvore de Fenwick sobre as
+    posições marca o último acesso de cada página, e a distância de um
+    reacesso é o nº de páginas distintas usadas desde o acesso anterior, mais
+    um. A memória é proporcional ao nº de páginas distintas: quando as
+    posições acabam, as páginas são renumeradas 1..D na ordem de recência.
+    """
+
+    __slots__ = ("last", "tree", "size", "pos")
+
+    MIN_SIZE = 1024
+
+    def __init__(self) -> None:
+        self.last: dict = {}
+        self.size = self.MIN_SIZE
+        self.tree = [0] * (self.size + 1)
+        self.pos = 0
+
+    def access(self, pid: int) -> int:
+        """Registra o acesso e devolve sua distância (0 = acesso frio)."""
+        if self.pos == self.size:
+            self._compact()
+        self.pos += 1
+        pos = self.pos
+        n = self.size
+        tree = self.tree
+        last = self.last
+
+        d = 0
+        prev = last.get(pid)
+        if prev is not None:
+            below = 0
+            k = prev
+            while k > 0:
+                below += tree[k]
+                k -= k & -k
+            d = len(last) - below + 1
+
+            k = prev
+            while k <= n:
+                tree[k] -= 1
+                k += k & -k
+
+        last[pid] = pos
+        k = pos
+        while k <= n:
+            tree[k] += 1
+            k += k & -k
+        return d
+
+    def _compact(self) -> None:
+        order = sorted(self.last, key=self.last.__getitem__)
+        live = len(order)
+        self.size = max(self.MIN_SIZE, 2 * live)
+        self.last = {pid: i + 1 for i, pid in enumerate(order)}
+        # Fenwick com 1 nas posições 1..live, montada em O(size).
+        tree = [0] * (self.size + 1)
+        for i in range(1, self.size + 1):
+            if i <= live:
+                tree[i] += 1
+            j = i + (i & -i)
+            if j <= self.size:
+                tree[j] += tree[i]
+        self.tree = tree
+        self.pos = live
+
+
+def lru_stack_distances(ids: Iterable[int]) -> Tuple[List[int], int, int]:
+    """
+    Distâncias de pilha LRU (Mattson) em uma passada, O(n log D), com memória
+    O(D) (D = páginas distintas; ver StackDistances). Com F frames, há acerto
+    sse d <= F.
+
+    Retorna (hist, trace_len, distinct), com hist[d] = nº de acessos com
+    distância d (d em 1..distinct; acessos frios não entram).
+    """
+    stack = StackDistances()
+    access = stack.access
+    hist = [0]
+    n = 0
+
+    for pid in ids:
+        n += 1
+        d = access(pid)
+        if d:
+            hist[d] += 1
+        else:
+            hist.append(0)
+
+    return hist, n, len(stack.last)
 
-from src.algorithms.baseAlgorithm import PageReplacementAlgorithm
-from src.core import Access, RunResult, PTE
 
 class LRU(PageReplacementAlgorithm):
+    online = True
+
     def __init__(self):
         super().__init__("LRU")
 
     def run(self, trace: Iterable[Access], frames: int) -> RunResult:
+        """
+        LRU com rastreamento opcional; acerto e falta em O(1).
+
+        Estruturas:
+          - recency: OrderedDict pid -> PTE das residentes, LRU à esquerda
+            (move_to_end no acerto, popitem(last=False) na remoção)
+          - slots: PTE por frame, usado só para montar o estado do trace
+        """
         if frames <= 0:
             raise ValueError("frames deve ser > 0")
 
@@ -16,33 +123,16 @@ class LRU(PageReplacementAlgorithm):
 
         self._trace_begin(frames)
 
-        all_pages = {acc.page_id for acc in seq}
-        page_table: Dict[int, PTE] = {
-            pid: PTE(
-                page_id=pid,
-                frame=None,
-                R=0,
-                M=0,
-                loaded_at=None,
-                last_used=None,
-            )
-            for pid in all_pages
-        }
-
-        frames_list: List[PTE] = []
+        recency: "OrderedDict[int, PTE]" = OrderedDict()
+        slots: List[Optional[PTE]] = [None] * frames
 
         faults = hits = evictions = 0
         time: int = 0
         fallback_t = 0
 
         def build_frames_state() -> List[dict]:
-            frames_pte: List[Optional[PTE]] = [None] * frames
-            for pte in page_table.values():
-                if pte.frame is not None and 0 <= pte.frame < frames:
-                    frames_pte[pte.frame] = pte
-
             state: List[dict] = []
-            for idx, slot in enumerate(frames_pte):
+            for idx, slot in enumerate(slots):
                 if slot is None:
                     state.append(
                         {
@@ -72,58 +162,56 @@ class LRU(PageReplacementAlgorithm):
                 current_t = fallback_t
                 fallback_t += 1
 
-            pte: PTE = page_table[acc.page_id]
+            pte: Optional[PTE] = recency.get(acc.page_id)
             evicted_pid: Optional[int] = None
             victim_pid_meta: Optional[int] = None
 
-            if pte.frame is not None:
+            if pte is not None:
                 hit = True
                 hits += 1
                 pte.R = 1
                 if acc.write:
                     pte.M = 1
                 pte.last_used = time
+                recency.move_to_end(acc.page_id)
             else:
                 hit = False
                 faults += 1
 
-                if len(frames_list) < frames:
-                    pte.frame = len(frames_list)
-                    pte.R = 1
-                    pte.M = int(acc.write)
-                    pte.loaded_at = time
-                    pte.last_used = time
-                    frames_list.append(pte)
+                if len(recency) < frames:
+                    frame = len(recency)
                 else:
-                    victim = min(frames_list, key=lambda x: x.last_used)
-                    victim_pid_meta = victim.page_id
+                    victim_pid_meta, victim = recency.popitem(last=False)
                     evictions += 1
-
-                    victim_frame = victim.frame
-                    frames_list.remove(victim)
+                    frame = victim.frame
                     victim.frame = None
-
-                    pte.frame = victim_frame
-                    pte.R = 1
-                    pte.M = int(acc.write)
-                    pte.loaded_at = time
-                    pte.last_used = time
-                    frames_list.append(pte)
                     evicted_pid = victim_pid_meta
 
-            self.trace_step(
-                t=current_t,
-                access_page=acc.page_id,
-                access_write=acc.write,
-                hit=hit,
-                evicted_page=evicted_pid,
-                frames_state=build_frames_state(),
-                decision_meta={
-                    "policy": "lru",
-                    "frames_used": len(frames_list),
-                    "victim": victim_pid_meta,
-                },
-            )
+                pte = PTE(
+                    page_id=acc.page_id,
+                    frame=frame,
+                    R=1,
+                    M=int(acc.write),
+                    loaded_at=time,
+                    last_used=time,
+                )
+                recency[acc.page_id] = pte
+                slots[frame] = pte
+
+            if self._trace_enabled:
+                self.trace_step(
+                    t=current_t,
+                    access_page=acc.page_id,
+                    access_write=acc.write,
+                    hit=hit,
+                    evicted_page=evicted_pid,
+                    frames_state=build_frames_state(),
+                    decision_meta={
+                        "policy": "lru",
+                        "frames_used": len(recency),
+                        "victim": victim_pid_meta,
+                    },
+                )
 
             time += 1
 
@@ -137,3 +225,107 @@ class LRU(PageReplacementAlgorithm):
             hits=hits,
             evictions=evictions,
         )
+
+    def miss_ratio_curve(
+        self,
+        trace: Iterable[Access],
+        frames_list: Optional[Iterable[int]] = None,
+    ) -> List[RunResult]:
+        """
+        RunResults exatos do LRU para vários frames a partir de UMA passada.
+
+        frames_list=None devolve a curva completa, de 1 até o nº de páginas
+        distintas (acima disso as faltas não mudam).
+        """
+        seq = self._normalize_trace(trace)
+        return self._run_sweep(seq, frames_list)
+
+    def _run_sweep(
+        self, seq: TraceBuffer, frames_list: Optional[Iterable[int]]
+    ) -> List[RunResult]:
+        hist, trace_len, distinct = lru_stack_distances(seq.pages)
+        if frames_list is None:
+            frames_list = range(1, max(1, distinct) + 1)
+        return self._results_from_distances(trace_len, hist, distinct, frames_list)
+
+    @classmethod
+    def _sweep_runs(cls, distinct: Callable[[], int]) -> float:
+        # Fenwick em Python puro: medido, ~10 execuções do kernel com OrderedDict
+        # (não depende do nº de páginas, então distinct() nem é chamado).
+        return 10.0
+
+    def _stream_kernel(
+        self, frames: int, state: Optional[dict] = None
+    ) -> Generator[Optional[dict], Optional[TraceBuffer], RunResult]:
+        """Kernel incremental de contagem: OrderedDict em ordem de recência (LRU à esquerda)."""
+        if frames <= 0:
+            raise ValueError("frames deve ser > 0")
+
+        recency: "OrderedDict[int, None]" = OrderedDict()
+        trace_len = 0
+        faults = hits = evictions = 0
+        if state is not None:
+            recency.update(dict.fromkeys(state["recency"]))
+            trace_len, faults, hits, evictions = state["counters"]
+        move_to_end = recency.move_to_end
+        popitem = recency.popitem
+
+        chunk = yield
+        while chunk is not None:
+            if chunk is SNAPSHOT:
+                chunk = yield {
+                    "recency": array("q", recency),
+                    "counters": (trace_len, faults, hits, evictions),
+                }
+                continue
+            trace_len += len(chunk)
+            for pid in chunk.pages:
+                if pid in recency:
+                    hits += 1
+                    move_to_end(pid)
+                    continue
+
+                faults += 1
+                if len(recency) >= frames:
+                    popitem(last=False)
+                    evictions += 1
+                recency[pid] = None
+            chunk = yield
+
+        return RunResult(
+            algo_name=self.name,
+            frames=frames,
+            trace_len=trace_len,
+            faults=faults,
+            hits=hits,
+            evictions=evictions,
+        )
+
+    def open(self, frames: int) -> "LRUSimulator":
+        return LRUSimulator(self.name, frames)
+
+
+class LRUSimulator(OnlineSimulator):
+    """LRU incremental: OrderedDict em ordem de recência (LRU à esquerda)."""
+
+    __slots__ = ("_recency",)
+
+    def __init__(self, name: str, frames: int) -> None:
+        super().__init__(name, frames)
+        self._recency: "OrderedDict[int, None]" = OrderedDict()
+
+    def access(self, page_id: int, write: bool = False, t: Optional[int] = None) -> AccessOutcome:
+        recency = self._recency
+        self.trace_len += 1
+        if page_id in recency:
+            self.hits += 1
+            recency.move_to_end(page_id)
+            return HIT
+
+        self.faults += 1
+        recency[page_id] = None
+        if len(recency) > self.frames:
+            victim, _ = recency.popitem(last=False)
+            self.evictions += 1
+            return False, victim
+        return MISS
@@ -1,51 +1,78 @@
-from typing import Dict, Iterable, List, Optional, Set
+import heapq
+from typing import Dict, Generator, Iterable, List, Optional, Tuple
 
-from src.algorithms.baseAlgorithm import PageReplacementAlgorithm
-from src.core import Access, RunResult, PTE
+from src.algorithms.baseAlgorithm import SNAPSHOT, PageReplacementAlgorithm
+from src.algorithms.online import HIT, MISS, AccessOutcome, OnlineSimulator
+from src.core import Access, PageTable, RunResult, TraceBuffer
+
+
+def _pop_least_used(
+    heap: List[Tuple[int, int, int]],
+    counts: Dict[int, int],
+    load_seq: Dict[int, int],
+) -> int:
+    """
+    Remove do heap a residente com menor (contador, ordem de carga).
+
+    Entradas são (contador, ordem_de_carga, pid); as obsoletas (página já
+    expulsa ou com contador incrementado) são descartadas na hora.
+    """
+    while True:
+        count, seq, pid = heapq.heappop(heap)
+        if load_seq.get(pid) == seq and counts[pid] == count:
+            return pid
 
 
 class NFU(PageReplacementAlgorithm):
-    def __init__(self):
+    online = True
+
+    def __init__(self, counter_bits: Optional[int] = None):
+        """
+        counter_bits: se definido, os contadores saturam em 2**counter_bits - 1
+        (como contadores de hardware de largura fixa). None = sem limite.
+        """
         super().__init__("NFU")
+        if counter_bits is not None and counter_bits < 1:
+            raise ValueError("counter_bits deve ser >= 1")
+        self.counter_bits = counter_bits
+
+    def _max_count(self) -> Optional[int]:
+        return None if self.counter_bits is None else (1 << self.counter_bits) - 1
 
     def run(self, trace: Iterable[Access], frames: int) -> RunResult:
+        """
+        NFU com rastreamento opcional.
+
+        Estruturas (só páginas residentes, memória O(frames)):
+          - page_table: PageTable (frame, bits R/M e tempos)
+          - counts: pid -> contador de uso (reinicia em 1 na carga)
+          - heap: (contador, ordem de carga, pid) com invalidação preguiçosa;
+            a vítima é a de menor contador, desempatando pela mais antiga
+        """
         if frames <= 0:
             raise ValueError("frames deve ser > 0")
 
         seq = self._normalize_trace(trace)
         trace_len = len(seq)
+        max_count = self._max_count()
 
         self._trace_begin(frames)
 
-        all_pages = {acc.page_id for acc in seq}
-        page_table: Dict[int, PTE] = {
-            pid: PTE(
-                page_id=pid,
-                frame=None,
-                R=0,
-                M=0,
-                loaded_at=None,
-                last_used=None,
-            )
-            for pid in all_pages
-        }
-
-        usage_counter: Dict[int, int] = {pid: 0 for pid in all_pages}
-
-        frames_list: List[PTE] = []
+        page_table = PageTable(frames)
+        counts: Dict[int, int] = {}
+        load_seq: Dict[int, int] = {}
+        heap: List[Tuple[int, int, int]] = []
+        loads = 0
+
         faults = hits = evictions = 0
         time = 0
         fallback_t = 0
 
         def build_frames_state() -> List[dict]:
-            frames_pte: List[Optional[PTE]] = [None] * frames
-            for pte in page_table.values():
-                if pte.frame is not None and 0 <= pte.frame < frames:
-                    frames_pte[pte.frame] = pte
-
             state: List[dict] = []
-            for idx, slot in enumerate(frames_pte):
-                if slot is None:
+            for idx in range(frames):
+                slot = page_table.frame_page[idx]
+                if slot < 0:
                     meta = {"count": 0}
                     state.append(
                         {
@@ -57,13 +84,14 @@ class NFU(PageReplacementAlgorithm):
                         }
                     )
                 else:
-                    meta = {"count": usage_counter.get(slot.page_id, 0)}
+                    slot_pid = page_table.page_id(slot)
+                    meta = {"count": counts.get(slot_pid, 0)}
                     state.append(
                         {
                             "frame_index": idx,
-                            "page_id": slot.page_id,
-                            "R": slot.R,
-                            "M": slot.M,
+                            "page_id": slot_pid,
+                            "R": page_table.R[slot],
+                            "M": page_table.M[slot],
                             "meta": meta,
                         }
                     )
@@ -77,61 +105,57 @@ class NFU(PageReplacementAlgorithm):
                 current_t = fallback_t
                 fallback_t += 1
 
-            pte = page_table[acc.page_id]
+            pid = acc.page_id
             evicted_pid: Optional[int] = None
             victim_pid_meta: Optional[int] = None
 
-            if pte.frame is not None:
+            if pid in page_table:
                 hit = True
                 hits += 1
-                pte.R = 1
-                if acc.write:
-                    pte.M = 1
-                usage_counter[pte.page_id] += 1
-                pte.last_used = time
+                page_table.touch(pid, acc.write, time)
+                count = counts[pid]
+                if max_count is None or count < max_count:
+                    counts[pid] = count + 1
+                    heapq.heappush(heap, (count + 1, load_seq[pid], pid))
             else:
                 hit = False
                 faults += 1
 
-                if len(frames_list) < frames:
-                    pte.frame = len(frames_list)
-                    pte.R = 1
-                    pte.M = int(acc.write)
-                    pte.loaded_at = time
-                    pte.last_used = time
-                    usage_counter[pte.page_id] = 1
-                    frames_list.append(pte)
+                if len(page_table) < frames:
+                    frame = len(page_table)
                 else:
-                    victim = min(frames_list, key=lambda x: usage_counter[x.page_id])
-                    victim_pid_meta = victim.page_id
+                    victim_pid_meta = _pop_least_used(heap, counts, load_seq)
                     evicted_pid = victim_pid_meta
                     evictions += 1
 
-                    victim_frame = victim.frame
-                    frames_list.remove(victim)
-                    victim.frame = None
-
-                    pte.frame = victim_frame
-                    pte.R = 1
-                    pte.M = int(acc.write)
-                    pte.loaded_at = time
-                    pte.last_used = time
-                    usage_counter[pte.page_id] = 1
-                    frames_list.append(pte)
-
-            self.trace_step(
-                t=current_t,
-                access_page=acc.page_id,
-                access_write=acc.write,
-                hit=hit,
-                evicted_page=evicted_pid,
-                frames_state=build_frames_state(),
-                decision_meta={
-                    "policy": "nfu",
-                    "frames_used": len(frames_list),
-                    "victim": victim_pid_meta,
-                },
-            )
+                    frame = page_table.evict(victim_pid_meta)
+                    del counts[victim_pid_meta]
+                    del load_seq[victim_pid_meta]
+
+                page_table.load(pid, frame, acc.write, time)
+                counts[pid] = 1
+                load_seq[pid] = loads
+                heapq.heappush(heap, (1, loads, pid))
+                loads += 1
+
+            if len(heap) > 2 * frames + 16:
+                heap = [(counts[p], load_seq[p], p) for p in load_seq]
+                heapq.heapify(heap)
+
+            if self._trace_enabled:
+                self.trace_step(
+                    t=current_t,
+                    access_page=pid,
+                    access_write=acc.write,
+                    hit=hit,
+                    evicted_page=evicted_pid,
+                    frames_state=build_frames_state(),
+                    decision_meta={
+                        "policy": "nfu",
+                        "frames_used": len(page_table),
+                        "victim": victim_pid_meta,
+                    },
+                )
 
         self._trace_end(frames)
 
@@ -143,3 +167,121 @@ class NFU(PageReplacementAlgorithm):
             hits=hits,
             evictions=evictions,
         )
+
+    def _stream_kernel(
+        self, frames: int, state: Optional[dict] = None
+    ) -> Generator[Optional[dict], Optional[TraceBuffer], RunResult]:
+        """Kernel incremental de contagem com o mesmo heap (contador, ordem de carga) de run()."""
+        if frames <= 0:
+            raise ValueError("frames deve ser > 0")
+
+        max_count = self._max_count()
+        heappush = heapq.heappush
+        counts: Dict[int, int] = {}
+        load_seq: Dict[int, int] = {}
+        heap: List[Tuple[int, int, int]] = []
+        limit = 2 * frames + 16
+        loads = 0
+        trace_len = 0
+        faults = hits = evictions = 0
+        if state is not None:
+            counts.update(state["counts"])
+            load_seq.update(state["load_seq"])
+            loads = state["loads"]
+            trace_len, faults, hits, evictions = state["counters"]
+            heap = [(counts[p], load_seq[p], p) for p in load_seq]
+            heapq.heapify(heap)
+
+        chunk = yield
+        while chunk is not None:
+            if chunk is SNAPSHOT:
+                chunk = yield {
+                    "counts": dict(counts),
+                    "load_seq": dict(load_seq),
+                    "loads": loads,
+                    "counters": (trace_len, faults, hits, evictions),
+                }
+                continue
+            trace_len += len(chunk)
+            for pid in chunk.pages:
+                count = counts.get(pid)
+                if count is not None:
+                    hits += 1
+                    if max_count is not None and count >= max_count:
+                        continue
+                    counts[pid] = count + 1
+                    heappush(heap, (count + 1, load_seq[pid], pid))
+                else:
+                    faults += 1
+                    if len(counts) >= frames:
+                        victim_pid = _pop_least_used(heap, counts, load_seq)
+                        del counts[victim_pid]
+                        del load_seq[victim_pid]
+                        evictions += 1
+                    counts[pid] = 1
+                    load_seq[pid] = loads
+                    heappush(heap, (1, loads, pid))
+                    loads += 1
+
+                if len(heap) > limit:
+                    heap = [(counts[p], load_seq[p], p) for p in load_seq]
+                    heapq.heapify(heap)
+            chunk = yield
+
+        return RunResult(
+            algo_name=self.name,
+            frames=frames,
+            trace_len=trace_len,
+            faults=faults,
+            hits=hits,
+            evictions=evictions,
+        )
+
+    def open(self, frames: int) -> "NFUSimulator":
+        return NFUSimulator(self.name, frames, self._max_count())
+
+
+class NFUSimulator(OnlineSimulator):
+    """NFU incremental com o heap (contador, ordem de carga) do kernel: O(log F)."""
+
+    __slots__ = ("max_count", "_counts", "_load_seq", "_heap", "_limit", "_loads")
+
+    def __init__(self, name: str, frames: int, max_count: Optional[int]) -> None:
+        super().__init__(name, frames)
+        self.max_count = max_count
+        self._counts: Dict[int, int] = {}
+        self._load_seq: Dict[int, int] = {}
+        self._heap: List[Tuple[int, int, int]] = []
+        self._limit = 2 * frames + 16
+        self._loads = 0
+
+    def access(self, page_id: int, write: bool = False, t: Optional[int] = None) -> AccessOutcome:
+        counts = self._counts
+        load_seq = self._load_seq
+        self.trace_len += 1
+        outcome = HIT
+        count = counts.get(page_id)
+        if count is not None:
+            self.hits += 1
+            if self.max_count is not None and count >= self.max_count:
+                return HIT
+            counts[page_id] = count + 1
+            heapq.heappush(self._heap, (count + 1, load_seq[page_id], page_id))
+        else:
+            self.faults += 1
+            outcome = MISS
+            if len(counts) >= self.frames:
+                victim = _pop_least_used(self._heap, counts, load_seq)
+                del counts[victim]
+                del load_seq[victim]
+                self.evictions += 1
+                outcome = (False, victim)
+            counts[page_id] = 1
+            load_seq[page_id] = self._loads
+            heapq.heappush(self._heap, (1, self._loads, page_id))
+            self._loads += 1
+
+        if len(self._heap) > self._limit:
+            self._heap = [(counts[p], load_seq[p], p) for p in load_seq]
+            heapq.heapify(self._heap)
+        return outcome
@@ -1,10 +1,96 @@
-from typing import Dict, Iterable, List, Optional
+import heapq
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 from src.algorithms.baseAlgorithm import PageReplacementAlgorithm
-from src.core import Access, PTE, RunResult
+from src.core import Access, PageTable, RunResult, TraceBuffer
+
+
+def next_use_index(ids: List[int]) -> List[int]:
+    """
+    Para cada posição i, devolve a posição do próximo acesso à mesma página
+    (len(ids) quando ela não é mais usada). Uma única passada de trás para frente.
+    """
+    never = len(ids)
+    next_use = [never] * never
+    seen: Dict[int, int] = {}
+    for i in range(never - 1, -1, -1):
+        pid = ids[i]
+        next_use[i] = seen.get(pid, never)
+        seen[pid] = i
+    return next_use
+
+
+def opt_stack_distances(ids: Iterable[int]) -> Tuple[List[int], int, int]:
+    """
+    Distâncias de pilha do Ótimo (pilha de prioridade de Mattson) em uma passada.
+
+    A pilha é ordenada de forma que os k primeiros elementos são exatamente o
+    conteúdo do Ótimo com k frames. Em cada acesso a página vai para o topo e,
+    descendo até a posição que ela ocupava, a página "carregada" troca de lugar
+    com a do nível sempre que esta tiver próximo uso mais distante. Quando a
+    carregada não tem uso futuro, nenhuma troca é possível e o laço para cedo.
+
+    A busca e as trocas são lineares na profundidade, O(n x páginas distintas)
+    no pior caso; por isso benchmark() só a usa com muitos frames (ver
+    Optimal._sweep_runs).
+
+    Retorna (hist, trace_len, distinct) no mesmo formato de lru_stack_distances.
+    """
+    ids = list(ids)
+    next_use = next_use_index(ids)
+    never = len(ids)
+    stack: List[int] = []
+    nxt: Dict[int, int] = {}
+    hist = [0]
+
+    for i, pid in enumerate(ids):
+        if pid in nxt:
+            depth = stack.index(pid)
+            hist[depth + 1] += 1
+        else:
+            depth = len(stack)
+            stack.append(pid)
+            hist.append(0)
+        nxt[pid] = next_use[i]
+
+        if depth == 0:
+            continue
+
+        carry = stack[0]
+        stack[0] = pid
+        carry_next = nxt[carry]
+        for k in range(1, depth):
+            if carry_next == never:
+                break
+            y = stack[k]
+            y_next = nxt[y]
+            if y_next > carry_next:
+                stack[k] = carry
+                carry = y
+                carry_next = y_next
+        stack[depth] = carry
+
+    return hist, never, len(nxt)
+
+
+def _pop_farthest(heap: List[Tuple[int, int, int]], pending: Dict[int, int]) -> Tuple[int, int]:
+    """
+    Remove do heap a página residente com próximo uso mais distante.
+
+    Entradas são (-próximo_uso, slot, pid); as obsoletas (página já expulsa ou
+    com próximo uso atualizado) são descartadas na hora. Empates só ocorrem
+    entre páginas sem uso futuro e saem pelo menor slot, como no Ótimo original.
+    """
+    while True:
+        neg_next, slot, pid = heapq.heappop(heap)
+        if pending.get(pid) == -neg_next:
+            return slot, pid
 
 
 class Optimal(PageReplacementAlgorithm):
+    # Índice de próximo uso + heap: bem mais caro por acesso que as online.
+    relative_cost = 4.0
+
     def __init__(self):
         super().__init__("Otimo")
 
@@ -15,18 +101,14 @@ class Optimal(PageReplacementAlgorithm):
 
         self._trace_begin(frames)
 
-        page_table: Dict[int, PTE] = {}
+        page_table = PageTable(frames)
         fallback_t = 0
 
         def build_frames_state() -> List[dict]:
-            frames_pte: List[Optional[PTE]] = [None] * frames
-            for pte in page_table.values():
-                if pte.frame is not None and 0 <= pte.frame < frames:
-                    frames_pte[pte.frame] = pte
-
             state: List[dict] = []
-            for idx, slot in enumerate(frames_pte):
-                if slot is None:
+            for idx in range(frames):
+                slot = page_table.frame_page[idx]
+                if slot < 0:
                     state.append(
                         {
                             "frame_index": idx,
@@ -40,15 +122,18 @@ class Optimal(PageReplacementAlgorithm):
                     state.append(
                         {
                             "frame_index": idx,
-                            "page_id": slot.page_id,
-                            "R": slot.R,
-                            "M": slot.M,
-                            "meta": {"last_used": slot.last_used},
+                            "page_id": page_table.page_id(slot),
+                            "R": page_table.R[slot],
+                            "M": page_table.M[slot],
+                            "meta": {"last_used": page_table.last_used[slot]},
                         }
                     )
             return state
 
-        ids = [a.page_id for a in seq]
+        ids = seq.pages
+        next_use = next_use_index(ids)
+        heap: List[Tuple[int, int, int]] = []
+        pending: Dict[int, int] = {}
 
         for i, access in enumerate(seq):
             if access.t is not None:
@@ -61,14 +146,11 @@ class Optimal(PageReplacementAlgorithm):
             evicted_pid: Optional[int] = None
             victim_idx_meta: Optional[int] = None
 
-            if pid in page_table and page_table[pid].frame is not None:
+            if pid in page_table:
                 hit = True
                 hits += 1
-                pte = page_table[pid]
-                pte.R = 1
-                if access.write:
-                    pte.M = 1
-                pte.last_used = current_t
+                page_table.touch(pid, access.write, current_t)
+                frame_idx = page_table.frame_of(pid)
             else:
                 hit = False
                 faults += 1
@@ -77,35 +159,24 @@ class Optimal(PageReplacementAlgorithm):
                     frame_idx = len(frame_list)
                     frame_list.append(pid)
                 else:
-                    future = ids[i + 1 :]
-                    distances: List[float] = []
-                    for p in frame_list:
-                        try:
-                            idx = future.index(p)
-                        except ValueError:
-                            idx = float("inf")
-                        distances.append(idx)
-
-                    victim_idx = distances.index(max(distances))
+                    victim_idx, victim_pid = _pop_farthest(heap, pending)
+                    del pending[victim_pid]
                     victim_idx_meta = victim_idx
-                    victim_pid = frame_list[victim_idx]
                     evicted_pid = victim_pid
                     evictions += 1
 
-                    if victim_pid is not None and victim_pid in page_table:
-                        del page_table[victim_pid]
+                    page_table.evict(victim_pid)
 
                     frame_list[victim_idx] = pid
                     frame_idx = victim_idx
 
-                page_table[pid] = PTE(
-                    page_id=pid,
-                    frame=frame_idx,
-                    R=1,
-                    M=1 if access.write else 0,
-                    loaded_at=current_t,
-                    last_used=current_t,
-                )
+                page_table.load(pid, frame_idx, access.write, current_t)
+
+            pending[pid] = next_use[i]
+            heapq.heappush(heap, (-next_use[i], frame_idx, pid))
+            if len(heap) > 2 * frames + 16:
+                heap = [(-nxt, page_table.frame_of(p), p) for p, nxt in pending.items()]
+                heapq.heapify(heap)
 
             self.trace_step(
                 t=current_t,
@@ -132,3 +203,79 @@ class Optimal(PageReplacementAlgorithm):
             hits=hits,
             evictions=evictions,
         )
+
+    def miss_ratio_curve(
+        self,
+        trace: Iterable[Access],
+        frames_list: Optional[Iterable[int]] = None,
+    ) -> List[RunResult]:
+        """
+        RunResults exatos do Ótimo para vários frames a partir de UMA passada.
+
+        frames_list=None devolve a curva completa, de 1 até o nº de páginas
+        distintas (acima disso as faltas não mudam).
+        """
+        seq = self._normalize_trace(trace)
+        return self._run_sweep(seq, frames_list)
+
+    def _run_sweep(
+        self, seq: TraceBuffer, frames_list: Optional[Iterable[int]]
+    ) -> List[RunResult]:
+        hist, trace_len, distinct = opt_stack_distances(seq.pages)
+        if frames_list is None:
+            frames_list = range(1, max(1, distinct) + 1)
+        return self._results_from_distances(trace_len, hist, distinct, frames_list)
+
+    @classmethod
+    def _sweep_runs(cls, distinct: Callable[[], int]) -> float:
+        # A troca na pilha desce até a profundidade da página, O(distintas)
+        # por acesso: medido, ~1 execução de _run_fast a cada 50 páginas.
+        return 1 + distinct() / 50
+
+    def _run_fast(self, seq: TraceBuffer, frames: int) -> RunResult:
+        """
+        Kernel só de contagem. Mesma escolha de vítima que run(): max-heap
+        pelo próximo uso (índice pré-calculado), com invalidação preguiçosa.
+        """
+        if frames <= 0:
+            raise ValueError("frames deve ser > 0")
+
+        ids = seq.pages
+        next_use = next_use_index(ids)
+        heappush = heapq.heappush
+        slot_of: Dict[int, int] = {}
+        heap: List[Tuple[int, int, int]] = []
+        pending: Dict[int, int] = {}
+        limit = 2 * frames + 16
+        hits = faults = evictions = 0
+
+        for i, pid in enumerate(ids):
+            slot = slot_of.get(pid)
+            if slot is not None:
+                hits += 1
+            else:
+                faults += 1
+                if len(slot_of) < frames:
+                    slot = len(slot_of)
+                else:
+                    slot, victim_pid = _pop_farthest(heap, pending)
+                    del pending[victim_pid]
+                    del slot_of[victim_pid]
+                    evictions += 1
+                slot_of[pid] = slot
+
+            nxt = next_use[i]
+            pending[pid] = nxt
+            heappush(heap, (-nxt, slot, pid))
+            if len(heap) > limit:
+                heap = [(-n, slot_of[p], p) for p, n in pending.items()]
+                heapq.heapify(heap)
+
+        return RunResult(
+            algo_name=self.name,
+            frames=frames,
+            trace_len=len(ids),
+            faults=faults,
+            hits=hits,
+            evictions=evictions,
+        )
@@ -1,9 +1,31 @@
 from abc import ABC, abstractmethod
-from typing import Iterable, List, Optional, Dict, Any
+from typing import Callable, Iterable, Iterator, List, Optional, Dict, Any, Generator, Union
+import inspect
+import math
 import os
 import matplotlib.pyplot as plt
-from src.core import BenchmarkResult, Access, RunResult
+from src.core import BenchmarkResult, Access, RunResult, TraceBuffer, iter_chunks
 from src.trace import RunTrace, StepLog, FrameSnapshot
+from src.parallel import resolve_jobs, run_frames_parallel
+from src.result_cache import ResultCache, trace_digest
+from src.checkpoint import DEFAULT_EVERY, load_checkpoint, save_checkpoint
+from src.algorithms.online import OnlineSimulator
+
+
+# Enviado a um _stream_kernel para pedir uma cópia do seu estado.
+SNAPSHOT = object()
+
+
+def _skip_accesses(chunks: Iterable[TraceBuffer], n: int) -> Iterator[TraceBuffer]:
+    """Descarta os primeiros n acessos de uma sequência de blocos."""
+    for chunk in chunks:
+        if n >= len(chunk):
+            n -= len(chunk)
+            continue
+        yield chunk[n:] if n else chunk
+        n = 0
+    if n:
+        raise ValueError("O traço tem menos acessos que os já simulados no checkpoint.")
 
 
 class PageReplacementAlgorithm(ABC):
@@ -11,12 +33,25 @@ class PageReplacementAlgorithm(ABC):
     Base para algoritmos de substituição de páginas.
 
     Responsabilidades:
-      - normalizar o traço
+      - normalizar o traço (uma vez, para TraceBuffer)
       - rodar benchmark (chamar run() para cada frames)
+      - escolher o kernel só de contagem (_run_fast) quando o trace está desligado
+      - permitir varreduras em uma passada (_run_sweep) para algoritmos de
+        pilha, usadas só quando saem mais baratas que um _run_fast por frames
+      - executar políticas online em streaming (stream), em memória constante,
+        com checkpoints periódicos e retomada (resume)
       - armazenar o último BenchmarkResult
       - armazenar RunTrace por frames (quando trace_enabled=True)
     """
 
+    # Políticas online decidem só com o passado e implementam _stream_kernel;
+    # para elas _run_fast e stream() usam o mesmo kernel incremental.
+    online: bool = False
+
+    # Custo estimado por acesso, relativo às políticas simples; usado só para
+    # ordenar tarefas (src.suite agenda as mais caras primeiro).
+    relative_cost: float = 1.0
+
     def __init__(self, name: str):
         self.name = name
         self._last_benchmark: Optional[BenchmarkResult] = None
@@ -25,6 +60,21 @@ class PageReplacementAlgorithm(ABC):
         self._last_trace_by_frames: dict[int, RunTrace] = {}
 
 
+    def config(self) -> Dict[str, Any]:
+        """
+        Parâmetros do construtor e seus valores atuais (ex.: {"window": 4}).
+
+        Cada parâmetro de __init__ é guardado num atributo de mesmo nome; é
+        isso que identifica a configuração no cache de resultados.
+        """
+        params = inspect.signature(type(self).__init__).parameters
+        return {
+            name: getattr(self, name)
+            for name, p in params.items()
+            if name != "self" and p.kind not in (p.VAR_POSITIONAL, p.VAR_KEYWORD)
+            and hasattr(self, name)
+        }
+
     def _trace_begin(self, frames: int) -> None:
         """Inicia o registro de um run(trace, frames)."""
         if self._trace_enabled:
@@ -88,11 +138,12 @@ class PageReplacementAlgorithm(ABC):
         return self._last_trace_by_frames
 
 
-    def _normalize_trace(self, trace: Iterable[Access]) -> List[Access]:
-        seq = list(trace)
-        if not all(isinstance(a, Access) for a in seq):
-            raise TypeError("O traço deve conter apenas objetos Access.")
-        return seq
+    def _normalize_trace(self, trace: Iterable[Access]) -> TraceBuffer:
+        """
+        Valida e converte o traço para TraceBuffer. Um TraceBuffer é devolvido
+        como está, então benchmark() valida uma vez e cada run() reaproveita.
+        """
+        return TraceBuffer.from_accesses(trace)
 
     @abstractmethod
     def run(self, trace: Iterable[Access], frames: int) -> RunResult:
@@ -104,30 +155,306 @@ class PageReplacementAlgorithm(ABC):
         """
         ...
 
+    def _run_fast(self, seq: TraceBuffer, frames: int) -> RunResult:
+        """
+        Kernel só de contagem, usado por benchmark() com trace_enabled=False.
+
+        Recebe o traço já normalizado e deve devolver o MESMO RunResult que
+        run(), sem montar snapshots nem dicts por passo. Políticas online usam
+        _stream_kernel com o traço num único bloco; as demais sobrescrevem ou
+        caem no padrão, que delega para run().
+        """
+        if self.online:
+            return self._feed_kernels([seq], [frames])[0]
+        return self.run(seq, frames)
+
+    def _stream_kernel(
+        self, frames: int, state: Optional[Dict[str, Any]] = None
+    ) -> Generator[Optional[Dict[str, Any]], Optional[TraceBuffer], RunResult]:
+        """
+        Kernel incremental de contagem (gerador) das políticas online.
+
+        Protocolo: após o primeiro next(), cada send(bloco) processa um
+        TraceBuffer e send(None) encerra, devolvendo o RunResult em
+        StopIteration.value. O estado fica nas variáveis locais do gerador,
+        então a memória não depende do tamanho do traço.
+
+        send(SNAPSHOT) devolve um dict com todo o estado do kernel naquele
+        ponto (só tipos serializáveis por pickle); um kernel criado com
+        state=esse dict continua exatamente de onde o outro estava.
+        """
+        raise NotImplementedError(f"{self.name} não suporta execução em streaming.")
+
+    def open(self, frames: int) -> OnlineSimulator:
+        """
+        Simulador incremental da política com 'frames' quadros: access() a
+        cada referência e stats() com os contadores correntes (ver
+        src.algorithms.online). Só as políticas online o implementam.
+        """
+        raise NotImplementedError(f"{self.name} não suporta simulação incremental.")
+
+    def _feed_kernels(
+        self,
+        chunks: Iterable[TraceBuffer],
+        frames_list: List[int],
+        *,
+        states: Optional[List[Dict[str, Any]]] = None,
+        position: int = 0,
+        checkpoint: Optional[str] = None,
+        checkpoint_every: int = DEFAULT_EVERY,
+    ) -> List[RunResult]:
+        """
+        Alimenta um kernel por frames com os mesmos blocos, numa passada.
+
+        states retoma kernels salvos após 'position' acessos. Com checkpoint,
+        o estado de todos os kernels é gravado nesse arquivo a cada
+        checkpoint_every acessos (na fronteira de bloco seguinte) e no fim.
+        """
+        if states is None:
+            kernels = [self._stream_kernel(frames) for frames in frames_list]
+        else:
+            kernels = [self._stream_kernel(f, st) for f, st in zip(frames_list, states)]
+        for kernel in kernels:
+            next(kernel)
+
+        def save() -> None:
+            snapshot = [kernel.send(SNAPSHOT) for kernel in kernels]
+            save_checkpoint(checkpoint, self, frames_list, position, snapshot)
+
+        next_mark = position + checkpoint_every
+        for chunk in chunks:
+            for kernel in kernels:
+                kernel.send(chunk)
+            position += len(chunk)
+            if checkpoint is not None and position >= next_mark:
+                save()
+                next_mark = position + checkpoint_every
+        if checkpoint is not None:
+            save()
+
+        results: List[RunResult] = []
+        for kernel in kernels:
+            try:
+                kernel.send(None)
+            except StopIteration as stop:
+                results.append(stop.value)
+            else:
+                raise RuntimeError("O kernel não terminou ao fim do traço.")
+        return results
+
+    def _run_sweep(self, seq: TraceBuffer, frames_list: List[int]) -> List[RunResult]:
+        """
+        Resultados de contagem para todos os frames de uma vez (trace desligado).
+
+        O padrão chama _run_fast() para cada valor; algoritmos de pilha (com a
+        propriedade de inclusão) sobrescrevem com uma única passada no traço.
+        """
+        return [self._run_fast(seq, frames) for frames in frames_list]
+
+    @classmethod
+    def _one_pass_sweep(cls) -> bool:
+        """True se _run_sweep cobre todos os frames numa única passada."""
+        return cls._run_sweep is not PageReplacementAlgorithm._run_sweep
+
+    @classmethod
+    def _sweep_runs(cls, distinct: Callable[[], int]) -> float:
+        """
+        Custo estimado de _run_sweep num traço com distinct() páginas
+        distintas, em execuções de _run_fast equivalentes. Sem varredura
+        própria, é infinito. distinct() pode custar uma passada pelo traço:
+        só o chama quem depende dele.
+        """
+        return math.inf
+
+    @classmethod
+    def _use_sweep(cls, runs: int, distinct: Callable[[], int]) -> bool:
+        """True se uma varredura sai mais barata que 'runs' execuções de _run_fast."""
+        return runs > 1 and cls._one_pass_sweep() and cls._sweep_runs(distinct) < runs
+
+    def _results_from_distances(
+        self,
+        trace_len: int,
+        hist: List[int],
+        distinct: int,
+        frames_list: Iterable[int],
+    ) -> List[RunResult]:
+        """
+        Converte um histograma de distâncias de pilha em RunResults.
+
+        hist[d] = nº de acessos com distância d (1-based); acessos frios não
+        entram. Com F frames, há acerto se d <= F; as remoções são as faltas
+        menos os carregamentos em frames livres (min(F, páginas distintas)).
+        """
+        hits_upto = [0] * len(hist)
+        acc = 0
+        for d in range(1, len(hist)):
+            acc += hist[d]
+            hits_upto[d] = acc
+
+        results: List[RunResult] = []
+        for frames in frames_list:
+            if frames <= 0:
+                raise ValueError("frames deve ser > 0")
+            hits = hits_upto[min(frames, len(hist) - 1)] if len(hist) > 1 else 0
+            faults = trace_len - hits
+            results.append(
+                RunResult(
+                    algo_name=self.name,
+                    frames=frames,
+                    trace_len=trace_len,
+                    faults=faults,
+                    hits=hits,
+                    evictions=faults - min(frames, distinct),
+                )
+            )
+        return results
+
     def benchmark(
         self,
         trace: Iterable[Access],
         frames_list: Iterable[int],
         *,
         trace_enabled: bool = True,
+        jobs: Optional[int] = 1,
+        cache: Optional[ResultCache] = None,
     ) -> BenchmarkResult:
         """
         Executa o algoritmo para cada valor em frames_list.
 
         Se trace_enabled=True, cada execução (run) registra um RunTrace
-        acessível depois em self.last_traces.
+        acessível depois em self.last_traces. Caso contrário, usa
+        _run_sweep(), que só conta faltas/acertos/remoções.
+
+        jobs > 1 distribui as execuções (uma por frames) entre processos
+        (None = todos os núcleos); os resultados e os RunTrace voltam na
+        ordem de frames_list. Com o trace desligado, algoritmos com varredura
+        de uma passada (_run_sweep próprio, ex.: LRU e Ótimo) a usam, no
+        processo atual, só quando ela custa menos que as execuções que cada
+        processo faria (ver _sweep_runs); senão, rodam um _run_fast por frames.
+
+        Com cache (src.result_cache.ResultCache) e trace desligado, os frames
+        já simulados para este traço e esta configuração vêm do disco e só
+        os demais são executados (e guardados).
         """
         print(f"--- Benchmark {self.name} ---")
         seq = self._normalize_trace(trace)
+        frames_list = list(frames_list)
 
         self._trace_enabled = bool(trace_enabled)
         self._last_trace_by_frames.clear()
 
-        results: List[RunResult] = []
-        for frames in frames_list:
-            r = self.run(seq, frames)
-            results.append(r)
+        use_cache = cache is not None and not self._trace_enabled
+        found: Dict[int, RunResult] = {}
+        if use_cache:
+            found, keys = cache.lookup(trace_digest(seq), self, frames_list)
+        todo = [frames for frames in dict.fromkeys(frames_list) if frames not in found]
+
+        jobs = resolve_jobs(jobs)
+        runs_per_job = math.ceil(len(todo) / max(1, min(jobs, len(todo))))
+        use_sweep = not self._trace_enabled and self._use_sweep(
+            runs_per_job, lambda: len(set(seq.pages))
+        )
+        if not todo:
+            results: List[RunResult] = []
+        elif use_sweep:
+            results = self._run_sweep(seq, todo)
+        elif jobs > 1 and len(todo) > 1:
+            results, traces = run_frames_parallel(
+                self, seq, todo, trace_enabled=self._trace_enabled, jobs=jobs
+            )
+            self._last_trace_by_frames.update(traces)
+        elif self._trace_enabled:
+            results = [self.run(seq, frames) for frames in todo]
+        else:
+            results = [self._run_fast(seq, frames) for frames in todo]
+
+        if use_cache:
+            cache.store(keys, results)
+        found.update((r.frames, r) for r in results)
+        results = [found[frames] for frames in frames_list]
+        return self._finish_benchmark(results)
+
+    def stream(
+        self,
+        source: Union[TraceBuffer, Iterable[Access], Iterable[TraceBuffer]],
+        frames_list: Iterable[int],
+        *,
+        chunk_size: int = 65536,
+        checkpoint: Optional[str] = None,
+        checkpoint_every: int = DEFAULT_EVERY,
+    ) -> BenchmarkResult:
+        """
+        Executa a política em streaming, sem materializar o traço.
+
+        source pode ser um gerador de Access, um iterável de blocos
+        TraceBuffer ou um TraceBuffer (ex.: src.trace_file.read_trace), lido
+        em blocos de chunk_size. Todos os frames de frames_list são simulados
+        na mesma passada, com memória O(soma dos frames + um bloco). Só
+        conta faltas/acertos/remoções (sem RunTrace); políticas offline como
+        o Ótimo, que precisam do futuro, não suportam este modo.
+
+        Com checkpoint (caminho de arquivo), o estado de todos os kernels é
+        salvo a cada checkpoint_every acessos e ao final; resume() continua
+        dali.
+        """
+        if not self.online:
+            raise NotImplementedError(f"{self.name} não suporta execução em streaming.")
+
+        print(f"--- Stream {self.name} ---")
+        self._trace_enabled = False
+        self._last_trace_by_frames.clear()
+
+        results = self._feed_kernels(
+            iter_chunks(source, chunk_size),
+            list(frames_list),
+            checkpoint=checkpoint,
+            checkpoint_every=checkpoint_every,
+        )
+        return self._finish_benchmark(results)
+
+    def resume(
+        self,
+        source: Union[TraceBuffer, Iterable[Access], Iterable[TraceBuffer]],
+        checkpoint: str,
+        *,
+        chunk_size: int = 65536,
+        checkpoint_every: int = DEFAULT_EVERY,
+        skip_prefix: bool = True,
+    ) -> BenchmarkResult:
+        """
+        Continua um stream() a partir do checkpoint salvo, com os mesmos
+        frames_list, e segue gravando checkpoints no mesmo arquivo.
+
+        Com skip_prefix=True, source é o traço inteiro (o mesmo de antes,
+        possivelmente com acessos novos no fim): os acessos já simulados são
+        pulados sem simulação. Com skip_prefix=False, source contém só os
+        acessos posteriores ao checkpoint. O resultado é o mesmo de um
+        stream() sobre o traço completo.
+        """
+        if not self.online:
+            raise NotImplementedError(f"{self.name} não suporta execução em streaming.")
+
+        saved = load_checkpoint(checkpoint, self)
+        position = saved["position"]
+
+        print(f"--- Stream {self.name} (retomado em {position}) ---")
+        self._trace_enabled = False
+        self._last_trace_by_frames.clear()
+
+        chunks = iter_chunks(source, chunk_size)
+        if skip_prefix:
+            chunks = _skip_accesses(chunks, position)
+        results = self._feed_kernels(
+            chunks,
+            saved["frames_list"],
+            states=saved["states"],
+            position=position,
+            checkpoint=checkpoint,
+            checkpoint_every=checkpoint_every,
+        )
+        return self._finish_benchmark(results)
 
+    def _finish_benchmark(self, results: List[RunResult]) -> BenchmarkResult:
         br = BenchmarkResult(algo_name=self.name, results=results)
         self._last_benchmark = br
 
@@ -1,13 +1,20 @@
-from typing import Dict, Iterable, List, Optional, Set
+from typing import Generator, Iterable, List, Optional
 
-from src.algorithms.baseAlgorithm import PageReplacementAlgorithm
-from src.core import Access, PTE, RunResult
+from src.algorithms.baseAlgorithm import SNAPSHOT, PageReplacementAlgorithm
+from src.algorithms.clock_buffer import ClockBuffer
+from src.algorithms.online import HIT, MISS, AccessOutcome, OnlineSimulator
+from src.core import Access, RunResult, TraceBuffer
 
 class Clock(PageReplacementAlgorithm):
+    online = True
+
     def __init__(self):
         super().__init__("Clock")
 
     def run(self, trace: Iterable[Access], frames: int) -> RunResult:
+        """
+        Clock com rastreamento opcional, sobre ClockBuffer (slot == frame).
+        """
         if frames <= 0:
             raise ValueError("frames deve ser > 0")
 
@@ -16,36 +23,17 @@ class Clock(PageReplacementAlgorithm):
 
         self._trace_begin(frames)
 
-        all_pages = {acc.page_id for acc in seq}
-        page_table: Dict[int, PTE] = {
-            pid: PTE(
-                page_id=pid,
-                frame=None,
-                R=0,
-                M=0,
-                loaded_at=None,
-                last_used=None,
-            )
-            for pid in all_pages
-        }
-
-        frames_list: List[PTE] = []
-        pointer: int = 0
+        clock = ClockBuffer(frames)
 
         faults = hits = evictions = 0
-        time = 0
         fallback_t = 0
 
         def build_frames_state() -> List[dict]:
-            frames_pte: List[Optional[PTE]] = [None] * frames
-            for pte in page_table.values():
-                if pte.frame is not None and 0 <= pte.frame < frames:
-                    frames_pte[pte.frame] = pte
-
-            hand_pos = pointer % len(frames_list) if frames_list else None
+            hand_pos = clock.hand % clock.size if clock.size else None
             state: List[dict] = []
-            for idx, slot in enumerate(frames_pte):
-                if slot is None:
+            for idx in range(frames):
+                pid = clock.pages[idx]
+                if pid is None:
                     meta = {"hand": hand_pos}
                     state.append(
                         {
@@ -59,14 +47,14 @@ class Clock(PageReplacementAlgorithm):
                 else:
                     meta = {
                         "hand": hand_pos,
-                        "hand_here": int(hand_pos == slot.frame) if hand_pos is not None else 0,
+                        "hand_here": int(hand_pos == idx) if hand_pos is not None else 0,
                     }
                     state.append(
                         {
                             "frame_index": idx,
-                            "page_id": slot.page_id,
-                            "R": slot.R,
-                            "M": slot.M,
+                            "page_id": pid,
+                            "R": clock.ref[idx],
+                            "M": clock.mod[idx],
                             "meta": meta,
                         }
                     )
@@ -80,68 +68,39 @@ class Clock(PageReplacementAlgorithm):
                 current_t = fallback_t
                 fallback_t += 1
 
-            pte: PTE = page_table[acc.page_id]
+            slot = clock.slot_of.get(acc.page_id)
             evicted_pid: Optional[int] = None
 
-            if pte.frame is not None:
+            if slot is not None:
                 hit = True
                 hits += 1
-                pte.R = 1
-                if acc.write:
-                    pte.M = 1
-                pte.last_used = time
+                clock.touch(slot, acc.write)
             else:
                 hit = False
                 faults += 1
 
-                if len(frames_list) < frames:
-                    pte.frame = len(frames_list)
-                    pte.R = 1
-                    pte.M = int(acc.write)
-                    pte.loaded_at = time
-                    pte.last_used = time
-
-                    frames_list.append(pte)
+                if not clock.full:
+                    clock.load(acc.page_id, acc.write)
                 else:
-                    while True:
-                        current = frames_list[pointer]
-
-                        if current.R == 0:
-                            evictions += 1
-                            evicted_pid = current.page_id
-
-                            current.frame = None
-                            current.R = 0
-                            current.M = 0
-
-                            pte.frame = pointer
-                            pte.R = 1
-                            pte.M = int(acc.write)
-                            pte.loaded_at = time
-                            pte.last_used = time
-
-                            frames_list[pointer] = pte
-                            pointer = (pointer + 1) % frames
-                            break
-                        else:
-                            current.R = 0
-                            pointer = (pointer + 1) % frames
-                        time += 1
-                    time += 1
-
-            self.trace_step(
-                t=current_t,
-                access_page=acc.page_id,
-                access_write=acc.write,
-                hit=hit,
-                evicted_page=evicted_pid,
-                frames_state=build_frames_state(),
-                decision_meta={
-                    "policy": "clock",
-                    "pointer": pointer % len(frames_list) if frames_list else None,
-                    "frames_loaded": len(frames_list),
-                },
-            )
+                    slot = clock.sweep()
+                    evicted_pid = clock.replace(slot, acc.page_id, acc.write)
+                    clock.hand = (slot + 1) % frames
+                    evictions += 1
+
+            if self._trace_enabled:
+                self.trace_step(
+                    t=current_t,
+                    access_page=acc.page_id,
+                    access_write=acc.write,
+                    hit=hit,
+                    evicted_page=evicted_pid,
+                    frames_state=build_frames_state(),
+                    decision_meta={
+                        "policy": "clock",
+                        "pointer": clock.hand % clock.size if clock.size else None,
+                        "frames_loaded": clock.size,
+                    },
+                )
 
         self._trace_end(frames)
 
@@ -153,3 +112,94 @@ class Clock(PageReplacementAlgorithm):
             hits=hits,
             evictions=evictions,
         )
+
+    def _stream_kernel(
+        self, frames: int, state: Optional[dict] = None
+    ) -> Generator[Optional[dict], Optional[TraceBuffer], RunResult]:
+        """Kernel incremental de contagem sobre o mesmo ClockBuffer de run()."""
+        clock = ClockBuffer(frames) if state is None else ClockBuffer.from_state(state["clock"])
+        slot_of = clock.slot_of
+        pages = clock.pages
+        ref = clock.ref
+        mod = clock.mod
+        sweep = clock.sweep
+        trace_len = 0
+        faults = hits = evictions = 0
+        if state is not None:
+            trace_len, faults, hits, evictions = state["counters"]
+
+        chunk = yield
+        while chunk is not None:
+            if chunk is SNAPSHOT:
+                chunk = yield {
+                    "clock": clock.state(),
+                    "counters": (trace_len, faults, hits, evictions),
+                }
+                continue
+            trace_len += len(chunk)
+            for pid, write in zip(chunk.pages, chunk.writes):
+                slot = slot_of.get(pid)
+                if slot is not None:
+                    hits += 1
+                    ref[slot] = 1
+                    continue
+
+                faults += 1
+                if clock.size < frames:
+                    clock.load(pid, write)
+                    continue
+
+                slot = sweep()
+                del slot_of[pages[slot]]
+                pages[slot] = pid
+                slot_of[pid] = slot
+                ref[slot] = 1
+                mod[slot] = write
+                clock.hand = (slot + 1) % frames
+                evictions += 1
+            chunk = yield
+
+        return RunResult(
+            algo_name=self.name,
+            frames=frames,
+            trace_len=trace_len,
+            faults=faults,
+            hits=hits,
+            evictions=evictions,
+        )
+
+    def open(self, frames: int) -> "ClockSimulator":
+        return ClockSimulator(self.name, frames)
+
+
+class ClockSimulator(OnlineSimulator):
+    """
+    Relógio incremental sobre ClockBuffer (Clock e SecondChance, que tomam
+    as mesmas decisões). A varredura é a mesma de run(): O(1) amortizado.
+    """
+
+    __slots__ = ("clock",)
+
+    def __init__(self, name: str, frames: int) -> None:
+        super().__init__(name, frames)
+        self.clock = ClockBuffer(frames)
+
+    def access(self, page_id: int, write: bool = False, t: Optional[int] = None) -> AccessOutcome:
+        clock = self.clock
+        self.trace_len += 1
+        slot = clock.slot_of.get(page_id)
+        if slot is not None:
+            self.hits += 1
+            clock.ref[slot] = 1
+            return HIT
+
+        self.faults += 1
+        if clock.size < self.frames:
+            clock.load(page_id, write)
+            return MISS
+
+        slot = clock.sweep()
+        victim = clock.replace(slot, page_id, write)
+        clock.hand = (slot + 1) % self.frames
+        self.evictions += 1
+        return False, victim
@@ -0,0 +1,200 @@
+from array import array
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+class ClockBuffer:
+    """
+    Relógio circular compartilhado por Clock, SecondChance e WSClock.
+
+    Cada slot do relógio é também o frame físico. Os bits R/M ficam em
+    bytearrays e last_used em um array('q'), todos com capacidade fixa; as
+    views NumPy sobre a mesma memória permitem varreduras vetorizadas sem
+    cópia, enquanto acertos continuam sendo uma escrita escalar.
+
+    O ponteiro ('hand') é um índice inteiro em [0, size).
+    """
+
+    SCALAR_STEPS = 16
+
+    __slots__ = (
+        "capacity",
+        "size",
+        "hand",
+        "pages",
+        "slot_of",
+        "ref",
+        "mod",
+        "last_used",
+        "_zeros",
+        "_ref_np",
+        "_mod_np",
+        "_used_np",
+    )
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("frames deve ser > 0")
+        self.capacity = capacity
+        self.size = 0
+        self.hand = 0
+        self.pages: List[Optional[int]] = [None] * capacity
+        self.slot_of: Dict[int, int] = {}
+        self.ref = bytearray(capacity)
+        self.mod = bytearray(capacity)
+        self.last_used = array("q", bytes(8 * capacity))
+        self._zeros = memoryview(bytes(capacity))
+        self._ref_np = np.frombuffer(self.ref, dtype=np.uint8)
+        self._mod_np = np.frombuffer(self.mod, dtype=np.uint8)
+        self._used_np = np.frombuffer(self.last_used, dtype=np.int64)
+
+    def state(self) -> Dict[str, Any]:
+        """Cópia do estado em tipos simples (para checkpoints)."""
+        return {
+            "capacity": self.capacity,
+            "size": self.size,
+            "hand": self.hand,
+            "pages": array("q", self.pages[: self.size]),
+            "ref": bytes(self.ref),
+            "mod": bytes(self.mod),
+            "last_used": self.last_used.tobytes(),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "ClockBuffer":
+        """Reconstrói um ClockBuffer a partir de state()."""
+        clock = cls(state["capacity"])
+        clock.size = state["size"]
+        clock.hand = state["hand"]
+        for slot, pid in enumerate(state["pages"]):
+            clock.pages[slot] = pid
+            clock.slot_of[pid] = slot
+        # Cópia para dentro dos buffers existentes: as views NumPy continuam válidas.
+        clock.ref[:] = state["ref"]
+        clock.mod[:] = state["mod"]
+        memoryview(clock.last_used).cast("B")[:] = state["last_used"]
+        return clock
+
+    @property
+    def full(self) -> bool:
+        return self.size == self.capacity
+
+    def load(self, pid: int, write: bool, t: int = 0) -> int:
+        """Ocupa o próximo slot livre com R=1 e devolve o slot."""
+        slot = self.size
+        self.size += 1
+        self._fill(slot, pid, write, t)
+        return slot
+
+    def replace(self, slot: int, pid: int, write: bool, t: int = 0) -> int:
+        """Substitui a página do slot (R=1) e devolve a página expulsa."""
+        old = self.pages[slot]
+        del self.slot_of[old]
+        self._fill(slot, pid, write, t)
+        return old
+
+    def _fill(self, slot: int, pid: int, write: bool, t: int) -> None:
+        self.pages[slot] = pid
+        self.slot_of[pid] = slot
+        self.ref[slot] = 1
+        self.mod[slot] = 1 if write else 0
+        self.last_used[slot] = t
+
+    def touch(self, slot: int, write: bool, t: int = 0) -> None:
+        """Acerto: liga R (e M, se escrita) e atualiza last_used."""
+        self.ref[slot] = 1
+        if write:
+            self.mod[slot] = 1
+        self.last_used[slot] = t
+
+    def sweep(self) -> int:
+        """
+        Segunda chance: a partir do ponteiro, zera R das páginas com R=1 e
+        para na primeira com R=0, devolvendo seu slot. Se todas têm R=1, dá
+        uma volta completa e para no slot inicial. O ponteiro não é movido.
+        """
+        ref = self.ref
+        hand = self.hand
+        if not ref[hand]:
+            return hand
+
+        n = self.size
+        zeros = self._zeros
+        slot = ref.find(0, hand, n)
+        if slot >= 0:
+            ref[hand:slot] = zeros[: slot - hand]
+            return slot
+
+        ref[hand:n] = zeros[: n - hand]
+        slot = ref.find(0, 0, hand)
+        if slot >= 0:
+            ref[0:slot] = zeros[:slot]
+            return slot
+
+        ref[0:hand] = zeros[:hand]
+        return hand
+
+    def wsclock_victim(self, t: int, window: int) -> int:
+        """
+        Varredura do WSClock. O ponteiro não é movido.
+
+        Na primeira volta a partir do ponteiro, a vítima é a primeira página
+        com R=0, idade > window e M=0. As páginas anteriores a ela têm R
+        zerado, e as que tinham R=0, idade > window e M=1 têm M zerado (escrita
+        agendada). Sem candidata, a volta inteira recebe esses efeitos e o
+        slot inicial (já com R=0) é escolhido na segunda passagem.
+
+        Os primeiros SCALAR_STEPS slots são examinados um a um (a maioria das
+        varreduras termina cedo); o restante da volta é vetorizado.
+        """
+        n = self.size
+        start = self.hand % n
+        limit = t - window
+        ref = self.ref
+        mod = self.mod
+        used = self.last_used
+
+        i = start
+        steps = min(n, self.SCALAR_STEPS)
+        for _ in range(steps):
+            if ref[i]:
+                ref[i] = 0
+            elif used[i] < limit:
+                if not mod[i]:
+                    return i
+                mod[i] = 0
+            i += 1
+            if i == n:
+                i = 0
+
+        if steps == n:
+            return start
+
+        if i < start:
+            victim = self._scan_segment(i, start, limit)
+        else:
+            victim = self._scan_segment(i, n, limit)
+            if victim < 0:
+                victim = self._scan_segment(0, start, limit)
+        return start if victim < 0 else victim
+
+    def _scan_segment(self, lo: int, hi: int, limit: int) -> int:
+        """
+        Primeira volta do WSClock sobre [lo, hi), vetorizada: devolve o slot
+        da vítima (ou -1) e aplica os efeitos nos slots percorridos.
+        """
+        if lo >= hi:
+            return -1
+        ref = self._ref_np[lo:hi]
+        mod = self._mod_np[lo:hi]
+        old = self._used_np[lo:hi] < limit
+        clean = (ref == 0) & old & (mod == 0)
+
+        j = int(clean.argmax())
+        found = bool(clean[j])
+        if not found:
+            j = hi - lo
+        mod[:j][(ref[:j] == 0) & old[:j]] = 0
+        ref[:j] = 0
+        return lo + j if found else -1
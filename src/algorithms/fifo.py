@@ -1,10 +1,14 @@
+from array import array
 from collections import deque
-from typing import Dict, Iterable, List, Optional
-from src.algorithms.baseAlgorithm import PageReplacementAlgorithm
-from src.core import Access, RunResult, PTE
+from typing import Generator, Iterable, List, Optional
+from src.algorithms.baseAlgorithm import SNAPSHOT, PageReplacementAlgorithm
+from src.algorithms.online import HIT, MISS, AccessOutcome, OnlineSimulator
+from src.core import Access, PageTable, RunResult, TraceBuffer
 
 
 class Fifo(PageReplacementAlgorithm):
+    online = True
+
     def __init__(self) -> None:
         super().__init__("FIFO")
 
@@ -13,17 +17,17 @@ class Fifo(PageReplacementAlgorithm):
         Implementação do FIFO com rastreamento opcional.
 
         Estruturas:
-          - page_table: mapeia pid -> PTE
+          - page_table: PageTable (struct-of-arrays, sem objeto por página)
           - free_frames: fila de frames livres
           - fifo_queue: fila FIFO de pids (ordem de chegada)
         """
-        seq: List[Access] = list(trace)
+        seq = self._normalize_trace(trace)
         if frames <= 0:
             raise ValueError("frames deve ser > 0")
 
         self._trace_begin(frames)
 
-        page_table: Dict[int, PTE] = {}
+        page_table = PageTable(frames)
         free_frames = deque(range(frames))
         fifo_queue = deque()
 
@@ -35,15 +39,10 @@ class Fifo(PageReplacementAlgorithm):
             """
             Constrói o estado atual dos frames para fins de log.
             """
-            frames_pte: List[Optional[PTE]] = [None] * frames
-            for pte in page_table.values():
-                if 0 <= pte.frame < frames:
-                    frames_pte[pte.frame] = pte
-
             state: List[dict] = []
             for i in range(frames):
-                pte = frames_pte[i]
-                if pte is None:
+                idx = page_table.frame_page[i]
+                if idx < 0:
                     state.append(
                         {
                             "frame_index": i,
@@ -57,12 +56,12 @@ class Fifo(PageReplacementAlgorithm):
                     state.append(
                         {
                             "frame_index": i,
-                            "page_id": pte.page_id,
-                            "R": pte.R,
-                            "M": pte.M,
+                            "page_id": page_table.page_id(idx),
+                            "R": page_table.R[idx],
+                            "M": page_table.M[idx],
                             "meta": {
-                                "loaded_at": pte.loaded_at,
-                                "last_used": pte.last_used,
+                                "loaded_at": page_table.loaded_at[idx],
+                                "last_used": page_table.last_used[idx],
                             },
                         }
                     )
@@ -77,11 +76,7 @@ class Fifo(PageReplacementAlgorithm):
             if pid in page_table:
                 hit = True
                 hits += 1
-                pte = page_table[pid]
-                pte.R = 1
-                pte.last_used = current_t
-                if a.write:
-                    pte.M = 1
+                page_table.touch(pid, a.write, current_t)
             else:
                 hit = False
                 faults += 1
@@ -90,20 +85,11 @@ class Fifo(PageReplacementAlgorithm):
                     f = free_frames.popleft()
                 else:
                     victim_pid = fifo_queue.popleft()
-                    victim = page_table.pop(victim_pid)
+                    f = page_table.evict(victim_pid)
                     evictions += 1
                     evicted_pid = victim_pid
-                    f = victim.frame
-
-                pte = PTE(
-                    page_id=pid,
-                    frame=f,
-                    R=1,
-                    M=1 if a.write else 0,
-                    loaded_at=current_t,
-                    last_used=current_t,
-                )
-                page_table[pid] = pte
+
+                page_table.load(pid, f, a.write, current_t)
                 fifo_queue.append(pid)
 
             self.trace_step(
@@ -128,4 +114,80 @@ class Fifo(PageReplacementAlgorithm):
             faults=faults,
             hits=hits,
             evictions=evictions,
-        )
\ No newline at end of file
+        )
+
+    def _stream_kernel(
+        self, frames: int, state: Optional[dict] = None
+    ) -> Generator[Optional[dict], Optional[TraceBuffer], RunResult]:
+        """Kernel incremental de contagem: conjunto residente + fila de chegada."""
+        if frames <= 0:
+            raise ValueError("frames deve ser > 0")
+
+        resident = set()
+        fifo_queue = deque()
+        trace_len = faults = hits = evictions = 0
+        if state is not None:
+            fifo_queue.extend(state["queue"])
+            resident.update(fifo_queue)
+            trace_len, faults, hits, evictions = state["counters"]
+
+        chunk = yield
+        while chunk is not None:
+            if chunk is SNAPSHOT:
+                chunk = yield {
+                    "queue": array("q", fifo_queue),
+                    "counters": (trace_len, faults, hits, evictions),
+                }
+                continue
+            trace_len += len(chunk)
+            for pid in chunk.pages:
+                if pid in resident:
+                    hits += 1
+                    continue
+
+                faults += 1
+                if len(fifo_queue) >= frames:
+                    resident.discard(fifo_queue.popleft())
+                    evictions += 1
+                resident.add(pid)
+                fifo_queue.append(pid)
+            chunk = yield
+
+        return RunResult(
+            algo_name=self.name,
+            frames=frames,
+            trace_len=trace_len,
+            faults=faults,
+            hits=hits,
+            evictions=evictions,
+        )
+
+    def open(self, frames: int) -> "FifoSimulator":
+        return FifoSimulator(self.name, frames)
+
+
+class FifoSimulator(OnlineSimulator):
+    """FIFO incremental: conjunto residente + fila de chegada, como o kernel."""
+
+    __slots__ = ("_resident", "_queue")
+
+    def __init__(self, name: str, frames: int) -> None:
+        super().__init__(name, frames)
+        self._resident = set()
+        self._queue = deque()
+
+    def access(self, page_id: int, write: bool = False, t: Optional[int] = None) -> AccessOutcome:
+        self.trace_len += 1
+        if page_id in self._resident:
+            self.hits += 1
+            return HIT
+
+        self.faults += 1
+        self._resident.add(page_id)
+        self._queue.append(page_id)
+        if len(self._queue) > self.frames:
+            victim = self._queue.popleft()
+            self._resident.discard(victim)
+            self.evictions += 1
+            return False, victim
+        return MISS
@@ -1,12 +1,141 @@
 from __future__ import annotations
 
-from typing import Dict, Iterable, List, Optional
+import heapq
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple
 
-from src.algorithms.baseAlgorithm import PageReplacementAlgorithm
-from src.core import Access, PTE, RunResult
+from src.algorithms.baseAlgorithm import SNAPSHOT, PageReplacementAlgorithm
+from src.algorithms.online import HIT, MISS, AccessOutcome, OnlineSimulator
+from src.core import Access, PageTable, RunResult, TraceBuffer
+
+
+class NRUClasses:
+    """
+    As quatro classes do NRU ((R << 1) | M) mantidas incrementalmente.
+
+    Cada classe é um heap de (ordem_de_carga, pid) com invalidação preguiçosa,
+    de modo que a vítima é sempre a página carregada há mais tempo dentro da
+    menor classe não vazia (o mesmo desempate da varredura por ordem de carga).
+
+      - load/touch: O(log F)
+      - reset: move as classes 2 e 3 para 0 e 1 (custo proporcional às
+        páginas referenciadas desde o último reset)
+      - pop_victim: O(log F) amortizado
+    """
+
+    __slots__ = ("cls", "load_seq", "heaps", "counts", "_next_seq")
+
+    def __init__(self) -> None:
+        self.cls: Dict[int, int] = {}
+        self.load_seq: Dict[int, int] = {}
+        self.heaps: List[List[Tuple[int, int]]] = [[], [], [], []]
+        self.counts = [0, 0, 0, 0]
+        self._next_seq = 0
+
+    def state(self) -> Dict[str, Any]:
+        """Classe e ordem de carga das residentes (os heaps são reconstruídos)."""
+        return {"cls": dict(self.cls), "load_seq": dict(self.load_seq), "next_seq": self._next_seq}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "NRUClasses":
+        classes = cls()
+        classes.cls.update(state["cls"])
+        classes.load_seq.update(state["load_seq"])
+        classes._next_seq = state["next_seq"]
+        for pid, c in classes.cls.items():
+            classes.heaps[c].append((classes.load_seq[pid], pid))
+            classes.counts[c] += 1
+        for heap in classes.heaps:
+            heapq.heapify(heap)
+        return classes
+
+    def __len__(self) -> int:
+        return len(self.cls)
+
+    def __contains__(self, pid: int) -> bool:
+        return pid in self.cls
+
+    def class_of(self, pid: int) -> Optional[int]:
+        return self.cls.get(pid)
+
+    def _push(self, c: int, seq: int, pid: int) -> None:
+        heap = self.heaps[c]
+        heapq.heappush(heap, (seq, pid))
+        if len(heap) > 2 * self.counts[c] + 32:
+            self._compact(c)
+
+    def _compact(self, c: int) -> None:
+        """Descarta entradas obsoletas ou duplicadas do heap da classe c."""
+        cls = self.cls
+        load_seq = self.load_seq
+        seen = set()
+        live: List[Tuple[int, int]] = []
+        for seq, pid in self.heaps[c]:
+            if cls.get(pid) == c and load_seq[pid] == seq and pid not in seen:
+                seen.add(pid)
+                live.append((seq, pid))
+        heapq.heapify(live)
+        self.heaps[c] = live
+
+    def load(self, pid: int, write: bool) -> None:
+        """Carrega uma página nova (R=1)."""
+        seq = self._next_seq
+        self._next_seq += 1
+        c = 3 if write else 2
+        self.cls[pid] = c
+        self.load_seq[pid] = seq
+        self.counts[c] += 1
+        self._push(c, seq, pid)
+
+    def touch(self, pid: int, write: bool) -> None:
+        """Acerto: liga R (e M, se escrita), movendo a página de classe se preciso."""
+        old = self.cls[pid]
+        new = old | 2 | (1 if write else 0)
+        if new != old:
+            self.cls[pid] = new
+            self.counts[old] -= 1
+            self.counts[new] += 1
+            self._push(new, self.load_seq[pid], pid)
+
+    def reset(self) -> None:
+        """Zera R de todas as residentes: funde 2 -> 0 e 3 -> 1."""
+        cls = self.cls
+        load_seq = self.load_seq
+        for c in (2, 3):
+            target = c & 1
+            heap = self.heaps[target]
+            for seq, pid in self.heaps[c]:
+                if cls.get(pid) == c and load_seq[pid] == seq:
+                    cls[pid] = target
+                    heap.append((seq, pid))
+            heapq.heapify(heap)
+            self.counts[target] += self.counts[c]
+            self.counts[c] = 0
+            self.heaps[c] = []
+            if len(heap) > 2 * self.counts[target] + 32:
+                self._compact(target)
+
+    def pop_victim(self) -> int:
+        """Remove e devolve a vítima: menor classe, depois menor ordem de carga."""
+        cls = self.cls
+        load_seq = self.load_seq
+        for c in range(4):
+            if not self.counts[c]:
+                continue
+            heap = self.heaps[c]
+            while True:
+                seq, pid = heapq.heappop(heap)
+                if cls.get(pid) == c and load_seq[pid] == seq:
+                    del cls[pid]
+                    del load_seq[pid]
+                    self.counts[c] -= 1
+                    return pid
+
+        raise RuntimeError("Nenhuma página disponível para substituição.")
 
 
 class NRU(PageReplacementAlgorithm):
+    online = True
+
     def __init__(self, reset_interval: Optional[int] = None):
         super().__init__("NRU")
         self.reset_interval = reset_interval
@@ -16,6 +145,13 @@ class NRU(PageReplacementAlgorithm):
         return accesses_since_reset >= interval
 
     def run(self, trace: Iterable[Access], frames: int) -> RunResult:
+        """
+        NRU com rastreamento opcional.
+
+        Estruturas:
+          - page_table: PageTable (frame e tempos)
+          - classes: NRUClasses, fonte dos bits R/M e da escolha da vítima
+        """
         if frames <= 0:
             raise ValueError("frames deve ser > 0")
 
@@ -24,22 +160,17 @@ class NRU(PageReplacementAlgorithm):
 
         self._trace_begin(frames)
 
-        page_table: Dict[int, PTE] = {}
-        loaded_order: List[int] = []
-        free_frames = list(range(frames))
+        page_table = PageTable(frames)
+        classes = NRUClasses()
 
         accesses_since_reset = 0
         time_fallback = 0
 
         def build_frames_state() -> List[dict]:
-            frames_pte: List[Optional[PTE]] = [None] * frames
-            for pid, pte in page_table.items():
-                if pte.frame is not None and 0 <= pte.frame < frames:
-                    frames_pte[pte.frame] = pte
-
             state: List[dict] = []
-            for idx, slot in enumerate(frames_pte):
-                if slot is None:
+            for idx in range(frames):
+                slot_pid = page_table.page_at(idx)
+                if slot_pid is None:
                     state.append(
                         {
                             "frame_index": idx,
@@ -50,13 +181,13 @@ class NRU(PageReplacementAlgorithm):
                         }
                     )
                 else:
-                    nru_class = (slot.R << 1) | slot.M
+                    nru_class = classes.class_of(slot_pid)
                     state.append(
                         {
                             "frame_index": idx,
-                            "page_id": slot.page_id,
-                            "R": slot.R,
-                            "M": slot.M,
+                            "page_id": slot_pid,
+                            "R": nru_class >> 1,
+                            "M": nru_class & 1,
                             "meta": {"class": nru_class},
                         }
                     )
@@ -69,8 +200,7 @@ class NRU(PageReplacementAlgorithm):
 
             reset_applied = False
             if self._should_reset(accesses_since_reset, frames):
-                for loaded_pid in loaded_order:
-                    page_table[loaded_pid].R = 0
+                classes.reset()
                 accesses_since_reset = 0
                 reset_applied = True
 
@@ -81,60 +211,38 @@ class NRU(PageReplacementAlgorithm):
             if pid in page_table:
                 hit = True
                 hits += 1
-                pte = page_table[pid]
-                pte.R = 1
-                if acc.write:
-                    pte.M = 1
-                pte.last_used = current_t
+                classes.touch(pid, acc.write)
+                page_table.touch(pid, acc.write, current_t)
             else:
                 hit = False
                 faults += 1
 
-                if free_frames:
-                    frame = free_frames.pop(0)
-                    pte = PTE(
-                        page_id=pid,
-                        frame=frame,
-                        R=1,
-                        M=int(acc.write),
-                        loaded_at=current_t,
-                        last_used=current_t,
-                    )
-                    page_table[pid] = pte
-                    loaded_order.append(pid)
+                if len(page_table) < frames:
+                    frame = len(page_table)
                 else:
-                    victim_pid = self._select_victim(page_table, loaded_order)
-                    victim_pte = page_table.pop(victim_pid)
-                    loaded_order.remove(victim_pid)
+                    victim_pid = classes.pop_victim()
+                    frame = page_table.evict(victim_pid)
 
                     evictions += 1
                     evicted_pid = victim_pid
-                    frame = victim_pte.frame
-
-                    pte = PTE(
-                        page_id=pid,
-                        frame=frame,
-                        R=1,
-                        M=int(acc.write),
-                        loaded_at=current_t,
-                        last_used=current_t,
-                    )
-                    page_table[pid] = pte
-                    loaded_order.append(pid)
-
-            self.trace_step(
-                t=current_t,
-                access_page=pid,
-                access_write=acc.write,
-                hit=hit,
-                evicted_page=evicted_pid,
-                frames_state=build_frames_state(),
-                decision_meta={
-                    "policy": "nru",
-                    "reset": reset_applied,
-                    "accesses_since_reset": accesses_since_reset,
-                },
-            )
+
+                page_table.load(pid, frame, acc.write, current_t)
+                classes.load(pid, acc.write)
+
+            if self._trace_enabled:
+                self.trace_step(
+                    t=current_t,
+                    access_page=pid,
+                    access_write=acc.write,
+                    hit=hit,
+                    evicted_page=evicted_pid,
+                    frames_state=build_frames_state(),
+                    decision_meta={
+                        "policy": "nru",
+                        "reset": reset_applied,
+                        "accesses_since_reset": accesses_since_reset,
+                    },
+                )
 
         self._trace_end(frames)
 
@@ -147,15 +255,98 @@ class NRU(PageReplacementAlgorithm):
             evictions=evictions,
         )
 
-    def _select_victim(self, page_table: Dict[int, PTE], loaded_order: List[int]) -> int:
-        classes: Dict[int, List[int]] = {0: [], 1: [], 2: [], 3: []}
-        for pid in loaded_order:
-            pte = page_table[pid]
-            cls = (pte.R << 1) | pte.M
-            classes[cls].append(pid)
+    def _stream_kernel(
+        self, frames: int, state: Optional[dict] = None
+    ) -> Generator[Optional[dict], Optional[TraceBuffer], RunResult]:
+        """Kernel incremental de contagem sobre NRUClasses (sem PTEs nem snapshots)."""
+        if frames <= 0:
+            raise ValueError("frames deve ser > 0")
 
-        for cls in range(4):
-            if classes[cls]:
-                return classes[cls][0]
+        interval = self.reset_interval or max(1, frames * 2)
+        classes = NRUClasses() if state is None else NRUClasses.from_state(state["classes"])
+        cls = classes.cls
+        touch = classes.touch
+        load = classes.load
+        accesses_since_reset = 0
+        trace_len = 0
+        faults = hits = evictions = 0
+        if state is not None:
+            accesses_since_reset = state["accesses_since_reset"]
+            trace_len, faults, hits, evictions = state["counters"]
 
-        raise RuntimeError("Nenhuma página disponível para substituição.")
+        chunk = yield
+        while chunk is not None:
+            if chunk is SNAPSHOT:
+                chunk = yield {
+                    "classes": classes.state(),
+                    "accesses_since_reset": accesses_since_reset,
+                    "counters": (trace_len, faults, hits, evictions),
+                }
+                continue
+            trace_len += len(chunk)
+            for pid, write in zip(chunk.pages, chunk.writes):
+                if accesses_since_reset >= interval:
+                    classes.reset()
+                    accesses_since_reset = 0
+                accesses_since_reset += 1
+
+                c = cls.get(pid)
+                if c is not None:
+                    hits += 1
+                    if c != 3 and (c < 2 or write):
+                        touch(pid, write)
+                    continue
+
+                faults += 1
+                if len(cls) >= frames:
+                    classes.pop_victim()
+                    evictions += 1
+                load(pid, write)
+            chunk = yield
+
+        return RunResult(
+            algo_name=self.name,
+            frames=frames,
+            trace_len=trace_len,
+            faults=faults,
+            hits=hits,
+            evictions=evictions,
+        )
+
+    def open(self, frames: int) -> "NRUSimulator":
+        return NRUSimulator(self.name, frames, self.reset_interval or max(1, frames * 2))
+
+
+class NRUSimulator(OnlineSimulator):
+    """NRU incremental sobre NRUClasses: O(log F) amortizado por acesso."""
+
+    __slots__ = ("classes", "interval", "_since_reset")
+
+    def __init__(self, name: str, frames: int, interval: int) -> None:
+        super().__init__(name, frames)
+        self.classes = NRUClasses()
+        self.interval = interval
+        self._since_reset = 0
+
+    def access(self, page_id: int, write: bool = False, t: Optional[int] = None) -> AccessOutcome:
+        classes = self.classes
+        self.trace_len += 1
+        if self._since_reset >= self.interval:
+            classes.reset()
+            self._since_reset = 0
+        self._since_reset += 1
+
+        c = classes.cls.get(page_id)
+        if c is not None:
+            self.hits += 1
+            if c != 3 and (c < 2 or write):
+                classes.touch(page_id, write)
+            return HIT
+
+        self.faults += 1
+        victim = None
+        if len(classes) >= self.frames:
+            victim = classes.pop_victim()
+            self.evictions += 1
+        classes.load(page_id, write)
+        return MISS if victim is None else (False, victim)
@@ -0,0 +1,69 @@
+"""
+Simulação incremental, um acesso por chamada.
+
+PageReplacementAlgorithm.open(frames) devolve um OnlineSimulator da política,
+para quem gera os acessos aos poucos (ex.: um emulador ou um cache real que
+consulta a política a cada referência) em vez de ter o traço inteiro:
+
+    sim = LRU().open(64)
+    hit, evicted = sim.access(page_id, write)
+    sim.stats()   # RunResult com os contadores até aqui
+
+Cada simulador mantém as mesmas estruturas do _stream_kernel da política,
+então a sequência de acertos e expulsões é idêntica à de run()/stream().
+access() não cria objetos por chamada além dos do próprio estado: acertos e
+faltas sem expulsão devolvem as tuplas constantes HIT e MISS.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple
+
+from src.core import RunResult
+
+# (acerto, página expulsa)
+AccessOutcome = Tuple[bool, Optional[int]]
+
+HIT: AccessOutcome = (True, None)
+MISS: AccessOutcome = (False, None)
+
+
+class OnlineSimulator(ABC):
+    """
+    Estado de uma política com 'frames' quadros, alimentado acesso a acesso.
+
+    Subclasses implementam access(); os contadores ficam nos atributos
+    trace_len, faults, hits e evictions.
+    """
+
+    __slots__ = ("name", "frames", "trace_len", "faults", "hits", "evictions")
+
+    def __init__(self, name: str, frames: int) -> None:
+        if frames <= 0:
+            raise ValueError("frames deve ser > 0")
+        self.name = name
+        self.frames = frames
+        self.trace_len = 0
+        self.faults = 0
+        self.hits = 0
+        self.evictions = 0
+
+    @abstractmethod
+    def access(self, page_id: int, write: bool = False, t: Optional[int] = None) -> AccessOutcome:
+        """
+        Processa uma referência e devolve (acerto, página expulsa ou None).
+
+        t é o timestamp do acesso; só as políticas baseadas em tempo o usam e,
+        sem ele, aplicam o mesmo fallback de run() (posição do acesso).
+        """
+        ...
+
+    def stats(self) -> RunResult:
+        """Contadores até o último acesso, no formato de run()."""
+        return RunResult(
+            algo_name=self.name,
+            frames=self.frames,
+            trace_len=self.trace_len,
+            faults=self.faults,
+            hits=self.hits,
+            evictions=self.evictions,
+        )
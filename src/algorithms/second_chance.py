@@ -1,46 +1,44 @@
-from typing import Dict, Iterable, List, Optional
+from typing import Generator, Iterable, List, Optional
 
-from src.algorithms.baseAlgorithm import PageReplacementAlgorithm
-from src.core import Access, RunResult, PTE
+from src.algorithms.baseAlgorithm import SNAPSHOT, PageReplacementAlgorithm
+from src.algorithms.clock import ClockSimulator
+from src.algorithms.clock_buffer import ClockBuffer
+from src.core import Access, RunResult, TraceBuffer
 
 
 class SecondChance(PageReplacementAlgorithm):
+    online = True
+
     def __init__(self):
         super().__init__("SecondChance")
         self.pointer: int = 0
 
-    def _advance(self, n: int) -> None:
-        """Avança o ponteiro do relógio (mod n)."""
-        if n > 0:
-            self.pointer = (self.pointer + 1) % n
-
     def run(self, trace: Iterable[Access], frames: int) -> RunResult:
+        """
+        Segunda chance com rastreamento opcional, sobre ClockBuffer.
+
+        Os frames são ocupados em ordem, então o slot do relógio coincide com
+        o frame. self.pointer acompanha o ponteiro do relógio.
+        """
         faults = hits = evictions = 0
-        seq: List[Access] = list(trace)
+        seq = self._normalize_trace(trace)
         if frames <= 0:
             raise ValueError("frames deve ser > 0")
 
         self._trace_begin(frames)
 
-        page_table: Dict[int, PTE] = {}
-        clock: List[int] = []
+        clock = ClockBuffer(frames)
         self.pointer = 0
 
-        free_frames = list(range(frames))
         t_default = 0
 
         def build_frames_state() -> List[dict]:
-            frames_pte: List[Optional[PTE]] = [None] * frames
-            for pte in page_table.values():
-                if pte.frame is not None and 0 <= pte.frame < frames:
-                    frames_pte[pte.frame] = pte
-
-            clock_indexes = {pid: idx for idx, pid in enumerate(clock)}
-            hand_pos = self.pointer % len(clock) if clock else None
+            hand_pos = self.pointer % clock.size if clock.size else None
 
             state: List[dict] = []
-            for i, slot in enumerate(frames_pte):
-                if slot is None:
+            for i in range(frames):
+                pid = clock.pages[i]
+                if pid is None:
                     state.append(
                         {
                             "frame_index": i,
@@ -54,12 +52,12 @@ class SecondChance(PageReplacementAlgorithm):
                     state.append(
                         {
                             "frame_index": i,
-                            "page_id": slot.page_id,
-                            "R": slot.R,
-                            "M": slot.M,
+                            "page_id": pid,
+                            "R": clock.ref[i],
+                            "M": clock.mod[i],
                             "meta": {
                                 "hand": hand_pos,
-                                "clock_slot": clock_indexes.get(slot.page_id),
+                                "clock_slot": i,
                             },
                         }
                     )
@@ -72,69 +70,40 @@ class SecondChance(PageReplacementAlgorithm):
                 t_default += 1
 
             evicted_pid: Optional[int] = None
+            slot = clock.slot_of.get(pid)
 
-            if pid in page_table:
+            if slot is not None:
                 hit = True
                 hits += 1
-                pte = page_table[pid]
-                pte.R = 1
-                if page.write:
-                    pte.M = 1
-                pte.last_used = current_t
+                clock.touch(slot, page.write, current_t)
             else:
                 hit = False
                 faults += 1
 
-                if free_frames:
-                    f = free_frames.pop(0)
-                    page_table[pid] = PTE(
-                        page_id=pid,
-                        frame=f,
-                        R=1,
-                        M=1 if page.write else 0,
-                        loaded_at=current_t,
-                        last_used=current_t,
-                    )
-                    clock.append(pid)
+                if not clock.full:
+                    clock.load(pid, page.write, current_t)
                 else:
-                    n = len(clock)
-                    while True:
-                        victim_pid = clock[self.pointer]
-                        victim_pte = page_table[victim_pid]
-                        if victim_pte.R == 1:
-                            victim_pte.R = 0
-                            self._advance(n)
-                        else:
-                            evictions += 1
-                            evicted_pid = victim_pid
-                            f = victim_pte.frame
-                            clock[self.pointer] = pid
-                            del page_table[victim_pid]
-                            page_table[pid] = PTE(
-                                page_id=pid,
-                                frame=f,
-                                R=1,
-                                M=1 if page.write else 0,
-                                loaded_at=current_t,
-                                last_used=current_t,
-                            )
-                            self._advance(n)
-                            break
-
-            self.trace_step(
-                t=current_t,
-                access_page=pid,
-                access_write=page.write,
-                hit=hit,
-                evicted_page=evicted_pid,
-                frames_state=build_frames_state(),
-                decision_meta={
-                    "policy": "second_chance",
-                    "pointer": self.pointer % len(clock) if clock else None,
-                    "clock_size": len(clock),
-                    "free_frames": len(free_frames),
-                },
-            )
+                    slot = clock.sweep()
+                    evicted_pid = clock.replace(slot, pid, page.write, current_t)
+                    clock.hand = (slot + 1) % clock.size
+                    self.pointer = clock.hand
+                    evictions += 1
+
+            if self._trace_enabled:
+                self.trace_step(
+                    t=current_t,
+                    access_page=pid,
+                    access_write=page.write,
+                    hit=hit,
+                    evicted_page=evicted_pid,
+                    frames_state=build_frames_state(),
+                    decision_meta={
+                        "policy": "second_chance",
+                        "pointer": self.pointer % clock.size if clock.size else None,
+                        "clock_size": clock.size,
+                        "free_frames": frames - clock.size,
+                    },
+                )
 
         self._trace_end(frames)
 
@@ -146,3 +115,64 @@ class SecondChance(PageReplacementAlgorithm):
             hits=hits,
             evictions=evictions,
         )
+
+    def _stream_kernel(
+        self, frames: int, state: Optional[dict] = None
+    ) -> Generator[Optional[dict], Optional[TraceBuffer], RunResult]:
+        """
+        Kernel incremental de contagem sobre ClockBuffer. O ponteiro fica local
+        ao kernel (vários frames rodam juntos); só run() atualiza self.pointer.
+        """
+        clock = ClockBuffer(frames) if state is None else ClockBuffer.from_state(state["clock"])
+        slot_of = clock.slot_of
+        pages = clock.pages
+        ref = clock.ref
+        mod = clock.mod
+        sweep = clock.sweep
+        trace_len = 0
+        faults = hits = evictions = 0
+        if state is not None:
+            trace_len, faults, hits, evictions = state["counters"]
+
+        chunk = yield
+        while chunk is not None:
+            if chunk is SNAPSHOT:
+                chunk = yield {
+                    "clock": clock.state(),
+                    "counters": (trace_len, faults, hits, evictions),
+                }
+                continue
+            trace_len += len(chunk)
+            for pid, write in zip(chunk.pages, chunk.writes):
+                slot = slot_of.get(pid)
+                if slot is not None:
+                    hits += 1
+                    ref[slot] = 1
+                    continue
+
+                faults += 1
+                if clock.size < frames:
+                    clock.load(pid, write)
+                    continue
+
+                slot = sweep()
+                del slot_of[pages[slot]]
+                pages[slot] = pid
+                slot_of[pid] = slot
+                ref[slot] = 1
+                mod[slot] = write
+                clock.hand = (slot + 1) % frames
+                evictions += 1
+            chunk = yield
+
+        return RunResult(
+            algo_name=self.name,
+            frames=frames,
+            trace_len=trace_len,
+            faults=faults,
+            hits=hits,
+            evictions=evictions,
+        )
+
+    def open(self, frames: int) -> ClockSimulator:
+        return ClockSimulator(self.name, frames)
@@ -1,12 +1,33 @@
 from __future__ import annotations
 
-from typing import Dict, Iterable, List, Optional
+import heapq
+from typing import Dict, Generator, Iterable, List, Optional, Tuple
 
-from src.algorithms.baseAlgorithm import PageReplacementAlgorithm
-from src.core import Access, PTE, RunResult
+from src.algorithms.baseAlgorithm import SNAPSHOT, PageReplacementAlgorithm
+from src.algorithms.online import HIT, MISS, AccessOutcome, OnlineSimulator
+from src.core import Access, PageTable, RunResult, TraceBuffer
+
+
+def _pop_oldest(
+    heap: List[Tuple[int, int, int]],
+    last_used: Dict[int, int],
+    load_seq: Dict[int, int],
+) -> int:
+    """
+    Remove do heap a residente com menor (last_used, ordem de carga).
+
+    Entradas são (last_used, ordem_de_carga, pid); as obsoletas (página já
+    expulsa, recarregada ou usada de novo) são descartadas na hora.
+    """
+    while True:
+        used, seq, pid = heapq.heappop(heap)
+        if load_seq.get(pid) == seq and last_used[pid] == used:
+            return pid
 
 
 class WorkingSet(PageReplacementAlgorithm):
+    online = True
+
     def __init__(self, window: int = 4):
         if window <= 0:
             raise ValueError("window deve ser > 0")
@@ -14,6 +35,16 @@ class WorkingSet(PageReplacementAlgorithm):
         self.window = window
 
     def run(self, trace: Iterable[Access], frames: int) -> RunResult:
+        """
+        WorkingSet com rastreamento opcional.
+
+        Vítima: a página mais antiga fora da janela [t - window, t]; se todas
+        estão dentro, a de menor last_used. Se alguma página está fora da
+        janela, a de menor last_used também está, então as duas regras
+        escolhem a mesma página: a de menor (last_used, ordem de carga). Por
+        isso as residentes ficam num heap por essa chave (invalidação
+        preguiçosa), e a escolha custa O(log F).
+        """
         if frames <= 0:
             raise ValueError("frames deve ser > 0")
 
@@ -22,21 +53,19 @@ class WorkingSet(PageReplacementAlgorithm):
 
         self._trace_begin(frames)
 
-        page_table: Dict[int, PTE] = {}
-        loaded_pages: List[int] = []
-        free_frames = list(range(frames))
+        page_table = PageTable(frames)
+        last_used: Dict[int, int] = {}
+        load_seq: Dict[int, int] = {}
+        heap: List[Tuple[int, int, int]] = []
+        loads = 0
 
         time_fallback = 0
 
         def build_frames_state() -> List[dict]:
-            frames_pte: List[Optional[PTE]] = [None] * frames
-            for pid, pte in page_table.items():
-                if pte.frame is not None and 0 <= pte.frame < frames:
-                    frames_pte[pte.frame] = pte
-
             state: List[dict] = []
-            for idx, slot in enumerate(frames_pte):
-                if slot is None:
+            for idx in range(frames):
+                slot = page_table.frame_page[idx]
+                if slot < 0:
                     state.append(
                         {
                             "frame_index": idx,
@@ -50,12 +79,12 @@ class WorkingSet(PageReplacementAlgorithm):
                     state.append(
                         {
                             "frame_index": idx,
-                            "page_id": slot.page_id,
-                            "R": slot.R,
-                            "M": slot.M,
+                            "page_id": page_table.page_id(slot),
+                            "R": page_table.R[slot],
+                            "M": page_table.M[slot],
                             "meta": {
                                 "window": self.window,
-                                "last_used": slot.last_used,
+                                "last_used": page_table.last_used[slot],
                             },
                         }
                     )
@@ -72,60 +101,46 @@ class WorkingSet(PageReplacementAlgorithm):
             if pid in page_table:
                 hit = True
                 hits += 1
-                pte = page_table[pid]
-                pte.R = 1
-                if acc.write:
-                    pte.M = 1
-                pte.last_used = t
+                page_table.touch(pid, acc.write, t)
             else:
                 hit = False
                 faults += 1
 
-                if free_frames:
-                    frame = free_frames.pop(0)
-                    pte = PTE(
-                        page_id=pid,
-                        frame=frame,
-                        R=1,
-                        M=int(acc.write),
-                        loaded_at=t,
-                        last_used=t,
-                    )
-                    page_table[pid] = pte
-                    loaded_pages.append(pid)
+                if len(page_table) < frames:
+                    frame = len(page_table)
                 else:
-                    victim_pid = self._select_victim(page_table, loaded_pages, current_time=t)
+                    victim_pid = _pop_oldest(heap, last_used, load_seq)
                     victim_meta = victim_pid
-                    victim_pte = page_table.pop(victim_pid)
-                    loaded_pages.remove(victim_pid)
+                    frame = page_table.evict(victim_pid)
+                    del last_used[victim_pid]
+                    del load_seq[victim_pid]
                     evictions += 1
-
-                    frame = victim_pte.frame
-                    pte = PTE(
-                        page_id=pid,
-                        frame=frame,
-                        R=1,
-                        M=int(acc.write),
-                        loaded_at=t,
-                        last_used=t,
-                    )
-                    page_table[pid] = pte
-                    loaded_pages.append(pid)
                     evicted_pid = victim_pid
 
-            self.trace_step(
-                t=t,
-                access_page=pid,
-                access_write=acc.write,
-                hit=hit,
-                evicted_page=evicted_pid,
-                frames_state=build_frames_state(),
-                decision_meta={
-                    "policy": "working_set",
-                    "window": self.window,
-                    "victim": victim_meta,
-                },
-            )
+                page_table.load(pid, frame, acc.write, t)
+                load_seq[pid] = loads
+                loads += 1
+
+            last_used[pid] = t
+            heapq.heappush(heap, (t, load_seq[pid], pid))
+            if len(heap) > 2 * frames + 16:
+                heap = [(last_used[p], load_seq[p], p) for p in load_seq]
+                heapq.heapify(heap)
+
+            if self._trace_enabled:
+                self.trace_step(
+                    t=t,
+                    access_page=pid,
+                    access_write=acc.write,
+                    hit=hit,
+                    evicted_page=evicted_pid,
+                    frames_state=build_frames_state(),
+                    decision_meta={
+                        "policy": "working_set",
+                        "window": self.window,
+                        "victim": victim_meta,
+                    },
+                )
 
         self._trace_end(frames)
 
@@ -138,28 +153,116 @@ class WorkingSet(PageReplacementAlgorithm):
             evictions=evictions,
         )
 
-    def _select_victim(self, page_table: Dict[int, PTE], loaded_pages: List[int], current_time: int) -> int:
-        window_start = current_time - self.window
-        candidate_pid = None
-        candidate_time = None
-        lru_pid = None
-        lru_time = None
-
-        for pid in loaded_pages:
-            pte = page_table[pid]
-            last_used = pte.last_used if pte.last_used is not None else -float("inf")
-
-            if lru_time is None or last_used < lru_time:
-                lru_pid = pid
-                lru_time = last_used
-
-            if last_used <= window_start:
-                if candidate_time is None or last_used < candidate_time:
-                    candidate_pid = pid
-                    candidate_time = last_used
-
-        if candidate_pid is not None:
-            return candidate_pid
-        if lru_pid is not None:
-            return lru_pid
-        raise RuntimeError("Nenhuma página disponível para substituição.")
+    def _stream_kernel(
+        self, frames: int, state: Optional[dict] = None
+    ) -> Generator[Optional[dict], Optional[TraceBuffer], RunResult]:
+        """Kernel incremental de contagem com o mesmo heap (last_used, ordem de carga) de run()."""
+        if frames <= 0:
+            raise ValueError("frames deve ser > 0")
+
+        heappush = heapq.heappush
+        last_used: Dict[int, int] = {}
+        load_seq: Dict[int, int] = {}
+        heap: List[Tuple[int, int, int]] = []
+        limit = 2 * frames + 16
+        loads = 0
+        trace_len = 0
+        faults = hits = evictions = 0
+        if state is not None:
+            last_used.update(state["last_used"])
+            load_seq.update(state["load_seq"])
+            loads = state["loads"]
+            trace_len, faults, hits, evictions = state["counters"]
+            heap = [(last_used[p], load_seq[p], p) for p in load_seq]
+            heapq.heapify(heap)
+
+        chunk = yield
+        while chunk is not None:
+            if chunk is SNAPSHOT:
+                chunk = yield {
+                    "last_used": dict(last_used),
+                    "load_seq": dict(load_seq),
+                    "loads": loads,
+                    "counters": (trace_len, faults, hits, evictions),
+                }
+                continue
+            times = chunk.filled_times("index", trace_len)
+            trace_len += len(chunk)
+            for pid, t in zip(chunk.pages, times):
+                order = load_seq.get(pid)
+                if order is not None:
+                    hits += 1
+                else:
+                    faults += 1
+                    if len(load_seq) >= frames:
+                        victim_pid = _pop_oldest(heap, last_used, load_seq)
+                        del last_used[victim_pid]
+                        del load_seq[victim_pid]
+                        evictions += 1
+                    order = load_seq[pid] = loads
+                    loads += 1
+
+                last_used[pid] = t
+                heappush(heap, (t, order, pid))
+                if len(heap) > limit:
+                    heap = [(last_used[p], load_seq[p], p) for p in load_seq]
+                    heapq.heapify(heap)
+            chunk = yield
+
+        return RunResult(
+            algo_name=self.name,
+            frames=frames,
+            trace_len=trace_len,
+            faults=faults,
+            hits=hits,
+            evictions=evictions,
+        )
+
+    def open(self, frames: int) -> "WorkingSetSimulator":
+        return WorkingSetSimulator(self.name, frames)
+
+
+class WorkingSetSimulator(OnlineSimulator):
+    """
+    Working Set incremental com o heap (last_used, ordem de carga) do kernel:
+    O(log F) por acesso. Sem t, o tempo é a posição do acesso, como em run().
+    """
+
+    __slots__ = ("_last_used", "_load_seq", "_heap", "_limit", "_loads")
+
+    def __init__(self, name: str, frames: int) -> None:
+        super().__init__(name, frames)
+        self._last_used: Dict[int, int] = {}
+        self._load_seq: Dict[int, int] = {}
+        self._heap: List[Tuple[int, int, int]] = []
+        self._limit = 2 * frames + 16
+        self._loads = 0
+
+    def access(self, page_id: int, write: bool = False, t: Optional[int] = None) -> AccessOutcome:
+        last_used = self._last_used
+        load_seq = self._load_seq
+        if t is None:
+            t = self.trace_len
+        self.trace_len += 1
+        outcome = HIT
+        order = load_seq.get(page_id)
+        if order is not None:
+            self.hits += 1
+        else:
+            self.faults += 1
+            outcome = MISS
+            if len(load_seq) >= self.frames:
+                victim = _pop_oldest(self._heap, last_used, load_seq)
+                del last_used[victim]
+                del load_seq[victim]
+                self.evictions += 1
+                outcome = (False, victim)
+            order = load_seq[page_id] = self._loads
+            self._loads += 1
+
+        last_used[page_id] = t
+        heapq.heappush(self._heap, (t, order, page_id))
+        if len(self._heap) > self._limit:
+            self._heap = [(last_used[p], load_seq[p], p) for p in load_seq]
+            heapq.heapify(self._heap)
+        return outcome
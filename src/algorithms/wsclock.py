@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-from typing import Dict, Iterable, List, Optional
+from typing import Generator, Iterable, List, Optional
 
-from src.algorithms.baseAlgorithm import PageReplacementAlgorithm
-from src.core import Access, PTE, RunResult
+from src.algorithms.baseAlgorithm import SNAPSHOT, PageReplacementAlgorithm
+from src.algorithms.online import HIT, MISS, AccessOutcome, OnlineSimulator
+from src.algorithms.clock_buffer import ClockBuffer
+from src.core import Access, RunResult, TraceBuffer
 
 
 class WSClock(PageReplacementAlgorithm):
+    online = True
+
     def __init__(self, window: int = 4):
         if window < 0:
             raise ValueError("window deve ser >= 0")
@@ -15,6 +19,13 @@ class WSClock(PageReplacementAlgorithm):
         self.pointer = 0
 
     def run(self, trace: Iterable[Access], frames: int) -> RunResult:
+        """
+        WSClock com rastreamento opcional, sobre ClockBuffer.
+
+        A escolha da vítima é ClockBuffer.wsclock_victim(): uma varredura
+        vetorizada com os mesmos efeitos colaterais (R e M zerados) da
+        varredura slot a slot.
+        """
         if frames <= 0:
             raise ValueError("frames deve ser > 0")
 
@@ -23,25 +34,18 @@ class WSClock(PageReplacementAlgorithm):
 
         self._trace_begin(frames)
 
-        page_table: Dict[int, PTE] = {}
-        clock: List[int] = []
-        free_frames = list(range(frames))
+        clock = ClockBuffer(frames)
         self.pointer = 0
 
         time_fallback = 0
 
         def build_frames_state() -> List[dict]:
-            frames_pte: List[Optional[PTE]] = [None] * frames
-            for pid, pte in page_table.items():
-                if pte.frame is not None and 0 <= pte.frame < frames:
-                    frames_pte[pte.frame] = pte
-
-            clock_pos = {pid: idx for idx, pid in enumerate(clock)}
-            hand_pos = self.pointer % len(clock) if clock else None
+            hand_pos = self.pointer % clock.size if clock.size else None
 
             state: List[dict] = []
-            for idx, slot in enumerate(frames_pte):
-                if slot is None:
+            for idx in range(frames):
+                pid = clock.pages[idx]
+                if pid is None:
                     meta = {"hand": hand_pos, "window": self.window}
                     state.append(
                         {
@@ -55,16 +59,16 @@ class WSClock(PageReplacementAlgorithm):
                 else:
                     meta = {
                         "hand": hand_pos,
-                        "clock_slot": clock_pos.get(slot.page_id),
+                        "clock_slot": idx,
                         "window": self.window,
-                        "age": (time_fallback - slot.last_used) if slot.last_used is not None else None,
+                        "age": time_fallback - clock.last_used[idx],
                     }
                     state.append(
                         {
                             "frame_index": idx,
-                            "page_id": slot.page_id,
-                            "R": slot.R,
-                            "M": slot.M,
+                            "page_id": pid,
+                            "R": clock.ref[idx],
+                            "M": clock.mod[idx],
                             "meta": meta,
                         }
                     )
@@ -77,68 +81,41 @@ class WSClock(PageReplacementAlgorithm):
 
             evicted_pid: Optional[int] = None
             victim_index_meta: Optional[int] = None
+            slot = clock.slot_of.get(pid)
 
-            if pid in page_table:
+            if slot is not None:
                 hit = True
                 hits += 1
-                pte = page_table[pid]
-                pte.R = 1
-                if acc.write:
-                    pte.M = 1
-                pte.last_used = t
+                clock.touch(slot, acc.write, t)
             else:
                 hit = False
                 faults += 1
 
-                if free_frames:
-                    frame = free_frames.pop(0)
-                    pte = PTE(
-                        page_id=pid,
-                        frame=frame,
-                        R=1,
-                        M=int(acc.write),
-                        loaded_at=t,
-                        last_used=t,
-                    )
-                    page_table[pid] = pte
-                    clock.append(pid)
+                if not clock.full:
+                    clock.load(pid, acc.write, t)
                 else:
-                    victim_index = self._find_victim(page_table, clock, current_time=t)
+                    victim_index = clock.wsclock_victim(t, self.window)
                     victim_index_meta = victim_index
-                    victim_pid = clock[victim_index]
-                    victim_pte = page_table.pop(victim_pid)
+                    evicted_pid = clock.replace(victim_index, pid, acc.write, t)
                     evictions += 1
 
-                    frame = victim_pte.frame
-                    clock[victim_index] = pid
-
-                    pte = PTE(
-                        page_id=pid,
-                        frame=frame,
-                        R=1,
-                        M=int(acc.write),
-                        loaded_at=t,
-                        last_used=t,
-                    )
-                    page_table[pid] = pte
-
-                    self.pointer = (victim_index + 1) % len(clock)
-                    evicted_pid = victim_pid
-
-            self.trace_step(
-                t=t,
-                access_page=pid,
-                access_write=acc.write,
-                hit=hit,
-                evicted_page=evicted_pid,
-                frames_state=build_frames_state(),
-                decision_meta={
-                    "policy": "wsclock",
-                    "pointer": self.pointer % len(clock) if clock else None,
-                    "window": self.window,
-                    "victim_index": victim_index_meta,
-                },
-            )
+                    clock.hand = self.pointer = (victim_index + 1) % clock.size
+
+            if self._trace_enabled:
+                self.trace_step(
+                    t=t,
+                    access_page=pid,
+                    access_write=acc.write,
+                    hit=hit,
+                    evicted_page=evicted_pid,
+                    frames_state=build_frames_state(),
+                    decision_meta={
+                        "policy": "wsclock",
+                        "pointer": self.pointer % clock.size if clock.size else None,
+                        "window": self.window,
+                        "victim_index": victim_index_meta,
+                    },
+                )
 
         self._trace_end(frames)
 
@@ -151,42 +128,105 @@ class WSClock(PageReplacementAlgorithm):
             evictions=evictions,
         )
 
-    def _find_victim(self, page_table: Dict[int, PTE], clock: List[int], current_time: int) -> int:
-        n = len(clock)
-        if n == 0:
-            raise RuntimeError("Relógio vazio durante a substituição.")
+    def _stream_kernel(
+        self, frames: int, state: Optional[dict] = None
+    ) -> Generator[Optional[dict], Optional[TraceBuffer], RunResult]:
+        """
+        Kernel incremental de contagem sobre ClockBuffer. O ponteiro fica local
+        ao kernel (vários frames rodam juntos); só run() atualiza self.pointer.
+        """
+        window = self.window
+        clock = ClockBuffer(frames) if state is None else ClockBuffer.from_state(state["clock"])
+        slot_of = clock.slot_of
+        pages = clock.pages
+        ref = clock.ref
+        mod = clock.mod
+        last_used = clock.last_used
+        trace_len = 0
+        faults = hits = evictions = 0
+        if state is not None:
+            trace_len, faults, hits, evictions = state["counters"]
+
+        chunk = yield
+        while chunk is not None:
+            if chunk is SNAPSHOT:
+                chunk = yield {
+                    "clock": clock.state(),
+                    "counters": (trace_len, faults, hits, evictions),
+                }
+                continue
+            times = chunk.filled_times("index", trace_len)
+            trace_len += len(chunk)
+            for pid, write, t in zip(chunk.pages, chunk.writes, times):
+                slot = slot_of.get(pid)
+                if slot is not None:
+                    hits += 1
+                    ref[slot] = 1
+                    if write:
+                        mod[slot] = 1
+                    last_used[slot] = t
+                    continue
+
+                faults += 1
+                if clock.size < frames:
+                    clock.load(pid, write, t)
+                    continue
+
+                slot = clock.wsclock_victim(t, window)
+                del slot_of[pages[slot]]
+                pages[slot] = pid
+                slot_of[pid] = slot
+                ref[slot] = 1
+                mod[slot] = write
+                last_used[slot] = t
+                clock.hand = (slot + 1) % frames
+                evictions += 1
+            chunk = yield
+
+        return RunResult(
+            algo_name=self.name,
+            frames=frames,
+            trace_len=trace_len,
+            faults=faults,
+            hits=hits,
+            evictions=evictions,
+        )
+
+    def open(self, frames: int) -> "WSClockSimulator":
+        return WSClockSimulator(self.name, frames, self.window)
 
-        start = self.pointer % n
-        index = start
-        visited_full_cycle = False
 
-        while True:
-            pid = clock[index]
-            pte = page_table[pid]
+class WSClockSimulator(OnlineSimulator):
+    """
+    WSClock incremental sobre ClockBuffer (varredura de run(), O(1)
+    amortizado). Sem t, o tempo é a posição do acesso, como em run().
+    """
 
-            age = float("inf")
-            if pte.last_used is not None and current_time is not None:
-                age = current_time - pte.last_used
+    __slots__ = ("clock", "window")
 
-            if pte.R == 1:
-                pte.R = 0
-            else:
-                should_replace = False
-                if age > self.window:
-                    if pte.M == 0:
-                        should_replace = True
-                    elif visited_full_cycle:
-                        should_replace = True
-                    else:
-                        pte.M = 0
-                elif visited_full_cycle:
-                    should_replace = True
-
-                if should_replace:
-                    return index
-
-            index = (index + 1) % n
-            if index == start:
-                if visited_full_cycle:
-                    return index
-                visited_full_cycle = True
+    def __init__(self, name: str, frames: int, window: int) -> None:
+        super().__init__(name, frames)
+        self.clock = ClockBuffer(frames)
+        self.window = window
+
+    def access(self, page_id: int, write: bool = False, t: Optional[int] = None) -> AccessOutcome:
+        clock = self.clock
+        if t is None:
+            t = self.trace_len
+        self.trace_len += 1
+        slot = clock.slot_of.get(page_id)
+        if slot is not None:
+            self.hits += 1
+            clock.touch(slot, write, t)
+            return HIT
+
+        self.faults += 1
+        if clock.size < self.frames:
+            clock.load(page_id, write, t)
+            return MISS
+
+        slot = clock.wsclock_victim(t, self.window)
+        victim = clock.replace(slot, page_id, write, t)
+        clock.hand = (slot + 1) % self.frames
+        self.evictions += 1
+        return False, victim
@@ -0,0 +1,81 @@
+"""
+Checkpoints de simulações em streaming (PageReplacementAlgorithm.stream).
+
+Um checkpoint guarda, para uma política online e um frames_list, quantos
+acessos já foram simulados e o estado interno de cada kernel naquele ponto
+(tabela de páginas, ponteiro do relógio, contadores, tempo de fallback...).
+Com ele, resume() continua a simulação do ponto salvo: depois de uma queda,
+ou quando novos acessos são acrescentados ao fim do traço.
+
+Formato: MAGIC, seguido de um pickle (zlib) do dict
+  version, algo (módulo.classe), config, frames_list, position, states
+gravado de forma atômica (arquivo temporário + os.replace), para que uma
+queda durante a gravação preserve o checkpoint anterior.
+"""
+
+import os
+import pickle
+import tempfile
+import zlib
+from typing import Any, Dict, List
+
+MAGIC = b"PRCKPT1\0"
+VERSION = 1
+
+DEFAULT_EVERY = 10_000_000
+
+
+def algo_id(algo: Any) -> str:
+    cls = type(algo)
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def save_checkpoint(
+    path: str, algo: Any, frames_list: List[int], position: int, states: List[Dict[str, Any]]
+) -> None:
+    """Grava o checkpoint em 'path', substituindo o anterior atomicamente."""
+    payload = {
+        "version": VERSION,
+        "algo": algo_id(algo),
+        "config": algo.config(),
+        "frames_list": list(frames_list),
+        "position": position,
+        "states": states,
+    }
+    data = MAGIC + zlib.compress(pickle.dumps(payload, pickle.HIGHEST_PROTOCOL), 1)
+
+    d = os.path.dirname(path) or "."
+    os.makedirs(d, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=d, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def load_checkpoint(path: str, algo: Any) -> Dict[str, Any]:
+    """
+    Lê um checkpoint e confere se ele é da mesma classe e configuração de
+    'algo'; devolve o dict com frames_list, position e states.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"Não é um arquivo de checkpoint: {path}")
+    payload = pickle.loads(zlib.decompress(data[len(MAGIC) :]))
+    if payload.get("version") != VERSION:
+        raise ValueError(f"Versão de checkpoint não suportada: {payload.get('version')}")
+    if payload["algo"] != algo_id(algo) or payload["config"] != algo.config():
+        raise ValueError(
+            f"Checkpoint de {payload['algo']} {payload['config']}, "
+            f"não de {algo_id(algo)} {algo.config()}"
+        )
+    return payload
@@ -1,6 +1,7 @@
 from __future__ import annotations
+from array import array
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Union, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Union, Tuple
 import random
 
 
@@ -37,36 +38,41 @@ def make_locality_trace(
     if phase_length < 1:
         raise ValueError("phase_length deve ser >= 1.")
 
-    if seed is not None:
-        random.seed(seed)
+    # Gerador próprio: mesma sequência que random.seed(seed), sem mexer no
+    # estado global do módulo random.
+    rng = random.Random(seed)
 
     pages = list(range(1, num_pages + 1))
     trace: List[Access] = []
 
     current_phase_start = 0
-    current_ws = random.sample(pages, working_set_size)
+    current_ws = rng.sample(pages, working_set_size)
 
     for t in range(trace_length):
         if (t - current_phase_start) >= phase_length:
             current_phase_start = t
-            current_ws = random.sample(pages, working_set_size)
+            current_ws = rng.sample(pages, working_set_size)
 
-        if random.random() < locality_prob:
-            pid = random.choice(current_ws)
+        if rng.random() < locality_prob:
+            pid = rng.choice(current_ws)
         else:
-            pid = random.choice(pages)
+            pid = rng.choice(pages)
 
-        write = random.random() < write_prob
+        write = rng.random() < write_prob
         trace.append(Access(page_id=pid, write=write, t=t))
 
+    return trace, auto_frames_list(num_pages)
+
+
+def auto_frames_list(num_pages: int) -> List[int]:
+    """Cerca de 5 valores de frames entre ~20% e ~80% do nº de páginas."""
     min_f = max(1, num_pages // 5)
     max_f = max(min_f + 1, (num_pages * 4) // 5 or 1)
     step = max(1, (max_f - min_f) // 4)
     frames_list = list(range(min_f, max_f + 1, step))
     if frames_list[-1] != max_f:
         frames_list.append(max_f)
-
-    return trace, frames_list
+    return frames_list
 
 def make_random_trace(
     num_pages: int = 10,
@@ -94,16 +100,25 @@ def make_random_trace(
     if not (0.0 <= write_prob <= 1.0):
         raise ValueError("write_prob deve estar em [0.0, 1.0].")
 
-    if seed is not None:
-        random.seed(seed)
+    rng = random.Random(seed)
 
     pages = list(range(1, num_pages + 1))
     trace: List[Access] = []
     for t in range(trace_length):
-        pid = random.choice(pages)
-        write = random.random() < write_prob
+        pid = rng.choice(pages)
+        write = rng.random() < write_prob
         trace.append(Access(page_id=pid, write=write, t=t))
 
+    return trace, resolve_frames_list(frames, frame_mode, num_pages)
+
+
+def resolve_frames_list(
+    frames: Union[Tuple[int, int], List[int], int, None],
+    frame_mode: str,
+    num_pages: int,
+) -> List[int]:
+    """Interpreta o argumento 'frames' de make_random_trace (ver lá)."""
+
     def ensure_positive(v: int, name: str) -> int:
         if v <= 0:
             raise ValueError(f"{name} deve ser > 0.")
@@ -131,12 +146,7 @@ def make_random_trace(
 
     elif frames is None:
         if frame_mode == "auto":
-            min_f = max(1, num_pages // 5)
-            max_f = max(min_f + 1, (num_pages * 4) // 5 or 1)
-            step = max(1, (max_f - min_f) // 4)
-            frames_list = list(range(min_f, max_f + 1, step))
-            if frames_list[-1] != max_f:
-                frames_list.append(max_f)
+            frames_list = auto_frames_list(num_pages)
 
         elif frame_mode == "range":
             start, end = 2, max(2, min(8, num_pages))
@@ -152,7 +162,7 @@ def make_random_trace(
     else:
         raise ValueError("Tipo de 'frames' inválido.")
 
-    return trace, frames_list
+    return frames_list
 
 @dataclass(frozen=True)
 class Access:
@@ -166,6 +176,236 @@ class Access:
     t: Optional[int] = None
 
 
+class TraceBuffer:
+    """
+    Traço em colunas, validado uma única vez na construção.
+
+    - pages: array('q') com os page ids
+    - writes: bytearray (1 = escrita)
+    - times: array('q') com os timestamps, ou None se nenhum acesso tem t
+    - has_t: bytearray marcando os acessos com t, ou None se todos têm
+      (só existe quando os timestamps são parciais)
+
+    As colunas também podem ser memoryviews do mesmo formato (ex.: sobre um
+    arquivo mapeado por src.trace_file.read_trace).
+
+    Os algoritmos aceitam um TraceBuffer direto (sem cópia); iterar sobre ele
+    produz objetos Access, para compatibilidade com o código que espera
+    List[Access]. Cada acesso ocupa ~9-17 bytes, contra ~100 de um Access.
+    """
+
+    __slots__ = ("pages", "writes", "times", "has_t")
+
+    def __init__(
+        self,
+        pages: Iterable[int],
+        writes: Optional[Iterable[bool]] = None,
+        times: Optional[Iterable[Optional[int]]] = None,
+    ) -> None:
+        try:
+            self.pages = array("q", pages)
+        except (TypeError, OverflowError) as exc:
+            raise TypeError("page_id deve ser um inteiro de 64 bits.") from exc
+        n = len(self.pages)
+
+        if writes is None:
+            self.writes = bytearray(n)
+        else:
+            self.writes = bytearray([1 if w else 0 for w in writes])
+            if len(self.writes) != n:
+                raise ValueError("writes deve ter o mesmo tamanho de pages.")
+
+        self.times: Optional[array] = None
+        self.has_t: Optional[bytearray] = None
+        if times is not None:
+            ts = list(times)
+            if len(ts) != n:
+                raise ValueError("times deve ter o mesmo tamanho de pages.")
+            if None in ts:
+                mask = bytearray([0 if x is None else 1 for x in ts])
+                if any(mask):
+                    self.has_t = mask
+                    ts = [0 if x is None else x for x in ts]
+                else:
+                    ts = None
+            if ts is not None:
+                try:
+                    self.times = array("q", ts)
+                except (TypeError, OverflowError) as exc:
+                    raise TypeError("t deve ser um inteiro de 64 bits ou None.") from exc
+
+    @classmethod
+    def _from_columns(cls, pages, writes, times=None, has_t=None) -> "TraceBuffer":
+        """Monta o buffer a partir de colunas já validadas, sem copiá-las."""
+        out = cls.__new__(cls)
+        out.pages = pages
+        out.writes = writes
+        out.times = times
+        out.has_t = has_t
+        return out
+
+    @classmethod
+    def from_arrays(cls, pages, writes=None, times=None) -> "TraceBuffer":
+        """
+        Usa arrays contíguos já prontos (ex.: NumPy int64/bool) como colunas,
+        sem copiar: pages e times com itens de 8 bytes, writes com 1 byte
+        (0/1). Os dados não são revalidados item a item.
+        """
+
+        def column(obj, fmt: str, size: int):
+            view = memoryview(obj)
+            if not view.c_contiguous or view.itemsize != size:
+                raise TypeError(f"Coluna deve ser contígua com itens de {size} byte(s).")
+            return view.cast("B").cast(fmt)
+
+        p = column(pages, "q", 8)
+        w = bytearray(len(p)) if writes is None else column(writes, "B", 1)
+        t = None if times is None else column(times, "q", 8)
+        if len(w) != len(p) or (t is not None and len(t) != len(p)):
+            raise ValueError("As colunas devem ter o mesmo tamanho.")
+        return cls._from_columns(p, w, t)
+
+    @classmethod
+    def from_accesses(cls, trace: Iterable[Access]) -> "TraceBuffer":
+        """Converte (e valida) uma sequência de Access."""
+        if isinstance(trace, TraceBuffer):
+            return trace
+        seq = trace if isinstance(trace, list) else list(trace)
+        if not all(isinstance(a, Access) for a in seq):
+            raise TypeError("O traço deve conter apenas objetos Access.")
+        return cls(
+            [a.page_id for a in seq],
+            [a.write for a in seq],
+            [a.t for a in seq],
+        )
+
+    def __reduce__(self):
+        # Colunas podem ser memoryviews (NumPy, mmap), que não são
+        # serializáveis: o pickle leva cópias em array/bytearray.
+        def q_column(col) -> array:
+            out = array("q")
+            out.frombytes(memoryview(col).cast("B"))
+            return out
+
+        return (
+            TraceBuffer._from_columns,
+            (
+                q_column(self.pages),
+                bytearray(self.writes),
+                None if self.times is None else q_column(self.times),
+                None if self.has_t is None else bytearray(self.has_t),
+            ),
+        )
+
+    def to_accesses(self) -> List[Access]:
+        return list(self)
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def __iter__(self) -> Iterator[Access]:
+        pages, writes = self.pages, self.writes
+        if self.times is None:
+            for pid, w in zip(pages, writes):
+                yield Access(pid, w == 1)
+        elif self.has_t is None:
+            for pid, w, t in zip(pages, writes, self.times):
+                yield Access(pid, w == 1, t)
+        else:
+            for pid, w, t, h in zip(pages, writes, self.times, self.has_t):
+                yield Access(pid, w == 1, t if h else None)
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[Access, "TraceBuffer"]:
+        if isinstance(i, slice):
+            return TraceBuffer._from_columns(
+                self.pages[i],
+                self.writes[i],
+                None if self.times is None else self.times[i],
+                None if self.has_t is None else self.has_t[i],
+            )
+        return Access(self.pages[i], self.writes[i] == 1, self.t_at(i))
+
+    def t_at(self, i: int) -> Optional[int]:
+        if self.times is None or (self.has_t is not None and not self.has_t[i]):
+            return None
+        return self.times[i]
+
+    def filled_times(self, fallback: str = "index", start: int = 0) -> array:
+        """
+        Timestamps com os ausentes preenchidos, como fazem os algoritmos:
+          - "index": a posição do acesso no traço (+ start)
+          - "count": um contador, iniciado em start, que só avança nos
+            acessos sem t
+
+        start permite continuar a numeração entre blocos de um streaming.
+        """
+        if fallback not in ("index", "count"):
+            raise ValueError("fallback inválido. Use 'index' ou 'count'.")
+        if self.has_t is None:
+            if self.times is not None:
+                return self.times
+            return array("q", range(start, start + len(self.pages)))
+        if fallback == "index":
+            return array(
+                "q",
+                [
+                    t if h else start + i
+                    for i, (t, h) in enumerate(zip(self.times, self.has_t))
+                ],
+            )
+        out = array("q", self.times)
+        k = start
+        for i, h in enumerate(self.has_t):
+            if not h:
+                out[i] = k
+                k += 1
+        return out
+
+    def missing_t(self) -> int:
+        """Nº de acessos sem timestamp."""
+        if self.times is None:
+            return len(self.pages)
+        if self.has_t is None:
+            return 0
+        return len(self.has_t) - sum(self.has_t)
+
+
+def iter_chunks(
+    source: Union[TraceBuffer, Iterable[Access], Iterable[TraceBuffer]],
+    chunk_size: int = 65536,
+) -> Iterator[TraceBuffer]:
+    """
+    Percorre um traço em blocos de até chunk_size acessos, sem materializá-lo.
+
+    source pode ser:
+      - TraceBuffer (inclusive um arquivo mapeado): fatiado em blocos
+      - iterável de TraceBuffer: cada bloco é repassado como está
+      - iterável (ou gerador) de Access: agrupado e validado bloco a bloco
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size deve ser > 0")
+
+    if isinstance(source, TraceBuffer):
+        for lo in range(0, len(source), chunk_size):
+            yield source[lo : lo + chunk_size]
+        return
+
+    pending: List[Access] = []
+    for item in source:
+        if isinstance(item, TraceBuffer):
+            if pending:
+                yield TraceBuffer.from_accesses(pending)
+                pending = []
+            yield item
+            continue
+        pending.append(item)
+        if len(pending) >= chunk_size:
+            yield TraceBuffer.from_accesses(pending)
+            pending = []
+    if pending:
+        yield TraceBuffer.from_accesses(pending)
+
+
 @dataclass(frozen=True)
 class RunResult:
     algo_name: str
@@ -190,7 +430,7 @@ class BenchmarkResult:
     results: List[RunResult]
 
 
-@dataclass
+@dataclass(slots=True)
 class PTE:
     """Entrada de tabela de páginas simplificada (estado residente)."""
     page_id: int
@@ -199,3 +439,131 @@ class PTE:
     M: int = 0
     loaded_at: int = 0
     last_used: int = 0
+
+
+class PageTable:
+    """
+    Tabela de páginas em struct-of-arrays.
+
+    Cada página recebe um índice denso na ordem em que aparece; frame, R, M,
+    loaded_at e last_used ficam em arrays paralelos indexados por ele, sem um
+    objeto por página (frame = -1 quando não residente). Com num_pages, os
+    próprios ids 0..num_pages-1 são os índices e nenhum dicionário é usado.
+
+    frame_page guarda o caminho inverso (frame -> índice denso, -1 = livre),
+    o que permite montar o estado dos frames em O(frames).
+    """
+
+    __slots__ = (
+        "page_ids",
+        "_index",
+        "frame",
+        "R",
+        "M",
+        "loaded_at",
+        "last_used",
+        "frame_page",
+        "resident",
+    )
+
+    def __init__(self, frames: int, num_pages: Optional[int] = None) -> None:
+        if frames <= 0:
+            raise ValueError("frames deve ser > 0")
+        n = num_pages or 0
+        self.page_ids: Optional[List[int]] = None if num_pages is not None else []
+        self._index: Optional[Dict[int, int]] = None if num_pages is not None else {}
+        self.frame = array("q", [-1]) * n
+        self.R = bytearray(n)
+        self.M = bytearray(n)
+        self.loaded_at = array("q", bytes(8 * n))
+        self.last_used = array("q", bytes(8 * n))
+        self.frame_page = array("q", [-1]) * frames
+        self.resident = 0
+
+    def __len__(self) -> int:
+        return self.resident
+
+    def __contains__(self, pid: int) -> bool:
+        idx = self.lookup(pid)
+        return idx >= 0 and self.frame[idx] >= 0
+
+    def lookup(self, pid: int) -> int:
+        """Índice denso de pid, ou -1 se a página nunca foi vista."""
+        if self._index is None:
+            return pid if 0 <= pid < len(self.frame) else -1
+        return self._index.get(pid, -1)
+
+    def index(self, pid: int) -> int:
+        """Índice denso de pid, registrando a página se for nova."""
+        if self._index is None:
+            if not 0 <= pid < len(self.frame):
+                raise ValueError(f"page_id fora de [0, {len(self.frame)}): {pid}")
+            return pid
+        idx = self._index.get(pid)
+        if idx is None:
+            idx = self._index[pid] = len(self.page_ids)
+            self.page_ids.append(pid)
+            self.frame.append(-1)
+            self.R.append(0)
+            self.M.append(0)
+            self.loaded_at.append(0)
+            self.last_used.append(0)
+        return idx
+
+    def page_id(self, idx: int) -> int:
+        return idx if self.page_ids is None else self.page_ids[idx]
+
+    def frame_of(self, pid: int) -> Optional[int]:
+        idx = self.lookup(pid)
+        if idx < 0 or self.frame[idx] < 0:
+            return None
+        return self.frame[idx]
+
+    def page_at(self, frame: int) -> Optional[int]:
+        """Página residente no frame, ou None se o frame está livre."""
+        idx = self.frame_page[frame]
+        return None if idx < 0 else self.page_id(idx)
+
+    def load(self, pid: int, frame: int, write: bool, t: int) -> int:
+        """Carrega pid no frame (R=1, M=write) e devolve o índice denso."""
+        idx = self.index(pid)
+        self.frame[idx] = frame
+        self.frame_page[frame] = idx
+        self.R[idx] = 1
+        self.M[idx] = 1 if write else 0
+        self.loaded_at[idx] = t
+        self.last_used[idx] = t
+        self.resident += 1
+        return idx
+
+    def touch(self, pid: int, write: bool, t: int) -> int:
+        """Acerto: liga R (e M, se escrita), atualiza last_used e devolve o índice."""
+        idx = self.lookup(pid)
+        self.R[idx] = 1
+        if write:
+            self.M[idx] = 1
+        self.last_used[idx] = t
+        return idx
+
+    def evict(self, pid: int) -> int:
+        """Remove pid da memória e devolve o frame liberado."""
+        idx = self.lookup(pid)
+        frame = self.frame[idx]
+        self.frame[idx] = -1
+        self.frame_page[frame] = -1
+        self.resident -= 1
+        return frame
+
+    def pte(self, pid: int) -> Optional[PTE]:
+        """Materializa a entrada de pid como PTE (None se não residente)."""
+        idx = self.lookup(pid)
+        if idx < 0 or self.frame[idx] < 0:
+            return None
+        return PTE(
+            page_id=pid,
+            frame=self.frame[idx],
+            R=self.R[idx],
+            M=self.M[idx],
+            loaded_at=self.loaded_at[idx],
+            last_used=self.last_used[idx],
+        )
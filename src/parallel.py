@@ -0,0 +1,185 @@
+"""
+Execução de benchmark() em paralelo, um processo por execução (frames).
+
+O traço é copiado uma única vez para um segmento de memória compartilhada
+(SharedTrace); cada processo do pool se conecta a ele pelo initializer e
+usa as colunas como memoryviews somente-leitura, sem cópia e sem pickle do
+traço (só o nome do segmento e o tamanho atravessam o processo). Cada tarefa
+recebe só o nº de frames e devolve o RunResult e, com rastreamento, o
+RunTrace.
+"""
+
+import atexit
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core import RunResult, TraceBuffer
+from src.trace import RunTrace
+
+# Descritor de um SharedTrace: (nome do segmento, nº de acessos, há times, há has_t).
+TraceHandle = Tuple[str, int, bool, bool]
+
+
+class SharedTrace:
+    """
+    Cópia de um TraceBuffer num segmento multiprocessing.shared_memory.
+
+    Layout (sem cabeçalho, colunas de 8 bytes primeiro para ficarem
+    alinhadas): pages int64, times int64 (opcional), writes uint8, has_t
+    uint8 (opcional). Use como gerenciador de contexto: o segmento é
+    removido ao sair do bloco, inclusive por exceção (ex.: um worker que
+    morre e quebra o pool). Se o processo pai morrer sem passar por aqui, o
+    resource tracker do multiprocessing remove o segmento.
+    """
+
+    def __init__(self, trace: TraceBuffer):
+        n = len(trace)
+        columns = [trace.pages]
+        if trace.times is not None:
+            columns.append(trace.times)
+        columns.append(trace.writes)
+        if trace.has_t is not None:
+            columns.append(trace.has_t)
+
+        size = sum(memoryview(c).nbytes for c in columns)
+        self._shm: Optional[SharedMemory] = SharedMemory(create=True, size=max(1, size))
+        try:
+            pos = 0
+            for col in columns:
+                raw = memoryview(col).cast("B")
+                self._shm.buf[pos : pos + len(raw)] = raw
+                pos += len(raw)
+        except BaseException:
+            self.close()
+            raise
+        self.handle: TraceHandle = (
+            self._shm.name, n, trace.times is not None, trace.has_t is not None
+        )
+
+    def close(self) -> None:
+        """Libera e remove o segmento (idempotente)."""
+        if self._shm is not None:
+            shm, self._shm = self._shm, None
+            shm.close()
+            shm.unlink()
+
+    def __enter__(self) -> "SharedTrace":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def attach_trace(handle: TraceHandle) -> Tuple[TraceBuffer, SharedMemory]:
+    """
+    Conecta-se a um SharedTrace e devolve um TraceBuffer cujas colunas são
+    views somente-leitura sobre o segmento (numpy_views() as expõe como
+    arrays NumPy, também sem cópia), e o SharedMemory, que deve continuar
+    vivo enquanto o traço for usado.
+
+    Quem se conecta não é dono do segmento e não deve removê-lo. Antes do
+    Python 3.13 (sem track=) o attach também o registra no resource
+    tracker, mas os workers usam o tracker do processo pai, em que o nome já
+    está registrado: nada muda, e o unlink do criador o desregistra.
+    """
+    name, n, has_times, partial = handle
+    try:
+        shm = SharedMemory(name=name, track=False)
+    except TypeError:
+        shm = SharedMemory(name=name)
+
+    view = shm.buf.toreadonly()
+    pos = 0
+
+    def column(width: int, fmt: str):
+        nonlocal pos
+        raw = view[pos : pos + n * width]
+        pos += n * width
+        return raw.cast(fmt)
+
+    pages = column(8, "q")
+    times = column(8, "q") if has_times else None
+    writes = column(1, "B")
+    has_t = column(1, "B") if partial else None
+    return TraceBuffer._from_columns(pages, writes, times, has_t), shm
+
+
+def attach_in_worker(handle: TraceHandle) -> TraceBuffer:
+    """
+    attach_trace() para initializers de pool: na saída do processo as views
+    são liberadas e o mapeamento é fechado (sem isso, o SharedMemory
+    reclama de ponteiros exportados ao ser coletado).
+    """
+    seq, shm = attach_trace(handle)
+
+    def release() -> None:
+        try:
+            for col in (seq.pages, seq.times, seq.writes, seq.has_t):
+                if col is not None:
+                    col.release()
+            shm.close()
+        except BufferError:
+            pass  # alguma view ainda em uso; o SO desfaz o mapeamento na saída
+
+    atexit.register(release)
+    return seq
+
+
+# Estado de cada processo do pool: (algoritmo, traço).
+_worker: Optional[Tuple[Any, TraceBuffer]] = None
+
+
+def resolve_jobs(jobs: Optional[int]) -> int:
+    """jobs=None ou 0 usa todos os núcleos; negativo deixa -jobs-1 livres."""
+    cpus = os.cpu_count() or 1
+    if not jobs:
+        return cpus
+    if jobs < 0:
+        return max(1, cpus + 1 + jobs)
+    return jobs
+
+
+def _init_worker(algo: Any, handle: TraceHandle) -> None:
+    global _worker
+    _worker = (algo, attach_in_worker(handle))
+
+
+def _run_one(frames: int, trace_enabled: bool) -> Tuple[RunResult, Optional[RunTrace]]:
+    algo, seq = _worker
+    algo._trace_enabled = trace_enabled
+    algo._last_trace_by_frames.clear()
+    if trace_enabled:
+        result = algo.run(seq, frames)
+        return result, algo._last_trace_by_frames.pop(frames, None)
+    return algo._run_fast(seq, frames), None
+
+
+def run_frames_parallel(
+    algo: Any,
+    seq: TraceBuffer,
+    frames_list: List[int],
+    *,
+    trace_enabled: bool,
+    jobs: int,
+) -> Tuple[List[RunResult], Dict[int, RunTrace]]:
+    """
+    Executa algo para cada frames de frames_list num ProcessPoolExecutor.
+
+    Os resultados voltam na ordem de frames_list, independentemente da ordem
+    em que terminam; os RunTrace (trace_enabled=True) vêm num dict por frames.
+    """
+    workers = max(1, min(jobs, len(frames_list)))
+    with SharedTrace(seq) as shared, ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(algo, shared.handle)
+    ) as pool:
+        done = list(pool.map(_run_one, frames_list, [trace_enabled] * len(frames_list)))
+
+    results = [result for result, _ in done]
+    traces = {
+        frames: run_trace
+        for frames, (_, run_trace) in zip(frames_list, done)
+        if run_trace is not None
+    }
+    return results, traces
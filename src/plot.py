@@ -9,10 +9,11 @@ def _plot_many(
     title: str,
     save_path: Optional[str] = None,
     show: bool = True,
+    out_dir: str = "results/comparison",
 ):
-    os.makedirs("results/comparison", exist_ok=True)
+    os.makedirs(out_dir, exist_ok=True)
     if save_path:
-        save_path = f"results/comparison/{save_path}"
+        save_path = os.path.join(out_dir, save_path)
 
     fig, ax = plt.subplots(figsize=(16, 6))
 
@@ -75,17 +76,25 @@ def _plot_many(
         plt.close()
 
 
-def plot_faults(benchmarks: List[BenchmarkResult], show: bool = False) -> None:
-    _plot_many(benchmarks, "faults", "Comparação — Faltas de página", "faults", show)
+def plot_faults(
+    benchmarks: List[BenchmarkResult], show: bool = False, out_dir: str = "results/comparison"
+) -> None:
+    _plot_many(benchmarks, "faults", "Comparação — Faltas de página", "faults", show, out_dir)
 
-def plot_hits(benchmarks: List[BenchmarkResult], show: bool = False) -> None:
-    _plot_many(benchmarks, "hits", "Comparação — Acertos de página", "hits", show)
+def plot_hits(
+    benchmarks: List[BenchmarkResult], show: bool = False, out_dir: str = "results/comparison"
+) -> None:
+    _plot_many(benchmarks, "hits", "Comparação — Acertos de página", "hits", show, out_dir)
 
-def plot_fault_rate(benchmarks: List[BenchmarkResult], show: bool = False) -> None:
-    _plot_many(benchmarks, "fault_rate", "Comparação — Taxa de faltas", "fault_rate", show)
+def plot_fault_rate(
+    benchmarks: List[BenchmarkResult], show: bool = False, out_dir: str = "results/comparison"
+) -> None:
+    _plot_many(benchmarks, "fault_rate", "Comparação — Taxa de faltas", "fault_rate", show, out_dir)
 
-def plot_hit_rate(benchmarks: List[BenchmarkResult], show: bool = False) -> None:
-    _plot_many(benchmarks, "hit_rate", "Comparação — Taxa de acertos", "hit_rate", show)
+def plot_hit_rate(
+    benchmarks: List[BenchmarkResult], show: bool = False, out_dir: str = "results/comparison"
+) -> None:
+    _plot_many(benchmarks, "hit_rate", "Comparação — Taxa de acertos", "hit_rate", show, out_dir)
 
 def plot_comparison(benchmarks: List[BenchmarkResult], metric: str = "faults",
                     save_path: Optional[str] = None, show: bool = False) -> None:
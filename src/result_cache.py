@@ -0,0 +1,160 @@
+"""
+Cache em disco de RunResult, endereçado pelo conteúdo.
+
+A chave de cada execução é o hash de:
+  - conteúdo do traço (pages, writes, times e has_t; ver trace_digest)
+  - classe do algoritmo (módulo + nome)
+  - parâmetros do construtor (PageReplacementAlgorithm.config(), ex.:
+    window, bits, refresh_every, reset_interval)
+  - frames
+  - CACHE_VERSION, incrementado quando algum kernel muda de resultado
+
+Cada RunResult vira um arquivo JSON pequeno em <dir>/<k[:2]>/<k>.json,
+gravado de forma atômica (arquivo temporário + os.replace). O tamanho total
+é limitado por max_bytes: quando passa do limite, os arquivos usados há mais
+tempo (mtime, atualizado a cada leitura) são removidos até sobrar ~90%.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.core import RunResult, TraceBuffer
+
+CACHE_VERSION = 1
+DEFAULT_DIR = os.path.join("results", ".cache")
+DEFAULT_MAX_BYTES = 64 << 20
+
+
+def trace_digest(trace: TraceBuffer) -> str:
+    """Hash (BLAKE2b) do conteúdo das colunas do traço."""
+    h = hashlib.blake2b(digest_size=20)
+    h.update(len(trace).to_bytes(8, "little"))
+    columns = ((b"P", trace.pages), (b"W", trace.writes), (b"T", trace.times), (b"H", trace.has_t))
+    for tag, col in columns:
+        if col is not None:
+            h.update(tag)
+            h.update(memoryview(col).cast("B"))
+    return h.hexdigest()
+
+
+def run_key(trace_hash: str, algo: Any, frames: int) -> str:
+    """Chave de uma execução: traço, classe, parâmetros e frames."""
+    cls = type(algo)
+    payload = {
+        "version": CACHE_VERSION,
+        "trace": trace_hash,
+        "algo": f"{cls.__module__}.{cls.__qualname__}",
+        "params": algo.config(),
+        "frames": frames,
+    }
+    raw = json.dumps(payload, sort_keys=True, default=repr).encode()
+    return hashlib.sha256(raw).hexdigest()
+
+
+class ResultCache:
+    """Armazena RunResult por chave (run_key) num diretório local."""
+
+    def __init__(self, directory: str = DEFAULT_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes deve ser > 0")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None  # total em disco, medido no 1º put
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str, algo_name: str) -> Optional[RunResult]:
+        """RunResult guardado em 'key' (com o algo_name atual), ou None."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return RunResult(algo_name=algo_name, **data)
+
+    def put(self, key: str, result: RunResult) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = {
+            "frames": result.frames,
+            "trace_len": result.trace_len,
+            "faults": result.faults,
+            "hits": result.hits,
+            "evictions": result.evictions,
+        }
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        try:
+            replaced = os.path.getsize(path)  # entrada sobrescrita não conta duas vezes
+        except OSError:
+            replaced = 0
+        os.replace(tmp, path)
+
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        else:
+            self._size += os.path.getsize(path) - replaced
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _entries(self) -> Iterator[Tuple[str, int, float]]:
+        """(caminho, tamanho, mtime) de cada resultado guardado."""
+        if not os.path.isdir(self.directory):
+            return
+        for sub in os.scandir(self.directory):
+            if not sub.is_dir():
+                continue
+            for entry in os.scandir(sub.path):
+                if entry.name.endswith(".json"):
+                    st = entry.stat()
+                    yield entry.path, st.st_size, st.st_mtime
+
+    def _evict(self) -> None:
+        """Remove os menos usados até o total ficar em ~90% de max_bytes."""
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 9 // 10
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._size = total
+
+    def clear(self) -> None:
+        for path, _, _ in list(self._entries()):
+            os.remove(path)
+        self._size = 0
+
+    def lookup(
+        self, trace_hash: str, algo: Any, frames_list: List[int]
+    ) -> Tuple[Dict[int, RunResult], Dict[int, str]]:
+        """
+        Consulta todos os frames de uma vez: devolve os RunResult encontrados
+        e as chaves de cada frames (para o put dos que faltarem).
+        """
+        keys = {frames: run_key(trace_hash, algo, frames) for frames in frames_list}
+        found: Dict[int, RunResult] = {}
+        for frames, key in keys.items():
+            r = self.get(key, algo.name)
+            if r is not None:
+                found[frames] = r
+        return found, keys
+
+    def store(self, keys: Dict[int, str], results: List[RunResult]) -> None:
+        for r in results:
+            self.put(keys[r.frames], r)
@@ -0,0 +1,241 @@
+"""
+Curvas de faltas aproximadas por amostragem espacial (SHARDS).
+
+Para traços grandes demais para a simulação exata, cada página é mantida ou
+descartada por inteiro conforme um hash do seu id: entram só as páginas com
+hash < T, uma fração R = T / 2^32 do espaço de páginas (sempre as mesmas
+páginas, então os reacessos de uma página amostrada são preservados). A
+política é simulada só sobre os acessos amostrados:
+
+  - LRU: distâncias de pilha da amostra, escaladas por 1/R (uma passada
+    cobre todos os frames)
+  - demais políticas online: uma simulação em miniatura por frames, com
+    round(F * R) quadros (via PageReplacementAlgorithm.open)
+
+A taxa de faltas estimada é faltas_amostra / acessos_amostrados, e faults é
+essa taxa vezes o tamanho real do traço. A amostra é dividida em grupos por
+outros bits do mesmo hash; a variação entre os grupos dá o erro-padrão da
+estimativa (estimador de razão, método dos grupos aleatórios, com correção
+de população finita).
+
+Dois modos:
+  - rate: taxa fixa R
+  - max_pages: tamanho fixo; uma primeira passada escolhe T para que só as
+    max_pages páginas de menor hash fiquem na amostra (exige um traço que
+    possa ser percorrido duas vezes: TraceBuffer, arquivo mapeado, lista...)
+
+Parâmetros contados em acessos (refresh_every do Aging, reset_interval do
+NRU) valem para o traço amostrado; timestamps ausentes são preenchidos com a
+posição do acesso no traço completo.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.algorithms.LRU import LRU, StackDistances
+from src.algorithms.baseAlgorithm import PageReplacementAlgorithm
+from src.core import Access, BenchmarkResult, RunResult, TraceBuffer, iter_chunks
+from src.trace_file import numpy_views
+
+HASH_BITS = 32
+_SPACE = 1 << HASH_BITS
+
+
+@dataclass(frozen=True)
+class EstimatedRunResult(RunResult):
+    """
+    RunResult estimado por amostragem. Os campos herdados são as estimativas
+    (já na escala do traço completo); faults_stderr é o erro-padrão de faults.
+    """
+
+    sample_rate: float = 1.0
+    sampled: int = 0
+    faults_stderr: float = 0.0
+
+    def fault_rate_bounds(self, z: float = 1.96) -> Tuple[float, float]:
+        """Intervalo da taxa de faltas (z=1.96: ~95%), limitado a [0, 1]."""
+        if not self.trace_len:
+            return 0.0, 0.0
+        half = z * self.faults_stderr / self.trace_len
+        return max(0.0, self.fault_rate - half), min(1.0, self.fault_rate + half)
+
+
+def page_hash(pages: np.ndarray, seed: int = 0) -> np.ndarray:
+    """
+    Hash de 64 bits (finalizador do splitmix64) de cada page id. Os 32 bits
+    altos decidem a amostragem e os baixos, o grupo.
+    """
+    with np.errstate(over="ignore"):
+        z = pages.astype(np.uint64) + np.uint64((0x9E3779B97F4A7C15 * (seed + 1)) & (2**64 - 1))
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def threshold_for_size(chunks: Iterable[TraceBuffer], max_pages: int, seed: int = 0) -> int:
+    """
+    Limiar T que deixa na amostra só as max_pages páginas de menor hash
+    (bottom-k). Memória O(max_pages); devolve 2^32 se o traço tem menos
+    páginas que isso.
+    """
+    if max_pages < 1:
+        raise ValueError("max_pages deve ser >= 1")
+    best = np.empty(0, dtype=np.uint64)
+    pending: List[np.ndarray] = []
+    pending_size = 0
+    cut = _SPACE
+
+    def merge() -> None:
+        nonlocal best, cut, pending_size
+        best = np.unique(np.concatenate([best, *pending]))[:max_pages]
+        pending.clear()
+        pending_size = 0
+        if best.size >= max_pages:
+            cut = int(best[-1]) + 1
+
+    for chunk in chunks:
+        h = page_hash(numpy_views(chunk)["pages"], seed) >> np.uint64(HASH_BITS)
+        h = h[h < cut]
+        if h.size:
+            pending.append(h)
+            pending_size += h.size
+            if pending_size >= max_pages:
+                merge()
+    if pending:
+        merge()
+    return cut if best.size >= max_pages else _SPACE
+
+
+def shards_benchmark(
+    algo: PageReplacementAlgorithm,
+    source: Union[TraceBuffer, Iterable[Access], Iterable[TraceBuffer]],
+    frames_list: List[int],
+    *,
+    rate: Optional[float] = None,
+    max_pages: Optional[int] = None,
+    seed: int = 0,
+    groups: int = 16,
+    chunk_size: int = 1 << 20,
+    label: Optional[str] = None,
+) -> BenchmarkResult:
+    """
+    Curva de faltas aproximada de 'algo' (online) em uma passada pelo traço.
+
+    Informe rate (taxa de amostragem fixa, em (0, 1]) ou max_pages (tamanho
+    fixo da amostra). Devolve um BenchmarkResult de EstimatedRunResult, com
+    algo_name = label (padrão: "<nome> (SHARDS)"), que reports e plot usam
+    como qualquer outro.
+    """
+    if (rate is None) == (max_pages is None):
+        raise ValueError("Informe rate ou max_pages (exatamente um).")
+    if not frames_list:
+        raise ValueError("frames_list não pode ser vazia.")
+    for frames in frames_list:
+        if frames <= 0:
+            raise ValueError("frames deve ser > 0")
+    if groups < 2:
+        raise ValueError("groups deve ser >= 2")
+
+    if rate is not None:
+        if not (0.0 < rate <= 1.0):
+            raise ValueError("rate deve estar em (0.0, 1.0].")
+        threshold = max(1, min(_SPACE, round(rate * _SPACE)))
+    else:
+        if iter(source) is source:
+            raise ValueError("max_pages exige um traço que possa ser percorrido duas vezes.")
+        threshold = threshold_for_size(iter_chunks(source, chunk_size), max_pages, seed)
+    sample_rate = threshold / _SPACE
+
+    # Por grupo: acessos amostrados e faltas (uma lista por frames).
+    sampled = [0] * groups
+    faults: List[List[int]] = [[0] * groups for _ in frames_list]
+    stack: Optional[StackDistances] = None
+    hist: List[List[int]] = []
+    sims = []
+    seen = set()
+    if isinstance(algo, LRU):
+        stack = StackDistances()
+        hist = [[0] for _ in range(groups)]
+    else:
+        sims = [algo.open(max(1, round(frames * sample_rate))) for frames in frames_list]
+
+    trace_len = 0
+    for chunk in iter_chunks(source, chunk_size):
+        cols = numpy_views(chunk)
+        base = trace_len
+        trace_len += len(chunk)
+        mixed = page_hash(cols["pages"], seed)
+        if threshold < _SPACE:
+            idx = ((mixed >> np.uint64(HASH_BITS)) < np.uint64(threshold)).nonzero()[0]
+            if not idx.size:
+                continue
+            mixed = mixed[idx]
+        else:
+            idx = np.arange(len(chunk))
+        pages = cols["pages"][idx].tolist()
+        group_of = ((mixed & np.uint64(_SPACE - 1)) % np.uint64(groups)).tolist()
+
+        if stack is not None:
+            access = stack.access
+            for pid, g in zip(pages, group_of):
+                sampled[g] += 1
+                d = access(pid)
+                if d:
+                    h = hist[g]
+                    if d >= len(h):
+                        h.extend([0] * (d + 1 - len(h)))
+                    h[d] += 1
+            continue
+
+        writes = cols["writes"][idx].tolist()
+        times = idx + base
+        if "times" in cols:
+            t_col = cols["times"][idx]
+            times = np.where(cols["has_t"][idx] != 0, t_col, times) if "has_t" in cols else t_col
+        seen.update(pages)
+        for pid, write, t, g in zip(pages, writes, times.tolist(), group_of):
+            sampled[g] += 1
+            for j, sim in enumerate(sims):
+                hit, _ = sim.access(pid, write, t)
+                if not hit:
+                    faults[j][g] += 1
+
+    total = sum(sampled)
+    if not total:
+        raise ValueError("Nenhum acesso amostrado; aumente rate ou max_pages.")
+
+    if stack is not None:
+        distinct = len(stack.last)
+        for j, frames in enumerate(frames_list):
+            reach = math.floor(frames * sample_rate + 1e-9)
+            for g in range(groups):
+                faults[j][g] = sampled[g] - sum(hist[g][1 : reach + 1])
+    else:
+        distinct = len(seen)
+    distinct_est = round(distinct / sample_rate)
+
+    results: List[RunResult] = []
+    name = label or f"{algo.name} (SHARDS)"
+    for frames, per_group in zip(frames_list, faults):
+        ratio = sum(per_group) / total
+        spread = sum((f - ratio * n) ** 2 for f, n in zip(per_group, sampled))
+        # (1 - R): correção de população finita (R = 1 é a simulação exata).
+        stderr = math.sqrt((1 - sample_rate) * groups / (groups - 1) * spread) / total
+        est_faults = round(ratio * trace_len)
+        results.append(
+            EstimatedRunResult(
+                algo_name=name,
+                frames=frames,
+                trace_len=trace_len,
+                faults=est_faults,
+                hits=trace_len - est_faults,
+                evictions=max(0, est_faults - min(frames, distinct_est)),
+                sample_rate=sample_rate,
+                sampled=total,
+                faults_stderr=stderr * trace_len,
+            )
+        )
+    return BenchmarkResult(algo_name=name, results=results)
@@ -0,0 +1,408 @@
+"""
+Suíte de benchmarks: algoritmos x parâmetros x traços x frames numa
+grade declarativa, executada por um pool de processos.
+
+Cada combinação (algoritmo configurado, traço, frames) vira uma tarefa;
+algoritmos com varredura de uma passada (LRU, Ótimo) viram uma tarefa por
+traço, com todos os frames, quando a varredura custa menos que as execuções
+separadas (_sweep_runs). As tarefas são enviadas da mais cara para a mais
+barata (relative_cost x tamanho do traço x log dos frames, vezes o custo da
+varredura), para que o Ótimo e os F grandes não fiquem para o fim. Os
+RunResult chegam conforme terminam; quando um traço fica completo, seus CSVs
+(reports) e gráficos (plot) são gerados na hora. Os traços chegam aos
+processos por memória compartilhada (src.parallel.SharedTrace), sem cópia
+por processo.
+
+Uso pela linha de comando (ver python -m src.suite --help):
+
+    python -m src.suite \\
+        --algo Fifo --algo LRU --algo "WSClock:window=4,8,16" --algo Optimal \\
+        --trace "zipf:num_pages=1000:trace_length=200000:seed=1" \\
+        --trace "prt:path=traces/gcc.prt" --frames 50,100,200 --jobs 8
+"""
+
+import argparse
+import ast
+import itertools
+import math
+import os
+import re
+from contextlib import ExitStack
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type, Union
+
+import numpy as np
+
+from src import tracegen
+from src.algorithms.Aging import Aging
+from src.algorithms.LRU import LRU
+from src.algorithms.NFU import NFU
+from src.algorithms.Optimal import Optimal
+from src.algorithms.baseAlgorithm import PageReplacementAlgorithm
+from src.algorithms.clock import Clock
+from src.algorithms.fifo import Fifo
+from src.algorithms.nru import NRU
+from src.algorithms.second_chance import SecondChance
+from src.algorithms.working_set import WorkingSet
+from src.algorithms.wsclock import WSClock
+from src.core import Access, BenchmarkResult, RunResult, TraceBuffer, auto_frames_list
+from src.parallel import SharedTrace, TraceHandle, attach_in_worker, resolve_jobs
+from src.plot import plot_fault_rate, plot_faults, plot_hit_rate, plot_hits
+from src.reports import export_benchmark_csv
+from src.result_cache import ResultCache, trace_digest
+from src.trace_file import read_trace
+from src.trace_import import READERS
+
+ALGORITHMS: Dict[str, Type[PageReplacementAlgorithm]] = {
+    cls.__name__: cls
+    for cls in (Fifo, SecondChance, Clock, NRU, LRU, NFU, Aging, WorkingSet, WSClock, Optimal)
+}
+
+GENERATORS: Dict[str, Callable[..., Tuple[TraceBuffer, List[int]]]] = {
+    "locality": tracegen.locality_trace,
+    "random": tracegen.random_trace,
+    "zipf": tracegen.zipf_trace,
+    "scan": tracegen.scan_trace,
+    "loop": tracegen.loop_trace,
+}
+
+
+@dataclass(frozen=True)
+class AlgoSpec:
+    """Um algoritmo configurado: classe, parâmetros do construtor e rótulo."""
+
+    cls: Type[PageReplacementAlgorithm]
+    params: Tuple[Tuple[str, Any], ...] = ()
+    label: Optional[str] = None
+
+    def build(self) -> PageReplacementAlgorithm:
+        algo = self.cls(**dict(self.params))
+        if self.label is not None:
+            algo.name = self.label
+        return algo
+
+
+@dataclass
+class TraceSpec:
+    """Um traço da suíte, já normalizado, e os frames a simular nele."""
+
+    name: str
+    trace: TraceBuffer
+    frames_list: List[int] = field(default_factory=list)
+    distinct: int = 0
+
+
+@dataclass(frozen=True)
+class _Task:
+    algo_idx: int
+    trace_idx: int
+    frames: Tuple[int, ...]
+    cost: float
+
+
+# Traços de cada processo do pool (views sobre os SharedTrace da suíte).
+_worker_traces: List[TraceBuffer] = []
+
+
+def _init_worker(handles: List[TraceHandle]) -> None:
+    global _worker_traces
+    _worker_traces = [attach_in_worker(handle) for handle in handles]
+
+
+def _execute(spec: AlgoSpec, seq: TraceBuffer, frames: Sequence[int]) -> List[RunResult]:
+    algo = spec.build()
+    if len(frames) > 1:
+        return algo._run_sweep(seq, list(frames))
+    return [algo._run_fast(seq, frames[0])]
+
+
+def _execute_in_worker(spec: AlgoSpec, trace_idx: int, frames: Sequence[int]) -> List[RunResult]:
+    return _execute(spec, _worker_traces[trace_idx], frames)
+
+
+def _concat(chunks: Iterable[TraceBuffer]) -> TraceBuffer:
+    """Junta os blocos de um importador num único TraceBuffer (sem timestamps)."""
+    pages = [np.empty(0, dtype=np.int64)]
+    writes = [np.empty(0, dtype=np.uint8)]
+    for chunk in chunks:
+        pages.append(np.frombuffer(chunk.pages, dtype=np.int64))
+        writes.append(np.frombuffer(chunk.writes, dtype=np.uint8))
+    return TraceBuffer.from_arrays(np.concatenate(pages), np.concatenate(writes))
+
+
+class BenchmarkSuite:
+    """
+    Grade declarativa de benchmarks (só contagem, sem RunTrace).
+
+        suite = BenchmarkSuite(jobs=8)
+        suite.add_algorithm(Fifo)
+        suite.add_algorithm(WSClock, window=[4, 8, 16])   # 3 configurações
+        suite.add_algorithm(Aging, bits=[8, 16])
+        suite.add_trace("zipf", *zipf_trace(10_000, 10**6, seed=1))
+        results = suite.run(out_dir="results/suite")
+
+    Parâmetros passados como lista (ou tupla) formam o produto cartesiano.
+    Com cache (ResultCache), só as execuções que não estão no cache viram
+    tarefas, e as novas são guardadas conforme terminam. run() devolve, por
+    nome de traço, um BenchmarkResult por algoritmo configurado, na ordem em
+    que foram adicionados.
+    """
+
+    def __init__(self, *, jobs: Optional[int] = 1, cache: Optional[ResultCache] = None):
+        self.jobs = jobs
+        self.cache = cache
+        self.algorithms: List[AlgoSpec] = []
+        self.traces: List[TraceSpec] = []
+
+    def add_algorithm(
+        self, cls: Type[PageReplacementAlgorithm], *, label: Optional[str] = None, **params: Any
+    ) -> List[AlgoSpec]:
+        """Adiciona cls com cada combinação de params; devolve as configurações criadas."""
+        keys = list(params)
+        grids = [v if isinstance(v, (list, tuple)) else [v] for v in params.values()]
+        combos = [dict(zip(keys, values)) for values in itertools.product(*grids)]
+        if label is not None and len(combos) > 1:
+            raise ValueError("label só pode ser usado com uma única configuração.")
+
+        added: List[AlgoSpec] = []
+        for combo in combos:
+            algo = cls(**combo)  # valida os parâmetros já aqui, não no worker
+            if label is None and combo:
+                label_for = f"{algo.name}({', '.join(f'{k}={v}' for k, v in combo.items())})"
+            else:
+                label_for = label
+            added.append(AlgoSpec(cls, tuple(combo.items()), label_for))
+        self.algorithms.extend(added)
+        return added
+
+    def add_trace(
+        self,
+        name: str,
+        trace: Union[TraceBuffer, Iterable[Access]],
+        frames_list: Optional[Iterable[int]] = None,
+    ) -> TraceSpec:
+        """Adiciona um traço; sem frames_list, usa ~5 valores pelo nº de páginas distintas."""
+        if any(t.name == name for t in self.traces):
+            raise ValueError(f"Traço duplicado: {name!r}")
+        seq = TraceBuffer.from_accesses(trace)
+        distinct = int(np.unique(np.frombuffer(seq.pages, dtype=np.int64)).size)
+        if frames_list is None:
+            frames_list = auto_frames_list(max(1, distinct))
+        frames_list = list(frames_list)
+        if not frames_list or min(frames_list) <= 0:
+            raise ValueError("frames deve ser > 0")
+        spec = TraceSpec(name, seq, frames_list, distinct)
+        self.traces.append(spec)
+        return spec
+
+    def tasks(
+        self, done: Optional[Dict[Tuple[int, int], Dict[int, RunResult]]] = None
+    ) -> List[_Task]:
+        """
+        Tarefas da grade, da mais cara para a mais barata; done[(algoritmo,
+        traço)] lista os frames que já têm resultado e ficam de fora.
+        """
+        out: List[_Task] = []
+        for ai, spec in enumerate(self.algorithms):
+            for ti, tr in enumerate(self.traces):
+                n = max(1, len(tr.trace))
+                skip = done.get((ai, ti), {}) if done else {}
+                todo = [f for f in dict.fromkeys(tr.frames_list) if f not in skip]
+                if not todo:
+                    continue
+                if spec.cls._use_sweep(len(todo), lambda: tr.distinct):
+                    groups = [tuple(todo)]
+                    runs = spec.cls._sweep_runs(lambda: tr.distinct)
+                else:
+                    groups = [(f,) for f in todo]
+                    runs = 1.0
+                for frames in groups:
+                    cost = spec.cls.relative_cost * n * math.log2(2 + max(frames)) * runs
+                    out.append(_Task(ai, ti, frames, cost))
+        out.sort(key=lambda t: -t.cost)
+        return out
+
+    def run(
+        self,
+        *,
+        out_dir: Optional[str] = None,
+        plots: bool = True,
+        on_result: Optional[Callable[[str, RunResult], None]] = None,
+    ) -> Dict[str, List[BenchmarkResult]]:
+        """
+        Executa a grade inteira.
+
+        on_result(nome_do_traço, RunResult) é chamado a cada execução
+        concluída, na ordem de término. Com out_dir, cada traço completo é
+        exportado em out_dir/<traço>/ (CSVs de reports e, se plots=True, os
+        gráficos de comparação).
+        """
+        if not self.algorithms or not self.traces:
+            raise ValueError("A suíte precisa de ao menos um algoritmo e um traço.")
+
+        found: Dict[Tuple[int, int], Dict[int, RunResult]] = {}
+        keys: Dict[Tuple[int, int], Dict[int, str]] = {}
+        if self.cache is not None:
+            hashes = [trace_digest(t.trace) for t in self.traces]
+            for ai, spec in enumerate(self.algorithms):
+                algo = spec.build()
+                for ti, tr in enumerate(self.traces):
+                    found[(ai, ti)], keys[(ai, ti)] = self.cache.lookup(
+                        hashes[ti], algo, tr.frames_list
+                    )
+                    if on_result is not None:
+                        for r in found[(ai, ti)].values():
+                            on_result(tr.name, r)
+
+        tasks = self.tasks(found)
+        pending = [0] * len(self.traces)
+        for task in tasks:
+            pending[task.trace_idx] += 1
+        out: Dict[str, List[BenchmarkResult]] = {}
+        for ti, tr in enumerate(self.traces):
+            if pending[ti] == 0:
+                out[tr.name] = self._finish_trace(ti, found, out_dir, plots)
+
+        def collect(task: _Task, results: List[RunResult]) -> None:
+            tr = self.traces[task.trace_idx]
+            pair = (task.algo_idx, task.trace_idx)
+            if self.cache is not None:
+                self.cache.store(keys[pair], results)
+            by_frames = found.setdefault(pair, {})
+            for r in results:
+                by_frames[r.frames] = r
+                if on_result is not None:
+                    on_result(tr.name, r)
+            pending[task.trace_idx] -= 1
+            if pending[task.trace_idx] == 0:
+                out[tr.name] = self._finish_trace(task.trace_idx, found, out_dir, plots)
+
+        jobs = min(resolve_jobs(self.jobs), len(tasks))
+        if jobs <= 1:
+            for task in tasks:
+                spec = self.algorithms[task.algo_idx]
+                collect(task, _execute(spec, self.traces[task.trace_idx].trace, task.frames))
+        else:
+            with ExitStack() as stack:
+                handles = [stack.enter_context(SharedTrace(t.trace)).handle for t in self.traces]
+                pool = stack.enter_context(
+                    ProcessPoolExecutor(
+                        max_workers=jobs, initializer=_init_worker, initargs=(handles,)
+                    )
+                )
+                running: Dict[Future, _Task] = {
+                    pool.submit(
+                        _execute_in_worker, self.algorithms[t.algo_idx], t.trace_idx, t.frames
+                    ): t
+                    for t in tasks
+                }
+                while running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        collect(running.pop(fut), fut.result())
+
+        return {t.name: out[t.name] for t in self.traces}
+
+    def _finish_trace(
+        self,
+        trace_idx: int,
+        found: Dict[Tuple[int, int], Dict[int, RunResult]],
+        out_dir: Optional[str],
+        plots: bool,
+    ) -> List[BenchmarkResult]:
+        tr = self.traces[trace_idx]
+        benchmarks = []
+        for ai, spec in enumerate(self.algorithms):
+            by_frames = found[(ai, trace_idx)]
+            results = [by_frames[f] for f in tr.frames_list]
+            benchmarks.append(BenchmarkResult(algo_name=results[0].algo_name, results=results))
+
+        if out_dir is not None:
+            trace_dir = os.path.join(out_dir, re.sub(r"[^\w.=-]+", "_", tr.name))
+            export_benchmark_csv(benchmarks, out_dir=trace_dir)
+            if plots:
+                for plot in (plot_faults, plot_hits, plot_fault_rate, plot_hit_rate):
+                    plot(benchmarks, out_dir=trace_dir)
+        return benchmarks
+
+
+# Linha de comando
+# ============================================================
+
+def _parse_spec(text: str) -> Tuple[str, Dict[str, Any]]:
+    """'nome:chave=v1,v2:outra=v' -> ('nome', {'chave': [v1, v2], 'outra': v})."""
+    head, *items = text.split(":")
+    params: Dict[str, Any] = {}
+    for item in items:
+        key, sep, raw = item.partition("=")
+        if not sep or not key:
+            raise ValueError(f"Parâmetro inválido em {text!r}: {item!r} (use chave=valor)")
+        values = [_literal(v) for v in raw.split(",")]
+        params[key] = values if len(values) > 1 else values[0]
+    return head, params
+
+
+def _literal(raw: str) -> Any:
+    try:
+        return ast.literal_eval(raw)
+    except (ValueError, SyntaxError):
+        return raw
+
+
+def _load_trace(kind: str, params: Dict[str, Any]) -> Tuple[TraceBuffer, Optional[List[int]]]:
+    if kind in GENERATORS:
+        return GENERATORS[kind](**params)
+    if kind == "prt":
+        return read_trace(params.pop("path")), None
+    if kind in READERS:
+        return _concat(READERS[kind](str(params.pop("path")), **params)), None
+    kinds = ", ".join([*GENERATORS, "prt", *READERS])
+    raise ValueError(f"Tipo de traço inválido: {kind!r}. Use {kinds}.")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> Dict[str, List[BenchmarkResult]]:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.suite",
+        description="Executa algoritmos x parâmetros x traços x frames em paralelo.",
+    )
+    parser.add_argument(
+        "--algo", action="append", required=True,
+        help=f"Classe[:param=v1,v2...], uma de: {', '.join(ALGORITHMS)}",
+    )
+    parser.add_argument(
+        "--trace", action="append", required=True,
+        help=f"tipo[:param=valor...], tipo em: {', '.join([*GENERATORS, 'prt', *READERS])} "
+        "(arquivos com path=...)",
+    )
+    parser.add_argument("--frames", help="Lista de frames (ex.: 8,16,32); padrão: a de cada traço")
+    parser.add_argument("--jobs", type=int, default=0, help="Processos (0 = todos os núcleos)")
+    parser.add_argument("--out", default="results/suite", help="Diretório de saída")
+    parser.add_argument("--no-plots", action="store_true", help="Só exporta os CSVs")
+    parser.add_argument(
+        "--cache", metavar="DIR", help="Cache de resultados em disco (reaproveita execuções)"
+    )
+    args = parser.parse_args(argv)
+
+    cache = ResultCache(args.cache) if args.cache else None
+    suite = BenchmarkSuite(jobs=args.jobs, cache=cache)
+    for text in args.algo:
+        name, params = _parse_spec(text)
+        if name not in ALGORITHMS:
+            parser.error(f"Algoritmo desconhecido: {name!r}. Use {', '.join(ALGORITHMS)}.")
+        suite.add_algorithm(ALGORITHMS[name], **params)
+
+    frames = [int(f) for f in args.frames.split(",")] if args.frames else None
+    for text in args.trace:
+        kind, params = _parse_spec(text)
+        trace, frames_list = _load_trace(kind, params)
+        suite.add_trace(text, trace, frames or frames_list)
+
+    def progress(trace_name: str, r: RunResult) -> None:
+        print(f"[{trace_name}] {r.algo_name} F={r.frames}: faults={r.faults} hits={r.hits}")
+
+    return suite.run(out_dir=args.out, plots=not args.no_plots, on_result=progress)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Formato binário de traço (.prt), pensado para ser mapeado em memória.
+
+Cabeçalho (24 bytes, little-endian):
+  magic   8s   b"PRTRACE\\0"
+  version u32  1
+  flags   u32  bit 0: há timestamps; bit 1: timestamps parciais (há máscara)
+  count   u64  nº de acessos
+
+Seguem colunas de largura fixa, na ordem (as de 8 bytes primeiro, para que
+todas fiquem alinhadas sem preenchimento):
+  pages   int64[count]
+  times   int64[count]   (se flags & 1)
+  writes  uint8[count]
+  has_t   uint8[count]   (se flags & 2)
+
+Cada acesso é o registro (pages[i], writes[i], times[i]); guardar os campos em
+colunas permite que o leitor entregue views direto sobre o mmap, sem cópia.
+"""
+
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from contextlib import ExitStack
+from typing import Dict, Iterable, Union
+
+import numpy as np
+
+from src.core import Access, TraceBuffer, iter_chunks
+
+
+MAGIC = b"PRTRACE\0"
+VERSION = 1
+FLAG_TIMES = 1
+FLAG_PARTIAL_T = 2
+
+_HEADER = struct.Struct("<8sIIQ")
+_NATIVE_LE = sys.byteorder == "little"
+
+
+def _as_le_bytes(col) -> Union[bytes, memoryview]:
+    """Bytes little-endian de uma coluna int64 (cópia só em máquinas big-endian)."""
+    if _NATIVE_LE:
+        return memoryview(col).cast("B")
+    swapped = array("q", col)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+def write_trace(
+    path: str,
+    trace: Union[TraceBuffer, Iterable[Access], Iterable[TraceBuffer]],
+    *,
+    chunk_size: int = 1 << 20,
+) -> int:
+    """
+    Grava o traço em 'path' no formato .prt e devolve o nº de acessos.
+
+    Aceita um TraceBuffer (gravado coluna a coluna, sem conversão), um
+    iterável de blocos TraceBuffer (importadores de src.trace_import,
+    geradores de src.tracegen) ou qualquer sequência de Access. O traço é
+    percorrido uma vez, em blocos (ver iter_chunks), sem ser carregado
+    inteiro: as páginas vão direto para o arquivo, as demais colunas para
+    arquivos temporários no mesmo diretório, anexados no fim, quando o
+    cabeçalho recebe o nº de acessos e as flags.
+    """
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+
+    n = 0
+    timed = 0
+    with open(path, "wb") as f, ExitStack() as stack:
+
+        def spool():
+            return stack.enter_context(tempfile.TemporaryFile(dir=d or None))
+
+        writes_f = spool()
+        has_t_f = spool()
+        times_f = None
+
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, 0))
+        for chunk in iter_chunks(trace, chunk_size):
+            size = len(chunk)
+            f.write(_as_le_bytes(chunk.pages))
+            writes_f.write(memoryview(chunk.writes).cast("B"))
+            if chunk.times is None:
+                has_t_f.write(bytes(size))
+            else:
+                if times_f is None:
+                    # Acessos anteriores sem t: zeros (arquivo esparso).
+                    times_f = spool()
+                    times_f.truncate(n * 8)
+                    times_f.seek(n * 8)
+                if chunk.has_t is None:
+                    mask: Union[bytes, memoryview] = b"\x01" * size
+                    timed += size
+                else:
+                    mask = memoryview(chunk.has_t).cast("B")
+                    timed += int(np.count_nonzero(np.frombuffer(mask, dtype=np.uint8)))
+                has_t_f.write(mask)
+            if times_f is not None:
+                if chunk.times is None:
+                    times_f.write(bytes(size * 8))
+                else:
+                    times_f.write(_as_le_bytes(chunk.times))
+            n += size
+
+        flags = 0
+        if timed:
+            flags |= FLAG_TIMES
+            times_f.seek(0)
+            shutil.copyfileobj(times_f, f)
+        writes_f.seek(0)
+        shutil.copyfileobj(writes_f, f)
+        if timed and timed < n:
+            flags |= FLAG_PARTIAL_T
+            has_t_f.seek(0)
+            shutil.copyfileobj(has_t_f, f)
+
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, VERSION, flags, n))
+    return n
+
+
+def read_trace(path: str) -> TraceBuffer:
+    """
+    Abre um arquivo .prt e devolve um TraceBuffer cujas colunas são views
+    somente-leitura sobre o arquivo mapeado em memória (nada é copiado nem
+    reinterpretado; as páginas só são lidas do disco quando acessadas).
+
+    O mapeamento fica vivo enquanto o TraceBuffer (ou alguma view) existir.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < _HEADER.size:
+            raise ValueError(f"Arquivo de traço truncado: {path}")
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, flags, n = _HEADER.unpack_from(mm, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Não é um arquivo de traço .prt: {path}")
+    if version != VERSION:
+        raise ValueError(f"Versão de traço não suportada: {version}")
+
+    has_times = bool(flags & FLAG_TIMES)
+    partial = bool(flags & FLAG_PARTIAL_T)
+    expected = _HEADER.size + n * (8 + (8 if has_times else 0) + 1 + (1 if partial else 0))
+    if size != expected:
+        raise ValueError(f"Tamanho inesperado para {n} acessos: {size} != {expected}")
+
+    view = memoryview(mm)
+    pos = _HEADER.size
+
+    def column(width: int, fmt: str):
+        nonlocal pos
+        raw = view[pos : pos + n * width]
+        pos += n * width
+        if fmt == "q" and not _NATIVE_LE:
+            col = array("q", raw.tobytes())
+            col.byteswap()
+            return col
+        return raw.cast(fmt)
+
+    pages = column(8, "q")
+    times = column(8, "q") if has_times else None
+    writes = column(1, "B")
+    has_t = column(1, "B") if partial else None
+    return TraceBuffer._from_columns(pages, writes, times, has_t)
+
+
+def numpy_views(trace: TraceBuffer) -> Dict[str, np.ndarray]:
+    """
+    Views NumPy (sem cópia) das colunas: 'pages' e 'writes' sempre, 'times'
+    e 'has_t' quando existem.
+    """
+    out = {
+        "pages": np.frombuffer(trace.pages, dtype=np.int64),
+        "writes": np.frombuffer(trace.writes, dtype=np.uint8),
+    }
+    if trace.times is not None:
+        out["times"] = np.frombuffer(trace.times, dtype=np.int64)
+    if trace.has_t is not None:
+        out["has_t"] = np.frombuffer(trace.has_t, dtype=np.uint8)
+    return out
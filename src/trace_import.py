@@ -0,0 +1,281 @@
+"""
+Importadores de traços reais de referências à memória.
+
+Formatos suportados (arquivos texto, opcionalmente .gz):
+  - Valgrind lackey (--trace-mem=yes): "I  0400d7d4,8", " L 04222cac,8",
+    " S ...", " M ..." (M = leitura seguida de escrita: um acesso com write)
+  - Dinero "din": "<rótulo> <endereço hex>", rótulo 0 = leitura, 1 = escrita,
+    2 = busca de instrução; 3 e 4 (escapes) são ignorados
+  - um endereço hexadecimal por linha (com ou sem 0x), opcionalmente seguido
+    de R/W
+
+Endereços em bytes viram page ids por page_size. O arquivo é lido em blocos
+de block_bytes e cada bloco é reconhecido de uma vez com operações NumPy
+sobre os bytes (campos, linhas e dígitos hexadecimais), sem passar linha a
+linha pelo interpretador. Cada função
+devolve um iterador de TraceBuffer (um por bloco, sem timestamps), pronto
+para PageReplacementAlgorithm.stream(), ou para to_accesses() quando se
+quer List[Access].
+"""
+
+import gzip
+from array import array
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from src.core import TraceBuffer
+
+DEFAULT_BLOCK_BYTES = 256 << 10  # cabe no cache; blocos maiores ficam mais lentos
+MAX_HEX_DIGITS = 16
+
+# Separadores de campo: espaço, tab, fim de linha e vírgula (lackey: "addr,size").
+_SEP = np.zeros(256, dtype=bool)
+_SEP[list(b" \t\r\n,")] = True
+
+# Valor de cada dígito hexadecimal; 255 = caractere inválido.
+_HEX = np.full(256, 255, dtype=np.uint8)
+for _i, _c in enumerate(b"0123456789abcdef"):
+    _HEX[_c] = _i
+for _i, _c in enumerate(b"ABCDEF"):
+    _HEX[_c] = 10 + _i
+
+# Rótulo de cada formato -> (mantém o acesso, é escrita).
+KindTable = Dict[bytes, Tuple[bool, bool]]
+
+_LACKEY: KindTable = {b"I": (True, False), b"L": (True, False), b"S": (True, True), b"M": (True, True)}
+_DINERO: KindTable = {
+    b"0": (True, False),
+    b"1": (True, True),
+    b"2": (True, False),
+    b"3": (False, False),
+    b"4": (False, False),
+}
+_RW: KindTable = {b"R": (True, False), b"r": (True, False), b"W": (True, True), b"w": (True, True)}
+
+
+def _kind_luts(table: KindTable) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Tabelas por byte: rótulo válido, acesso mantido, escrita."""
+    valid = np.zeros(256, dtype=bool)
+    keep = np.zeros(256, dtype=bool)
+    write = np.zeros(256, dtype=bool)
+    for label, (k, w) in table.items():
+        valid[label[0]] = True
+        keep[label[0]] = k
+        write[label[0]] = w
+    return valid, keep, write
+
+
+def _open(path: str) -> BinaryIO:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def _blocks(path: str, block_bytes: int) -> Iterator[bytes]:
+    """Blocos do arquivo terminados em fim de linha (a sobra vai para o próximo)."""
+    rest = b""
+    with _open(path) as f:
+        while True:
+            data = f.read(block_bytes)
+            if not data:
+                break
+            data = rest + data
+            cut = data.rfind(b"\n") + 1
+            if cut == 0:
+                rest = data
+                continue
+            rest = data[cut:]
+            yield data[:cut]
+    if rest:
+        yield rest + b"\n"
+
+
+def _parse_block(
+    block: bytes,
+    addr_col: int,
+    kind_col: Optional[int],
+    kinds: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+    kind_required: bool,
+    page_size: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reconhece um bloco inteiro com operações vetorizadas e devolve
+    (page ids int64, escrita uint8) das linhas válidas, na ordem do arquivo.
+
+    Os campos são delimitados pela tabela _SEP; cada campo recebe o nº da
+    linha e a coluna dentro dela. Linhas sem endereço hexadecimal válido na
+    coluna addr_col, ou com rótulo inválido na coluna kind_col, são
+    ignoradas (comentários, cabeçalhos, mensagens do Valgrind etc.).
+    """
+    a = np.frombuffer(block, dtype=np.uint8)
+    sep = _SEP[a]
+    field = ~sep
+
+    # Início/fim de campo: transições separador <-> não separador.
+    first = field.copy()
+    first[1:] &= sep[:-1]
+    starts = np.flatnonzero(first)
+    after = field.copy()
+    after[:-1] &= sep[1:]
+    ends = np.flatnonzero(after) + 1
+    if not len(starts):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint8)
+
+    newlines = np.flatnonzero(a == 10)
+    tok_line = np.searchsorted(newlines, starts)
+    new_line = np.empty(len(starts), dtype=bool)
+    new_line[0] = True
+    np.not_equal(tok_line[1:], tok_line[:-1], out=new_line[1:])
+    first_idx = np.maximum.accumulate(np.where(new_line, np.arange(len(starts)), 0))
+    tok_col = np.arange(len(starts)) - first_idx
+    nlines = int(tok_line[-1]) + 1
+
+    # Endereço: campo da coluna addr_col, com prefixo 0x opcional.
+    addr_tok = np.flatnonzero(tok_col == addr_col)
+    a_start = starts[addr_tok]
+    a_end = ends[addr_tok]
+    padded = np.concatenate((a, np.zeros(2, dtype=np.uint8)))
+    prefixed = (
+        (a_end - a_start > 2)
+        & (padded[a_start] == ord("0"))
+        & ((padded[a_start + 1] | 0x20) == ord("x"))
+    )
+    a_start = a_start + 2 * prefixed
+    length = a_end - a_start
+    ok = length <= MAX_HEX_DIGITS
+
+    # Horner sobre os dígitos alinhados pelo fim do campo: uma passada
+    # vetorizada por posição, até o maior comprimento válido do bloco.
+    digits = _HEX[a]
+    addr = np.zeros(len(addr_tok), dtype=np.uint64)
+    width = int(length[ok].max()) if ok.any() else 0
+    for k in range(width, 0, -1):
+        pos = a_end - k
+        d = digits[np.maximum(pos, 0)]
+        d[pos < a_start] = 0
+        ok &= d != 255
+        addr = (addr << np.uint64(4)) | d.astype(np.uint64)
+
+    line_ok = np.zeros(nlines, dtype=bool)
+    line_addr = np.zeros(nlines, dtype=np.uint64)
+    line_ok[tok_line[addr_tok]] = ok
+    line_addr[tok_line[addr_tok]] = addr
+
+    line_write = np.zeros(nlines, dtype=bool)
+    if kinds is not None:
+        valid, keep, write = kinds
+        kind_tok = np.flatnonzero(tok_col == kind_col)
+        k_lines = tok_line[kind_tok]
+        k_char = a[starts[kind_tok]]
+        k_single = ends[kind_tok] - starts[kind_tok] == 1
+        k_ok = k_single & valid[k_char] & keep[k_char]
+        has_kind = np.zeros(nlines, dtype=bool)
+        has_kind[k_lines] = True
+        kind_ok = np.ones(nlines, dtype=bool)
+        kind_ok[k_lines] = k_ok
+        line_write[k_lines] = write[k_char] & k_single
+        line_ok &= kind_ok
+        if kind_required:
+            line_ok &= has_kind
+
+    addrs = line_addr[line_ok]
+    if page_size & (page_size - 1) == 0:
+        pages = addrs >> np.uint64(page_size.bit_length() - 1)
+    else:
+        pages = addrs // np.uint64(page_size)
+    return pages.astype(np.int64), line_write[line_ok].astype(np.uint8)
+
+
+def _scan(
+    path: str,
+    page_size: int,
+    addr_col: int,
+    kind_col: Optional[int],
+    table: Optional[KindTable],
+    kind_required: bool,
+    block_bytes: int,
+) -> Iterator[TraceBuffer]:
+    if page_size <= 0:
+        raise ValueError("page_size deve ser > 0")
+    if block_bytes <= 0:
+        raise ValueError("block_bytes deve ser > 0")
+    kinds = _kind_luts(table) if table is not None else None
+    return _scan_blocks(path, page_size, addr_col, kind_col, kinds, kind_required, block_bytes)
+
+
+def _scan_blocks(
+    path: str,
+    page_size: int,
+    addr_col: int,
+    kind_col: Optional[int],
+    kinds: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+    kind_required: bool,
+    block_bytes: int,
+) -> Iterator[TraceBuffer]:
+    for block in _blocks(path, block_bytes):
+        pages, writes = _parse_block(block, addr_col, kind_col, kinds, kind_required, page_size)
+        if len(pages):
+            yield TraceBuffer._from_columns(
+                array("q", pages.tobytes()), bytearray(writes.tobytes())
+            )
+
+
+def read_lackey(
+    path: str,
+    page_size: int = 4096,
+    *,
+    include_instructions: bool = True,
+    block_bytes: int = DEFAULT_BLOCK_BYTES,
+) -> Iterator[TraceBuffer]:
+    """
+    Lê a saída do Valgrind lackey (--trace-mem=yes). Linhas que não são
+    referências (ex.: "==123== ...") são ignoradas. S e M contam como
+    escrita; I (busca de instrução) pode ser descartada.
+    """
+    table = _LACKEY if include_instructions else {**_LACKEY, b"I": (False, False)}
+    return _scan(path, page_size, 1, 0, table, True, block_bytes)
+
+
+def read_dinero(
+    path: str,
+    page_size: int = 4096,
+    *,
+    include_instructions: bool = True,
+    block_bytes: int = DEFAULT_BLOCK_BYTES,
+) -> Iterator[TraceBuffer]:
+    """
+    Lê o formato "din" do Dinero. Rótulo 1 é escrita; 0 e 2 (busca de
+    instrução, opcional) são leituras; os escapes 3 e 4 são ignorados.
+    """
+    table = _DINERO if include_instructions else {**_DINERO, b"2": (False, False)}
+    return _scan(path, page_size, 1, 0, table, True, block_bytes)
+
+
+def read_hex(
+    path: str,
+    page_size: int = 4096,
+    *,
+    block_bytes: int = DEFAULT_BLOCK_BYTES,
+) -> Iterator[TraceBuffer]:
+    """
+    Lê um endereço hexadecimal por linha. Uma segunda coluna "W" marca
+    escrita; sem ela (ou com "R") o acesso é leitura.
+    """
+    return _scan(path, page_size, 0, 1, _RW, False, block_bytes)
+
+
+READERS = {
+    "lackey": read_lackey,
+    "dinero": read_dinero,
+    "hex": read_hex,
+}
+
+
+def import_trace(path: str, fmt: str, page_size: int = 4096, **kwargs) -> Iterator[TraceBuffer]:
+    """Despacha para o leitor de 'fmt' ("lackey", "dinero" ou "hex")."""
+    try:
+        reader = READERS[fmt]
+    except KeyError:
+        raise ValueError(f"Formato inválido: {fmt!r}. Use {', '.join(READERS)}.") from None
+    return reader(path, page_size, **kwargs)
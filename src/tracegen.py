@@ -0,0 +1,366 @@
+"""
+Geradores de traços sintéticos vetorizados (NumPy).
+
+Mesmos modelos de make_locality_trace/make_random_trace (src.core), mas o
+traço é produzido em blocos com a API Generator do NumPy e devolvido como
+TraceBuffer (colunas sobre os arrays, sem um Access por elemento). Cada
+chamada usa seu próprio gerador, criado a partir de 'seed' (int,
+SeedSequence ou um Generator já pronto), sem tocar em estado global, então
+chamadas concorrentes ou em paralelo são independentes e reprodutíveis.
+
+As sequências não são as mesmas de src.core para a mesma semente; o modelo
+estatístico é o mesmo.
+
+Além desses, modelos de carga para traços grandes: popularidade Zipf
+(zipf_trace), varreduras sequenciais (scan_trace), laços cíclicos
+(loop_trace) e misturas deles em rajadas (mixture_trace). Todos devolvem
+(TraceBuffer, frames_list), como os geradores acima.
+"""
+
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.core import TraceBuffer, auto_frames_list, resolve_frames_list
+
+SeedLike = Union[int, np.random.SeedSequence, np.random.Generator, None]
+
+BLOCK = 1 << 22
+_KEYS_LIMIT = 1 << 24
+
+
+def _rng(seed: SeedLike) -> np.random.Generator:
+    return np.random.default_rng(seed)
+
+
+def _check_common(num_pages: int, write_prob: float) -> None:
+    if num_pages < 1:
+        raise ValueError("num_pages deve ser >= 1.")
+    if not (0.0 <= write_prob <= 1.0):
+        raise ValueError("write_prob deve estar em [0.0, 1.0].")
+
+
+def _buffer(pages: np.ndarray, writes: np.ndarray, with_times: bool) -> TraceBuffer:
+    times = np.arange(len(pages), dtype=np.int64) if with_times else None
+    return TraceBuffer.from_arrays(pages, writes, times)
+
+
+def _hot_sets(
+    rng: np.random.Generator, phases: int, num_pages: int, size: int
+) -> np.ndarray:
+    """
+    'phases' amostras sem reposição de 'size' páginas de 1..num_pages
+    (uma linha por fase), todas de uma vez.
+
+    Universos pequenos usam argpartition de chaves aleatórias (uma matriz
+    fases x páginas). Senão, se size**2 <= num_pages, sorteia com reposição
+    e refaz só as linhas com repetição (no máximo ~40% por rodada). O resto
+    (working sets grandes num universo grande) cai em rng.choice por fase.
+    """
+    if phases * num_pages <= _KEYS_LIMIT:
+        keys = rng.random((phases, num_pages))
+        return np.argpartition(keys, size - 1, axis=1)[:, :size] + 1
+
+    if size * size <= num_pages:
+        sets = rng.integers(1, num_pages + 1, size=(phases, size))
+        while True:
+            ordered = np.sort(sets, axis=1)
+            dup = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+            if not dup.any():
+                return sets
+            sets[dup] = rng.integers(1, num_pages + 1, size=(int(dup.sum()), size))
+
+    return np.stack([rng.choice(num_pages, size, replace=False) for _ in range(phases)]) + 1
+
+
+def locality_trace(
+    num_pages: int = 30,
+    trace_length: int = 200,
+    write_prob: float = 0.3,
+    locality_prob: float = 0.8,
+    phase_length: int = 40,
+    working_set_size: int = 5,
+    seed: SeedLike = None,
+    *,
+    with_times: bool = True,
+) -> Tuple[TraceBuffer, List[int]]:
+    """
+    Traço com localidade de referência (modelo de make_locality_trace).
+
+    A cada phase_length acessos sorteia-se um working set de
+    working_set_size páginas; cada acesso vai ao working set da sua fase com
+    probabilidade locality_prob, senão a qualquer página. Fases, working
+    sets, escolhas e a máscara de escrita são sorteados em bloco.
+
+    with_times=True grava t = posição (como o gerador original); com False
+    a coluna de timestamps é omitida e os algoritmos usam a posição.
+    """
+    _check_common(num_pages, write_prob)
+    if trace_length <= 0:
+        raise ValueError("trace_length deve ser > 0.")
+    if not (0.0 <= locality_prob <= 1.0):
+        raise ValueError("locality_prob deve estar em [0.0, 1.0].")
+    if working_set_size < 1 or working_set_size > num_pages:
+        raise ValueError("working_set_size deve estar em [1, num_pages].")
+    if phase_length < 1:
+        raise ValueError("phase_length deve ser >= 1.")
+
+    rng = _rng(seed)
+    # Blocos com um número inteiro de fases: cada fase fica num só bloco.
+    block = max(1, BLOCK // phase_length) * phase_length
+
+    pages = np.empty(trace_length, dtype=np.int64)
+    writes = np.empty(trace_length, dtype=bool)
+    for lo in range(0, trace_length, block):
+        hi = min(trace_length, lo + block)
+        n = hi - lo
+        phase = np.arange(n) // phase_length
+        hot = _hot_sets(rng, int(phase[-1]) + 1, num_pages, working_set_size)
+        slot = rng.integers(0, working_set_size, size=n)
+        local = rng.random(n) < locality_prob
+        anywhere = rng.integers(1, num_pages + 1, size=n)
+        pages[lo:hi] = np.where(local, hot[phase, slot], anywhere)
+        writes[lo:hi] = rng.random(n) < write_prob
+
+    return _buffer(pages, writes, with_times), auto_frames_list(num_pages)
+
+
+def random_trace(
+    num_pages: int = 10,
+    trace_length: int = 50,
+    write_prob: float = 0.3,
+    frames: Union[Tuple[int, int], List[int], int, None] = None,
+    frame_mode: str = "auto",
+    seed: SeedLike = None,
+    *,
+    with_times: bool = True,
+) -> Tuple[TraceBuffer, List[int]]:
+    """
+    Traço uniforme (modelo de make_random_trace): cada acesso é uma página
+    de 1..num_pages sorteada de forma independente. 'frames' e 'frame_mode'
+    têm o mesmo significado de make_random_trace.
+    """
+    _check_common(num_pages, write_prob)
+    if trace_length < 0:
+        raise ValueError("trace_length deve ser >= 0.")
+    frames_list = resolve_frames_list(frames, frame_mode, num_pages)
+
+    rng = _rng(seed)
+    pages = np.empty(trace_length, dtype=np.int64)
+    writes = np.empty(trace_length, dtype=bool)
+    for lo in range(0, trace_length, BLOCK):
+        hi = min(trace_length, lo + BLOCK)
+        pages[lo:hi] = rng.integers(1, num_pages + 1, size=hi - lo)
+        writes[lo:hi] = rng.random(hi - lo) < write_prob
+
+    return _buffer(pages, writes, with_times), frames_list
+
+
+def _writes(rng: np.random.Generator, n: int, write_prob: float) -> np.ndarray:
+    writes = np.empty(n, dtype=bool)
+    for lo in range(0, n, BLOCK):
+        hi = min(n, lo + BLOCK)
+        writes[lo:hi] = rng.random(hi - lo) < write_prob
+    return writes
+
+
+def _zipf_ranks(
+    rng: np.random.Generator, n: int, num_pages: int, alpha: float
+) -> np.ndarray:
+    """
+    n postos de 1..num_pages com P(k) proporcional a k**-alpha (alpha > 0).
+
+    Rejeição-inversão de Hörmann e Derflinger: inverte a integral H de
+    x**-alpha e aceita quase todas as amostras na primeira rodada; só as
+    rejeitadas são sorteadas de novo. O custo é O(1) por acesso e não depende
+    de num_pages (sem tabela de CDF).
+    """
+    q = 1.0 - alpha
+
+    def H(x):
+        if q == 0:
+            return np.log(x)
+        return np.expm1(q * np.log(x)) / q
+
+    def H_inv(y):
+        if q == 0:
+            return np.exp(y)
+        return np.exp(np.log1p(np.maximum(y * q, -1.0)) / q)
+
+    def h(x):
+        return np.exp(-alpha * np.log(x))
+
+    h_first = H(1.5) - 1.0
+    h_last = H(num_pages + 0.5)
+    squeeze = 2.0 - H_inv(H(2.5) - h(2.0))
+
+    ranks = np.empty(n, dtype=np.int64)
+    todo = np.arange(n)
+    while len(todo):
+        u = h_last + rng.random(len(todo)) * (h_first - h_last)
+        x = H_inv(u)
+        k = np.clip(np.floor(x + 0.5), 1, num_pages)
+        ok = (k - x <= squeeze) | (u >= H(k + 0.5) - h(k))
+        ranks[todo[ok]] = k[ok]
+        todo = todo[~ok]
+    return ranks
+
+
+def zipf_trace(
+    num_pages: int = 1000,
+    trace_length: int = 10000,
+    alpha: float = 1.0,
+    write_prob: float = 0.3,
+    seed: SeedLike = None,
+    *,
+    shuffle: bool = True,
+    with_times: bool = True,
+) -> Tuple[TraceBuffer, List[int]]:
+    """
+    Popularidade Zipfiana: a página de posto r (1..num_pages) é acessada com
+    probabilidade proporcional a 1 / r**alpha, de forma independente
+    (alpha = 0 é o traço uniforme).
+
+    Com shuffle=True os postos são atribuídos a page ids aleatórios, para
+    que as páginas quentes não sejam sempre 1, 2, 3...
+    """
+    _check_common(num_pages, write_prob)
+    if trace_length < 0:
+        raise ValueError("trace_length deve ser >= 0.")
+    if alpha < 0:
+        raise ValueError("alpha deve ser >= 0.")
+
+    rng = _rng(seed)
+    ids = rng.permutation(num_pages) + 1 if shuffle else None
+
+    pages = np.empty(trace_length, dtype=np.int64)
+    for lo in range(0, trace_length, BLOCK):
+        hi = min(trace_length, lo + BLOCK)
+        if alpha == 0:
+            ranks = rng.integers(1, num_pages + 1, size=hi - lo)
+        else:
+            ranks = _zipf_ranks(rng, hi - lo, num_pages, alpha)
+        pages[lo:hi] = ranks if ids is None else ids[ranks - 1]
+
+    writes = _writes(rng, trace_length, write_prob)
+    return _buffer(pages, writes, with_times), auto_frames_list(num_pages)
+
+
+def scan_trace(
+    num_pages: Optional[int] = None,
+    trace_length: int = 10000,
+    write_prob: float = 0.3,
+    seed: SeedLike = None,
+    *,
+    start: int = 1,
+    with_times: bool = True,
+) -> Tuple[TraceBuffer, List[int]]:
+    """
+    Varredura sequencial: start, start+1, ... sobre num_pages páginas,
+    recomeçando do início ao chegar ao fim. Com num_pages=None (padrão) cada
+    página é tocada uma única vez, o padrão que "lava" a memória.
+    """
+    if num_pages is None:
+        num_pages = max(1, trace_length)
+    _check_common(num_pages, write_prob)
+    if trace_length < 0:
+        raise ValueError("trace_length deve ser >= 0.")
+
+    rng = _rng(seed)
+    pages = np.arange(trace_length, dtype=np.int64)
+    pages %= num_pages
+    pages += start
+    writes = _writes(rng, trace_length, write_prob)
+    return _buffer(pages, writes, with_times), auto_frames_list(num_pages)
+
+
+def loop_trace(
+    loop_size: int = 100,
+    trace_length: int = 10000,
+    write_prob: float = 0.3,
+    seed: SeedLike = None,
+    *,
+    with_times: bool = True,
+) -> Tuple[TraceBuffer, List[int]]:
+    """
+    Laço cíclico sobre loop_size páginas (1, 2, ..., loop_size, 1, 2, ...).
+
+    Com menos frames que loop_size, LRU e FIFO faltam em todo acesso; os
+    frames sugeridos incluem loop_size - 1 e loop_size para mostrar o degrau.
+    """
+    if loop_size < 1:
+        raise ValueError("loop_size deve ser >= 1.")
+    trace, _ = scan_trace(
+        loop_size, trace_length, write_prob, seed, with_times=with_times
+    )
+    frames_list = set(auto_frames_list(loop_size))
+    frames_list.update((max(1, loop_size - 1), loop_size))
+    return trace, sorted(frames_list)
+
+
+Component = Callable[..., Tuple[TraceBuffer, List[int]]]
+
+
+def mixture_trace(
+    components: Sequence[Tuple[float, Component]],
+    trace_length: int = 10000,
+    seed: SeedLike = None,
+    *,
+    burst: int = 1,
+    disjoint: bool = True,
+    with_times: bool = True,
+) -> Tuple[TraceBuffer, List[int]]:
+    """
+    Mistura de padrões: components é uma lista de (peso, gerador), em que
+    gerador é qualquer função deste módulo (ex.: functools.partial(zipf_trace,
+    num_pages=5000, alpha=1.2)) chamada como gerador(trace_length=n, seed=s).
+
+    O traço é dividido em rajadas de 'burst' acessos; cada rajada vem de um
+    componente sorteado pelos pesos, e cada componente continua de onde
+    parou (uma varredura segue sequencial entre rajadas). Com disjoint=True
+    os page ids de cada componente são deslocados para não colidirem.
+
+    Cada componente recebe uma semente filha (SeedSequence.spawn), então o
+    resultado é determinístico por seed.
+    """
+    if not components:
+        raise ValueError("components não pode ser vazia.")
+    if trace_length < 0:
+        raise ValueError("trace_length deve ser >= 0.")
+    if burst < 1:
+        raise ValueError("burst deve ser >= 1.")
+    weights = np.array([w for w, _ in components], dtype=np.float64)
+    if (weights < 0).any() or weights.sum() <= 0:
+        raise ValueError("Os pesos devem ser >= 0 e não todos nulos.")
+
+    if isinstance(seed, np.random.Generator):
+        seq = np.random.SeedSequence(seed.integers(0, 2**63))
+    elif isinstance(seed, np.random.SeedSequence):
+        seq = seed
+    else:
+        seq = np.random.SeedSequence(seed)
+    mix_seed, *child_seeds = seq.spawn(len(components) + 1)
+    rng = np.random.default_rng(mix_seed)
+
+    bursts = (trace_length + burst - 1) // burst
+    choice = rng.choice(len(components), size=bursts, p=weights / weights.sum())
+    owner = np.repeat(choice.astype(np.int32), burst)[:trace_length]
+
+    pages = np.empty(trace_length, dtype=np.int64)
+    writes = np.empty(trace_length, dtype=bool)
+    offset = universe = 0
+    for i, (_, make) in enumerate(components):
+        where = owner == i
+        count = int(np.count_nonzero(where))
+        if not count:
+            continue
+        part, _ = make(trace_length=count, seed=child_seeds[i])
+        part_pages = np.frombuffer(part.pages, dtype=np.int64)
+        top = int(part_pages.max())
+        pages[where] = part_pages + offset if offset else part_pages
+        writes[where] = np.frombuffer(part.writes, dtype=np.uint8).view(bool)
+        universe = max(universe, offset + top)
+        if disjoint:
+            offset += top
+
+    return _buffer(pages, writes, with_times), auto_frames_list(max(1, universe))
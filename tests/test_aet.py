@@ -0,0 +1,39 @@
+from src.aet import aet_benchmark
+from src.algorithms.LRU import LRU
+from src.tracegen import zipf_trace
+
+FRAMES = [250, 1000, 2500]
+
+
+def _skewed():
+    seq, _ = zipf_trace(5000, 100_000, 0.9, seed=2)
+    exact = [r.faults for r in LRU()._run_sweep(seq, FRAMES)]
+    return seq, exact
+
+
+def test_unsampled_curve_is_exact_histogram():
+    seq, exact = _skewed()
+    results = aet_benchmark(seq, FRAMES, max_pages=None).results
+    for r, e in zip(results, exact):
+        assert r.sample_rate == 1.0
+        assert r.faults_stderr == 0.0
+        assert abs(r.faults / e - 1) < 0.03
+
+
+def test_sampled_curve_tracks_exact_on_skewed_trace():
+    # max_pages=1000 de 5000 páginas: ~15% das páginas na amostra. Sem a
+    # correção SHARDS-adj, ter ou não as páginas quentes na amostra desloca
+    # a curva em 30-45% para um lado ou para o outro.
+    seq, exact = _skewed()
+    runs = [
+        aet_benchmark(seq, FRAMES, max_pages=1000, seed=seed, chunk_size=4096).results
+        for seed in range(6)
+    ]
+    for j, e in enumerate(exact):
+        estimates = [results[j] for results in runs]
+        for r in estimates:
+            assert r.sample_rate < 0.2
+            assert r.faults_stderr > 0
+            assert abs(r.faults / e - 1) < 0.3
+        mean = sum(r.faults for r in estimates) / len(estimates)
+        assert abs(mean / e - 1) < 0.05